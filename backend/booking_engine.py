@@ -0,0 +1,294 @@
+# -*- coding: utf-8 -*-
+# backend/booking_engine.py
+import re
+import sqlite3
+import time
+from functools import lru_cache
+
+from backend.id_allocator import get_allocator
+from backend.models import BookingResult
+from backend.repositories import MAX_ATTEMPTS, Repository, record_query, retry_busy
+
+# Flights that still sell seats
+BOOKABLE_STATUSES = ('scheduled', 'delayed')
+
+# Seat map used when the engine assigns seats: six across, 1A..1F, 2A..
+SEAT_LETTERS = 'ABCDEF'
+
+_SEAT_INDEX_VIOLATION = 'tickets.flight_id, tickets.seat_number'
+
+
+class BookingError(Exception):
+    """Raised when a booking cannot be made; nothing has been written."""
+
+
+class FlightNotBookableError(BookingError):
+    """The flight does not exist or no longer sells seats."""
+
+
+class ClassNotOfferedError(BookingError):
+    """The flight's plane type has no seats in the requested class."""
+
+
+class FlightFullError(BookingError):
+    """Fewer seats are left than were requested."""
+
+    def __init__(self, message, available):
+        super().__init__(message)
+        self.available = available
+
+
+class SeatTakenError(BookingError):
+    """One or more of the requested seats already hold an active ticket."""
+
+    def __init__(self, message, seats):
+        super().__init__(message)
+        self.seats = seats
+
+
+def normalize_seat(seat_number):
+    """'15a ' -> '15A'"""
+    return (seat_number or '').strip().upper()
+
+
+def parse_seats(text):
+    """Seat numbers typed into one field: '15A, 15B 16C' -> ['15A', '15B', '16C']."""
+    return [normalize_seat(seat) for seat in re.split(r'[\s,;]+', text or '') if seat.strip()]
+
+
+def seat_label(index):
+    """Seat 0 -> 1A, 1 -> 1B, ..., 6 -> 2A"""
+    return f"{index // len(SEAT_LETTERS) + 1}{SEAT_LETTERS[index % len(SEAT_LETTERS)]}"
+
+
+@lru_cache(maxsize=None)
+def seat_map(capacity):
+    """Labels of a plane's seats in order: ('1A', '1B', ...)."""
+    return tuple(seat_label(index) for index in range(capacity))
+
+
+def pick_free_seats(capacity, taken, count):
+    """The first count seats of the seat map not in taken, consecutive ones
+    when a long enough run is free; None when too few are free."""
+    labels = seat_map(capacity)
+    free = [index for index, label in enumerate(labels) if label not in taken]
+    if len(free) < count:
+        return None
+    start = next((position for position in range(len(free) - count + 1)
+                  if free[position + count - 1] - free[position] == count - 1), 0)
+    return [labels[index] for index in free[start:start + count]]
+
+
+def _checked_seats(seat_numbers):
+    seats = [normalize_seat(seat) for seat in seat_numbers]
+    if not all(seats):
+        raise BookingError("A seat number is empty")
+    if len(set(seats)) != len(seats):
+        raise BookingError("A seat number is listed twice")
+    return seats
+
+
+class BookingEngine(Repository):
+    """Sells seats: a booking and its tickets in one BEGIN IMMEDIATE transaction.
+
+    book() sells one passenger one or more seats; book_group() seats a
+    group of passengers under a single booking. Either way the tickets go
+    in with one executemany.
+
+    The write lock is taken before anything is read, so the flight status,
+    class, capacity and seat checks cannot be overtaken by another agent
+    before the rows are inserted; the unique seat index
+    (idx_tickets_flight_seat) backs the seat check against writers that go
+    around the engine. A busy database is retried with backoff. Failed
+    checks raise a BookingError subclass and leave nothing behind.
+
+    Booking references and ticket numbers come from the shared IdAllocator
+    (backend/id_allocator.py), so they never collide.
+    """
+
+    FLIGHT_SQL = """
+        SELECT f.status, pt.id, pt.seat_capacity
+        FROM flights f
+        JOIN planes p ON f.plane_id = p.id
+        JOIN plane_types pt ON p.plane_type_id = pt.id
+        WHERE f.id = ?
+    """
+
+    # Both read idx_tickets_flight_seat, whose rows are exactly the active
+    # tickets: counting them never touches the table
+    SEATS_SOLD_SQL = """
+        SELECT COUNT(*) FROM tickets INDEXED BY idx_tickets_flight_seat
+        WHERE flight_id = ? AND status <> 'cancelled'
+    """
+    SEAT_TAKEN_SQL = """
+        SELECT 1 FROM tickets
+        WHERE flight_id = ? AND seat_number = ? AND status <> 'cancelled'
+    """
+    # The same, leaving out the tickets of the booking being written
+    SEAT_TAKEN_ELSEWHERE_SQL = """
+        SELECT 1 FROM tickets
+        WHERE flight_id = ? AND seat_number = ? AND status <> 'cancelled' AND booking_id <> ?
+    """
+    TAKEN_SEATS_SQL = """
+        SELECT seat_number FROM tickets INDEXED BY idx_tickets_flight_seat
+        WHERE flight_id = ? AND status <> 'cancelled'
+    """
+
+    CLASSES_SQL = "SELECT class_id FROM plane_available_classes WHERE plane_type_id = ?"
+
+    def __init__(self, database=None, profile=None):
+        super().__init__(database, profile)
+        self.allocator = get_allocator(database, profile)
+
+    def book(self, flight_id, passenger_id, class_id, terminal_id, seat_numbers, price, user_id=1):
+        """Book seat_numbers on a flight for one passenger, one ticket per seat.
+
+        price is per seat. Returns a BookingResult; raises a BookingError
+        subclass when the booking is refused.
+        """
+        seats = _checked_seats(seat_numbers)
+        if not seats:
+            raise BookingError("At least one seat number is required")
+        return self._book(flight_id, [passenger_id] * len(seats), class_id, terminal_id, seats,
+                          price, user_id)
+
+    def book_group(self, flight_id, passenger_ids, class_id, terminal_id, price, seat_numbers=None,
+                   user_id=1):
+        """Book one seat for each passenger, all under one booking.
+
+        seat_numbers pairs with passenger_ids. Without them the engine picks
+        the first free seats of the flight, side by side where a long enough
+        run is free. Returns a BookingResult; raises a BookingError subclass
+        when the booking is refused.
+        """
+        passenger_ids = list(passenger_ids)
+        if not passenger_ids:
+            raise BookingError("At least one passenger is required")
+        if len(set(passenger_ids)) != len(passenger_ids):
+            raise BookingError("A passenger is listed twice")
+        seats = _checked_seats(seat_numbers or ())
+        if seats and len(seats) != len(passenger_ids):
+            raise BookingError("Give one seat number per passenger, or none")
+        return self._book(flight_id, passenger_ids, class_id, terminal_id, seats or None,
+                          price, user_id)
+
+    def _book(self, flight_id, passenger_ids, class_id, terminal_id, seats, price, user_id):
+        """Sell one ticket per passenger; seats None lets the engine assign them."""
+        references = None
+
+        def book_once():
+            nonlocal references
+            # Drawn once: an attempt that rolled back did not use them
+            references = references or self.allocator.references(len(passenger_ids))
+            return self._book_once(flight_id, passenger_ids, class_id, terminal_id,
+                                   seats, price, user_id, references)
+
+        for attempt in range(1, MAX_ATTEMPTS + 1):
+            try:
+                result = retry_busy(book_once)
+                break
+            except SeatTakenError:
+                # Seats the engine picked were sold by a writer that does not take
+                # its lock: pick again. Seats the caller chose are theirs to change
+                if seats is not None or attempt == MAX_ATTEMPTS:
+                    raise
+
+        self._changed('bookings', 'insert', result.booking_id)
+        self._changed('tickets', 'insert', *result.ticket_ids)
+        return result
+
+    def seats_left(self, flight_id):
+        """Seats still for sale on a flight (0 when it is not bookable)."""
+        with self._connect() as conn:
+            flight = conn.execute(self.FLIGHT_SQL, (flight_id,)).fetchone()
+            if flight is None or flight[0] not in BOOKABLE_STATUSES:
+                return 0
+            sold = conn.execute(self.SEATS_SOLD_SQL, (flight_id,)).fetchone()[0]
+        return max(0, flight[2] - sold)
+
+    def _book_once(self, flight_id, passenger_ids, class_id, terminal_id, seats, price, user_id,
+                   references):
+        start = time.perf_counter()
+        booking_reference, ticket_numbers = references
+        count = len(passenger_ids)
+        with self._connect() as conn:
+            conn.execute("BEGIN IMMEDIATE")
+            try:
+                capacity = self._check(conn, flight_id, class_id, count, seats)
+                seats = seats or self._free_seats(conn, flight_id, capacity, count)
+                cursor = conn.cursor()
+                cursor.execute("""
+                    INSERT INTO bookings
+                    (user_id, flight_id, seat_count, booking_date, total_price, booking_reference)
+                    VALUES (?, ?, ?, date('now', 'localtime'), ?, ?)
+                """, (user_id, flight_id, count, price * count, booking_reference))
+                booking_id = cursor.lastrowid
+
+                cursor.executemany("""
+                    INSERT INTO tickets
+                    (ticket_number, passenger_id, flight_id, booking_id, class_id, terminal_id,
+                     seat_number, price, status)
+                    VALUES (?, ?, ?, ?, ?, ?, ?, ?, 'confirmed')
+                """, [(ticket_number, passenger_id, flight_id, booking_id, class_id, terminal_id,
+                       seat, price)
+                      for ticket_number, passenger_id, seat in zip(ticket_numbers, passenger_ids, seats)])
+                # Inserted in ticket number order, so ids come back in the same order
+                ticket_ids = [row[0] for row in cursor.execute(
+                    "SELECT id FROM tickets WHERE booking_id = ? ORDER BY id", (booking_id,))]
+                conn.commit()
+            except sqlite3.IntegrityError as e:
+                if _SEAT_INDEX_VIOLATION not in str(e):
+                    conn.rollback()
+                    raise
+                # Sold by a writer that does not take the engine's lock; the
+                # rows of this booking written so far are not the culprits
+                taken = [seat for seat in seats
+                         if conn.execute(self.SEAT_TAKEN_ELSEWHERE_SQL,
+                                         (flight_id, seat, booking_id)).fetchone()]
+                conn.rollback()
+                taken = taken or list(seats)
+                raise SeatTakenError(f"Seat already taken: {', '.join(taken)}", taken) from e
+            except BaseException:
+                conn.rollback()
+                raise
+        record_query('bookings.create', time.perf_counter() - start, 1 + count)
+        return BookingResult(booking_id, booking_reference, tuple(ticket_ids), tuple(ticket_numbers),
+                             tuple(seats), price * count)
+
+    def _check(self, conn, flight_id, class_id, count, seats):
+        """Refuse the booking unless the flight, class, capacity and seats allow it.
+
+        Returns the flight's seat capacity.
+        """
+        flight = conn.execute(self.FLIGHT_SQL, (flight_id,)).fetchone()
+        if flight is None:
+            raise FlightNotBookableError(f"Flight {flight_id} does not exist")
+        status, plane_type_id, capacity = flight
+        if status not in BOOKABLE_STATUSES:
+            raise FlightNotBookableError(f"Flight is {status} and no longer sells seats")
+
+        # A plane type without listed classes takes any class
+        offered = {row[0] for row in conn.execute(self.CLASSES_SQL, (plane_type_id,))}
+        if offered and class_id not in offered:
+            raise ClassNotOfferedError("The plane on this flight has no seats in that class")
+
+        available = capacity - conn.execute(self.SEATS_SOLD_SQL, (flight_id,)).fetchone()[0]
+        if count > available:
+            raise FlightFullError(f"Only {max(0, available)} seats left on this flight",
+                                  max(0, available))
+
+        taken = [seat for seat in seats or ()
+                 if conn.execute(self.SEAT_TAKEN_SQL, (flight_id, seat)).fetchone()]
+        if taken:
+            raise SeatTakenError(f"Seat already taken: {', '.join(taken)}", taken)
+        return capacity
+
+    def _free_seats(self, conn, flight_id, capacity, count):
+        """The first count free seats of the seat map, consecutive ones when a run is free."""
+        taken = {row[0] for row in conn.execute(self.TAKEN_SEATS_SQL, (flight_id,))}
+        seats = pick_free_seats(capacity, taken, count)
+        if seats is None:
+            # Seats sold outside the seat map (hand-typed numbers) use up capacity too
+            free = sum(label not in taken for label in seat_map(capacity))
+            raise FlightFullError(f"Only {free} seats left on this flight", free)
+        return seats
@@ -0,0 +1,402 @@
+# -*- coding: utf-8 -*-
+# backend/booking_import.py
+import argparse
+import csv
+import json
+import math
+import os
+import sys
+import time
+from collections import namedtuple
+from datetime import date
+
+from backend.booking_engine import BOOKABLE_STATUSES, normalize_seat, pick_free_seats
+from backend.id_allocator import format_reference, get_allocator
+from backend.repositories import LookupRepository, Repository, record_query, retry_busy
+
+# Manifest columns (CSV header, or JSON keys). Consecutive rows with the same
+# group become one booking, all on one flight; a row without a group is a
+# booking of its own. Empty seat numbers are assigned side by side, an
+# empty price is the class price.
+COLUMNS = ('group', 'passport_number', 'flight_number', 'departure_date', 'class', 'terminal',
+           'seat_number', 'price')
+REQUIRED = ('passport_number', 'flight_number', 'departure_date', 'class', 'terminal')
+
+# Tickets validated and written per transaction
+CHUNK_SIZE = 1000
+
+# Values per IN (...) lookup, well under SQLite's variable limit
+LOOKUP_BATCH = 500
+
+# A parsed manifest row
+ManifestRow = namedtuple(
+    'ManifestRow',
+    'row group passport flight_number departure_date class_id terminal_id seat price'
+)
+
+# One line of the error report: the row number in the file (CSV line, JSON
+# Lines line or JSON array position), its group and what was wrong
+ImportIssue = namedtuple('ImportIssue', 'row group message')
+
+
+def read_manifest(path):
+    """Yield (row number, record dict) from a .csv, .jsonl/.ndjson or .json manifest.
+
+    CSV and JSON Lines are streamed; a .json array is read whole. A line that
+    is not a JSON object yields None, which the importer reports.
+    """
+    extension = os.path.splitext(path)[1].lower()
+    if extension == '.csv':
+        with open(path, newline='', encoding='utf-8-sig') as f:
+            reader = csv.DictReader(f)
+            for record in reader:
+                yield reader.line_num, record
+    elif extension in ('.jsonl', '.ndjson'):
+        with open(path, encoding='utf-8') as f:
+            for number, line in enumerate(f, 1):
+                if not line.strip():
+                    continue
+                try:
+                    yield number, json.loads(line)
+                except ValueError:
+                    yield number, None
+    elif extension == '.json':
+        with open(path, encoding='utf-8') as f:
+            records = json.load(f)
+        if not isinstance(records, list):
+            raise ValueError("A JSON manifest must be an array of bookings rows")
+        yield from enumerate(records, 1)
+    else:
+        raise ValueError(f"Unsupported manifest format: {extension or path}")
+
+
+def write_error_report(errors, path):
+    """Write the rejected rows as CSV: row, group, message."""
+    with open(path, 'w', newline='', encoding='utf-8') as f:
+        writer = csv.writer(f)
+        writer.writerow(ImportIssue._fields)
+        writer.writerows(errors)
+
+
+def _fields(record):
+    """Manifest record -> {column: stripped text}, header spelling forgiven."""
+    return {str(key).strip().lower(): str(value).strip()
+            for key, value in record.items() if key is not None and value is not None}
+
+
+def _batches(values, size=LOOKUP_BATCH):
+    values = list(values)
+    for start in range(0, len(values), size):
+        yield values[start:start + size]
+
+
+class BookingImporter(Repository):
+    """Imports agency manifests: many bookings, written in batched transactions.
+
+    The file is streamed in chunks of about CHUNK_SIZE tickets. Classes,
+    terminals and the classes each plane type offers are held in dicts for
+    the whole import; the passports and flights of a chunk are resolved with
+    one batched lookup each. Every chunk is checked and written in one
+    BEGIN IMMEDIATE transaction with the booking engine's rules (bookable
+    flight, offered class, capacity, free seats), using executemany for the
+    bookings and for the tickets.
+
+    A booking is imported whole or not at all. Rejected rows go to the
+    report with the reason; the rest of the file still goes in.
+    """
+
+    PASSENGERS_SQL = "SELECT passport_number, id FROM passengers WHERE passport_number IN ({marks})"
+
+    FLIGHT_SQL = """
+        SELECT f.id, f.status, pt.id, pt.seat_capacity
+        FROM flights f
+        JOIN planes p ON f.plane_id = p.id
+        JOIN plane_types pt ON p.plane_type_id = pt.id
+        WHERE f.flight_number = ? AND f.departure_date = ?
+    """
+
+    TAKEN_SEATS_SQL = """
+        SELECT flight_id, seat_number FROM tickets INDEXED BY idx_tickets_flight_seat
+        WHERE flight_id IN ({marks}) AND status <> 'cancelled'
+    """
+
+    def __init__(self, database=None, profile=None, user_id=1, chunk_size=CHUNK_SIZE):
+        super().__init__(database, profile)
+        self.user_id = user_id
+        self.chunk_size = chunk_size
+        self.allocator = get_allocator(database, profile)
+        lookups = LookupRepository(database, profile)
+        self.classes = {c['name'].lower(): c for c in lookups.classes()}
+        self.terminals = {}
+        for t in lookups.terminals():
+            self.terminals.setdefault(t['name'].lower(), t)
+            self.terminals[t['number'].lower()] = t
+        self.plane_classes = {}  # plane type id -> {class ids}; empty means any class
+        for plane_type_id, class_id in self._fetch_all(
+                'import.plane_classes', "SELECT plane_type_id, class_id FROM plane_available_classes"):
+            self.plane_classes.setdefault(plane_type_id, set()).add(class_id)
+
+    def import_file(self, path, verbose=False):
+        """Import a manifest file (see read_manifest); returns the report dict."""
+        return self.import_records(read_manifest(path), verbose)
+
+    def import_records(self, records, verbose=False):
+        """Import (row number, record dict) pairs.
+
+        Returns {'rows', 'bookings', 'tickets', 'rejected', 'seconds',
+        'booking_ids', 'errors': [ImportIssue]}.
+        """
+        started = time.perf_counter()
+        report = {'rows': 0, 'bookings': 0, 'tickets': 0, 'rejected': 0, 'seconds': 0.0,
+                  'booking_ids': [], 'errors': []}
+        chunk, tickets = [], 0
+        for booking in self._group_bookings(records):
+            chunk.append(booking)
+            tickets += len(booking)
+            if tickets >= self.chunk_size:
+                self._import_chunk(chunk, report)
+                chunk, tickets = [], 0
+                if verbose:
+                    print(f"   rows: {report['rows']:,}  tickets: {report['tickets']:,}  "
+                          f"rejected: {report['rejected']:,}")
+        if chunk:
+            self._import_chunk(chunk, report)
+        report['seconds'] = round(time.perf_counter() - started, 2)
+        return report
+
+    def _group_bookings(self, records):
+        """Yield each booking as a list of (row number, group, ManifestRow or error message)."""
+        booking, current = [], None
+        for number, record in records:
+            fields = _fields(record) if isinstance(record, dict) else {}
+            group = fields.get('group') or None
+            entry = (number, group or '', self._parse(number, record, fields))
+            if booking and (group is None or group != current):
+                yield booking
+                booking = []
+            booking.append(entry)
+            current = group
+        if booking:
+            yield booking
+
+    def _parse(self, number, record, fields):
+        """A ManifestRow, or the message saying why the row cannot be one."""
+        if not isinstance(record, dict):
+            return "Not a bookings row object"
+        missing = [column for column in REQUIRED if not fields.get(column)]
+        if missing:
+            return f"Missing {', '.join(missing)}"
+        try:
+            departure_date = date.fromisoformat(fields['departure_date']).isoformat()
+        except ValueError:
+            return f"departure_date must be YYYY-MM-DD: {fields['departure_date']}"
+        seat_class = self.classes.get(fields['class'].lower())
+        if seat_class is None:
+            return f"Unknown class: {fields['class']}"
+        terminal = self.terminals.get(fields['terminal'].lower())
+        if terminal is None:
+            return f"Unknown terminal: {fields['terminal']}"
+        price = seat_class['price']
+        if fields.get('price'):
+            try:
+                price = float(fields['price'])
+            except ValueError:
+                price = -1
+            # NaN and infinity parse as floats too
+            if not (math.isfinite(price) and price >= 0):
+                return f"Invalid price: {fields['price']}"
+        return ManifestRow(number, fields.get('group', ''), fields['passport_number'].upper(),
+                           fields['flight_number'].upper(), departure_date, seat_class['id'],
+                           terminal['id'], normalize_seat(fields.get('seat_number')), price)
+
+    def _import_chunk(self, bookings, report):
+        report['rows'] += sum(len(booking) for booking in bookings)
+        bookings = [booking for booking in bookings if self._parsed(booking, report)]
+
+        passports = self._passenger_ids(row.passport
+                                        for booking in bookings for _, _, row in booking)
+        candidates = []  # (rows, passenger ids)
+        for booking in bookings:
+            rows = [row for _, _, row in booking]
+            passenger_ids = [passports.get(row.passport) for row in rows]
+            seats = [row.seat for row in rows if row.seat]
+            if None in passenger_ids:
+                self._reject(report, rows, {row.row: f"Unknown passport number: {row.passport}"
+                                            for row, passenger_id in zip(rows, passenger_ids)
+                                            if passenger_id is None})
+            elif len({(row.flight_number, row.departure_date) for row in rows}) > 1:
+                self._reject(report, rows, "All rows of a booking must be on the same flight")
+            elif len(set(passenger_ids)) != len(passenger_ids):
+                self._reject(report, rows, "A passenger is listed twice in the booking")
+            elif len(set(seats)) != len(seats):
+                self._reject(report, rows, "A seat number is listed twice in the booking")
+            else:
+                candidates.append((rows, passenger_ids))
+        if not candidates:
+            return
+
+        # Reserved before the write lock; references of rejected bookings are skipped
+        references = self.allocator.allocate(booking_reference=len(candidates),
+                                             ticket_number=sum(len(rows) for rows, _ in candidates))
+
+        accepted, rejected, booking_ids, ticket_ids = retry_busy(
+            lambda: self._write(candidates, references))
+
+        for rows, message in rejected:
+            self._reject(report, rows, message)
+        report['bookings'] += len(booking_ids)
+        report['tickets'] += accepted
+        report['booking_ids'].extend(booking_ids)
+        if booking_ids:
+            self._changed('bookings', 'insert', *booking_ids)
+            self._changed('tickets', 'insert', *ticket_ids)
+
+    def _parsed(self, booking, report):
+        """Whether every row of the booking parsed; otherwise it is rejected whole."""
+        errors = {number: row for number, _, row in booking if isinstance(row, str)}
+        if not errors:
+            return True
+        for number, group, row in booking:
+            message = errors.get(number) or f"Rejected with the rest of booking group {group}"
+            report['errors'].append(ImportIssue(number, group, message))
+        report['rejected'] += len(booking)
+        return False
+
+    def _reject(self, report, rows, message):
+        """Reject a booking's rows; message is one reason or {row number: reason}."""
+        for row in rows:
+            if isinstance(message, dict):
+                text = message.get(row.row) or f"Rejected with the rest of booking group {row.group}"
+            else:
+                text = message
+            report['errors'].append(ImportIssue(row.row, row.group, text))
+        report['rejected'] += len(rows)
+
+    def _passenger_ids(self, passports):
+        """{passport number: passenger id} for the passports that exist."""
+        found = {}
+        for batch in _batches(set(passports)):
+            sql = self.PASSENGERS_SQL.format(marks=', '.join('?' * len(batch)))
+            found.update(self._fetch_all('import.passengers', sql, batch))
+        return found
+
+    def _write(self, candidates, references):
+        """Check the candidates under the write lock and insert the bookable ones.
+
+        Returns (tickets written, [(rows, reason)] rejected, booking ids, ticket ids).
+        """
+        start = time.perf_counter()
+        booking_references = iter(references['booking_reference'])
+        ticket_numbers = iter(references['ticket_number'])
+
+        with self._connect() as conn:
+            conn.execute("BEGIN IMMEDIATE")
+            try:
+                flights = {}  # (number, date) -> (id, status, plane type id, capacity) or None
+                for rows, _ in candidates:
+                    key = (rows[0].flight_number, rows[0].departure_date)
+                    if key not in flights:
+                        flights[key] = conn.execute(self.FLIGHT_SQL, key).fetchone()
+                taken = {flight[0]: set() for flight in flights.values() if flight}
+                for batch in _batches(taken):
+                    sql = self.TAKEN_SEATS_SQL.format(marks=', '.join('?' * len(batch)))
+                    for flight_id, seat in conn.execute(sql, batch):
+                        taken[flight_id].add(seat)
+
+                rejected, booking_rows, ticket_rows = [], [], []
+                for rows, passenger_ids in candidates:
+                    flight = flights[(rows[0].flight_number, rows[0].departure_date)]
+                    seats = self._seats(rows, flight, taken)
+                    if isinstance(seats, str):
+                        rejected.append((rows, seats))
+                        continue
+                    taken[flight[0]].update(seats)
+                    reference = format_reference('booking_reference', next(booking_references))
+                    booking_rows.append((self.user_id, flight[0], len(rows),
+                                         round(sum(row.price for row in rows), 2), reference))
+                    ticket_rows.extend(
+                        (format_reference('ticket_number', next(ticket_numbers)), passenger_id,
+                         flight[0], reference, row.class_id, row.terminal_id, seat, row.price)
+                        for row, passenger_id, seat in zip(rows, passenger_ids, seats)
+                    )
+
+                booking_ids, ticket_ids = [], []
+                if booking_rows:
+                    last_booking = conn.execute("SELECT IFNULL(MAX(id), 0) FROM bookings").fetchone()[0]
+                    last_ticket = conn.execute("SELECT IFNULL(MAX(id), 0) FROM tickets").fetchone()[0]
+                    conn.executemany("""
+                        INSERT INTO bookings
+                        (user_id, flight_id, seat_count, booking_date, total_price, booking_reference)
+                        VALUES (?, ?, ?, date('now', 'localtime'), ?, ?)
+                    """, booking_rows)
+                    # The write lock is held, so every id past the old maximum is ours
+                    new_bookings = dict(conn.execute(
+                        "SELECT booking_reference, id FROM bookings WHERE id > ?", (last_booking,)))
+                    booking_ids = list(new_bookings.values())
+                    conn.executemany("""
+                        INSERT INTO tickets
+                        (ticket_number, passenger_id, flight_id, booking_id, class_id, terminal_id,
+                         seat_number, price, status)
+                        VALUES (?, ?, ?, ?, ?, ?, ?, ?, 'confirmed')
+                    """, [row[:3] + (new_bookings[row[3]],) + row[4:] for row in ticket_rows])
+                    ticket_ids = [row[0] for row in conn.execute(
+                        "SELECT id FROM tickets WHERE id > ?", (last_ticket,))]
+                conn.commit()
+            except BaseException:
+                conn.rollback()
+                raise
+        record_query('bookings.import', time.perf_counter() - start, len(ticket_rows))
+        return len(ticket_rows), rejected, booking_ids, ticket_ids
+
+    def _seats(self, rows, flight, taken):
+        """The booking's seats in row order, or the reason it cannot have them."""
+        first = rows[0]
+        if flight is None:
+            return f"Unknown flight {first.flight_number} on {first.departure_date}"
+        flight_id, status, plane_type_id, capacity = flight
+        if status not in BOOKABLE_STATUSES:
+            return f"Flight {first.flight_number} on {first.departure_date} is {status}"
+        offered = self.plane_classes.get(plane_type_id)
+        if offered and any(row.class_id not in offered for row in rows):
+            return "The plane on this flight has no seats in that class"
+        sold = taken[flight_id]
+        if len(sold) + len(rows) > capacity:
+            return f"Only {max(0, capacity - len(sold))} seats left on this flight"
+        wanted = [row.seat for row in rows if row.seat]
+        clash = [seat for seat in wanted if seat in sold]
+        if clash:
+            return f"Seat already taken: {', '.join(clash)}"
+        assigned = pick_free_seats(capacity, sold | set(wanted), len(rows) - len(wanted))
+        if assigned is None:
+            return "Not enough seats left on this flight"
+        assigned = iter(assigned)
+        return [row.seat or next(assigned) for row in rows]
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Import a bookings manifest (CSV, JSON or JSON Lines)")
+    parser.add_argument('manifest', help="file to import")
+    parser.add_argument('--db', help="database file (default: the application's)")
+    parser.add_argument('--errors', help="write rejected rows to this CSV file")
+    parser.add_argument('--user-id', type=int, default=1, help="user the bookings are made by")
+    parser.add_argument('--chunk-size', type=int, default=CHUNK_SIZE, help="tickets per transaction")
+    args = parser.parse_args()
+
+    print(f"🔄 Importing {args.manifest}...")
+    importer = BookingImporter(args.db, user_id=args.user_id, chunk_size=args.chunk_size)
+    report = importer.import_file(args.manifest, verbose=True)
+    print(f"✅ Imported {report['tickets']:,} tickets in {report['bookings']:,} bookings "
+          f"from {report['rows']:,} rows in {report['seconds']}s")
+    if report['errors']:
+        print(f"⚠️ {report['rejected']:,} rows rejected")
+        if args.errors:
+            write_error_report(report['errors'], args.errors)
+            print(f"   details written to {args.errors}")
+        else:
+            for issue in report['errors'][:20]:
+                print(f"   row {issue.row}: {issue.message}")
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
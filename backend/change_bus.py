@@ -0,0 +1,72 @@
+# -*- coding: utf-8 -*-
+# backend/change_bus.py
+import threading
+from collections import namedtuple
+
+# entity is a table name ('flights', 'bookings', 'tickets', 'passengers', ...),
+# action is 'insert', 'update' or 'delete', ids are the primary keys touched
+ChangeEvent = namedtuple('ChangeEvent', 'entity action ids')
+
+ACTIONS = ('insert', 'update', 'delete')
+
+
+class ChangeBus:
+    """In-process publish/subscribe for entity-level data changes.
+
+    The repositories publish an event after every committed write, so open
+    views and caches can react to exactly the entities that changed instead
+    of reloading defensively. Subscribers run synchronously on the publishing
+    thread; UI code goes through frontend/change_listener.py to get back onto
+    the Tk thread.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._subscribers = {}  # token -> (entities or None, callback)
+        self._next_token = 0
+
+    def subscribe(self, callback, entities=None):
+        """Call callback(event) for changes to the given entities (all when None); returns a token."""
+        with self._lock:
+            self._next_token += 1
+            token = self._next_token
+            self._subscribers[token] = (frozenset(entities) if entities else None, callback)
+        return token
+
+    def unsubscribe(self, token):
+        with self._lock:
+            self._subscribers.pop(token, None)
+
+    def publish(self, entity, action, ids=()):
+        """Tell the subscribers of entity that rows were inserted, updated or deleted."""
+        if action not in ACTIONS:
+            raise ValueError(f"Unknown change action: {action}")
+        event = ChangeEvent(entity, action, tuple(ids))
+        with self._lock:
+            callbacks = [callback for entities, callback in self._subscribers.values()
+                         if entities is None or entity in entities]
+        for callback in callbacks:
+            try:
+                callback(event)
+            except Exception as e:
+                # One broken view must not stop the others from hearing about it
+                print(f"❌ Change subscriber failed for {entity} {action}: {e}")
+        return event
+
+
+# The bus shared by the whole application
+change_bus = ChangeBus()
+
+
+def publish(entity, action, ids=()):
+    """Publish a change on the application bus."""
+    return change_bus.publish(entity, action, ids)
+
+
+def subscribe(callback, entities=None):
+    """Subscribe to the application bus; returns a token for unsubscribe()."""
+    return change_bus.subscribe(callback, entities)
+
+
+def unsubscribe(token):
+    change_bus.unsubscribe(token)
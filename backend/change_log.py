@@ -0,0 +1,223 @@
+# -*- coding: utf-8 -*-
+# backend/change_log.py
+import sqlite3
+import threading
+
+from backend.change_bus import change_bus
+from backend.database import DB_NAME, get_connection
+
+# Several workstations share one database file. Triggers append a row to
+# change_log for every insert, update and delete on the tables the screens
+# show; each running app polls for rows past the last sequence number it has
+# seen and republishes them on its change bus (backend/change_bus.py).
+# AUTOINCREMENT keeps seq increasing even after old rows are pruned.
+
+LOGGED_TABLES = ('flights', 'bookings', 'tickets', 'passengers', 'airports',
+                 'genders', 'countries', 'classes', 'terminals')
+
+# Seconds between polls, rows read per poll, and rows kept when pruning
+POLL_INTERVAL = 1.0
+BATCH_SIZE = 1000
+KEEP_ROWS = 50_000
+PRUNE_EVERY = 600  # polls
+
+CREATE_TABLE = """
+    CREATE TABLE IF NOT EXISTS change_log (
+        seq INTEGER PRIMARY KEY AUTOINCREMENT,
+        entity TEXT NOT NULL,
+        entity_id INTEGER,
+        op TEXT NOT NULL
+    )
+"""
+
+_OPS = (('insert', 'INSERT', 'new'), ('update', 'UPDATE', 'new'), ('delete', 'DELETE', 'old'))
+
+_TRIGGERS = [
+    (f"{table}_change_log_{op}",
+     f"CREATE TRIGGER IF NOT EXISTS {table}_change_log_{op} AFTER {event} ON {table} BEGIN\n"
+     f"INSERT INTO change_log (entity, entity_id, op) VALUES ('{table}', {row}.id, '{op}');\nEND")
+    for table in LOGGED_TABLES
+    for op, event, row in _OPS
+]
+
+CREATE_TRIGGERS = [sql for _, sql in _TRIGGERS]
+DROP_TRIGGERS = [f"DROP TRIGGER IF EXISTS {name}" for name, _ in _TRIGGERS]
+
+# Migration steps
+CHANGE_LOG = [CREATE_TABLE] + CREATE_TRIGGERS
+
+# Every pooled connection copies the seq of each log row it writes into
+# temp.local_changes. TEMP objects belong to that connection alone, so other
+# connections and workstations log exactly as before.
+LOCAL_CHANGES = [
+    "CREATE TEMP TABLE IF NOT EXISTS local_changes (seq INTEGER PRIMARY KEY)",
+    "CREATE TEMP TRIGGER IF NOT EXISTS change_log_local AFTER INSERT ON main.change_log BEGIN\n"
+    "INSERT INTO local_changes (seq) VALUES (new.seq);\nEND",
+]
+
+# database -> seqs of log rows this process wrote and its feed has not read
+# yet. Writers add to it just before they commit (note_local_changes), so the
+# feed can never read one of those rows before knowing it is an echo. Only
+# databases with a feed running are tracked.
+_local_seqs = {}
+_local_lock = threading.Lock()
+
+
+def suspend_change_log(conn):
+    """Drop the logging triggers for a bulk load; call resume_change_log after."""
+    for statement in DROP_TRIGGERS:
+        conn.execute(statement)
+
+
+def resume_change_log(conn, tables=LOGGED_TABLES):
+    """Recreate the triggers and log one entry per table meaning "many rows changed"."""
+    for statement in CREATE_TRIGGERS:
+        conn.execute(statement)
+    conn.executemany("INSERT INTO change_log (entity, entity_id, op) VALUES (?, NULL, 'insert')",
+                     [(table,) for table in tables])
+
+
+def track_local_changes(conn):
+    """Start noting the log rows conn writes; False while the database has no change log yet."""
+    if not conn.execute("SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = 'change_log'").fetchone():
+        return False
+    for statement in LOCAL_CHANGES:
+        conn.execute(statement)
+    return True
+
+
+def note_local_changes(conn, database):
+    """Commit hook (backend/database.py): hand the log rows of this transaction to the feed.
+
+    Runs inside the transaction, before the commit. Returns a callable that
+    takes them back if the commit fails, as their seqs may then be reused.
+    """
+    try:
+        seqs = [row[0] for row in conn.execute("SELECT seq FROM temp.local_changes")]
+    except sqlite3.OperationalError:
+        # Opened before the change log existed (a database being migrated)
+        track_local_changes(conn)
+        return None
+    if not seqs:
+        return None
+    conn.execute("DELETE FROM temp.local_changes")
+    with _local_lock:
+        pending = _local_seqs.get(database)
+        if pending is None:
+            return None
+        pending.update(seqs)
+
+    def undo():
+        with _local_lock:
+            pending.difference_update(seqs)
+    return undo
+
+
+def latest_sequence(conn):
+    return conn.execute("SELECT IFNULL(MAX(seq), 0) FROM change_log").fetchone()[0]
+
+
+def read_changes(conn, after, limit=BATCH_SIZE):
+    """Log rows past sequence number after: [(seq, entity, entity_id, op)]."""
+    return conn.execute(
+        "SELECT seq, entity, entity_id, op FROM change_log WHERE seq > ? ORDER BY seq LIMIT ?",
+        (after, limit)
+    ).fetchall()
+
+
+def group_changes(rows):
+    """Merge consecutive rows for the same entity and op into (entity, op, ids).
+
+    ids is empty when any of the rows does not name one (a bulk change).
+    """
+    groups = []
+    for _, entity, entity_id, op in rows:
+        if groups and groups[-1][0] == entity and groups[-1][1] == op:
+            ids = groups[-1][2]
+        else:
+            ids = []
+            groups.append((entity, op, ids))
+        ids.append(entity_id)
+    return [(entity, op, () if None in ids else tuple(ids)) for entity, op, ids in groups]
+
+
+class ChangeFeed:
+    """Polls change_log and publishes other workstations' changes on the change bus.
+
+    Changes this process made were already published when they were written.
+    Their log rows are skipped by seq: pooled connections hand them over just
+    before committing (note_local_changes). If the log was pruned past the
+    last row seen, every logged table is announced as changed (empty ids).
+    """
+
+    def __init__(self, bus=change_bus, database=None, profile=None, interval=POLL_INTERVAL):
+        self.bus = bus
+        self.database = database
+        self.profile = profile
+        self.interval = interval
+        self.last_seq = None
+        self._stop = threading.Event()
+        self._thread = None
+        self._polls = 0
+        with _local_lock:
+            self._local = _local_seqs.setdefault(database or DB_NAME, set())
+
+    def start(self):
+        """Start polling on a background thread, beginning with changes made from now on."""
+        with get_connection(self.profile, self.database) as conn:
+            self.last_seq = latest_sequence(conn)
+        self._thread = threading.Thread(target=self._run, name="change-feed", daemon=True)
+        self._thread.start()
+
+    def stop(self):
+        self._stop.set()
+        with _local_lock:
+            if _local_seqs.get(self.database or DB_NAME) is self._local:
+                del _local_seqs[self.database or DB_NAME]
+        if self._thread is not None and self._thread is not threading.current_thread():
+            self._thread.join(timeout=self.interval * 2)
+
+    def poll(self):
+        """Read and publish the new log rows once; returns the number of rows read."""
+        with get_connection(self.profile, self.database) as conn:
+            if self.last_seq is None:
+                self.last_seq = latest_sequence(conn)
+            oldest = conn.execute("SELECT MIN(seq) FROM change_log").fetchone()[0]
+            rows = read_changes(conn, self.last_seq)
+            self._polls += 1
+            if self._polls % PRUNE_EVERY == 0:
+                self._prune(conn)
+
+        if oldest is not None and oldest > self.last_seq + 1:
+            # Rows we never saw were pruned: anything may have changed
+            self._publish([(table, 'update', ()) for table in LOGGED_TABLES])
+        if rows:
+            self.last_seq = rows[-1][0]
+            self._publish(group_changes(self._remote(rows)))
+        return len(rows)
+
+    def _run(self):
+        while not self._stop.wait(self.interval):
+            try:
+                # Keep reading while a burst is larger than one batch
+                while self.poll() == BATCH_SIZE and not self._stop.is_set():
+                    pass
+            except Exception as e:
+                print(f"❌ Change feed poll failed: {e}")
+
+    def _prune(self, conn):
+        conn.execute("DELETE FROM change_log WHERE seq <= (SELECT MAX(seq) FROM change_log) - ?",
+                     (KEEP_ROWS,))
+        conn.commit()
+
+    def _publish(self, changes):
+        for entity, op, ids in changes:
+            self.bus.publish(entity, op, ids)
+
+    def _remote(self, rows):
+        """The log rows not written by this process."""
+        with _local_lock:
+            remote = [row for row in rows if row[0] not in self._local]
+            # Everything up to the last row read has now been seen (or pruned)
+            self._local.difference_update([seq for seq in self._local if seq <= self.last_seq])
+        return remote
@@ -0,0 +1,301 @@
+# -*- coding: utf-8 -*-
+# backend/connection_pool.py
+import atexit
+import itertools
+import queue
+import sqlite3
+import threading
+import time
+
+
+class PoolTimeoutError(sqlite3.OperationalError):
+    """Raised when no pooled connection becomes free within the timeout."""
+
+
+# Unique names for the savepoints of nested checkouts
+_savepoints = itertools.count(1)
+
+
+class PooledConnection:
+    """Proxy handed out by the pool - close() returns the connection instead of closing it.
+
+    A checkout nested in another one on the same thread shares its connection.
+    If that connection is in a transaction, the nested checkout runs in a
+    SAVEPOINT: its commit() keeps its work as part of the outer transaction
+    (committed or rolled back with it) and its rollback() only undoes its own
+    work. Whatever a nested checkout leaves uncommitted is rolled back when it
+    is closed, as a transaction it opened itself would be.
+    """
+
+    def __init__(self, pool, conn, owner, nested=False):
+        self._pool = pool
+        self._conn = conn
+        self._owner = owner
+        self._released = False
+        self._nested = nested
+        self._savepoint = None
+        if nested and conn.in_transaction:
+            try:
+                self._savepoint = f"pooled_checkout_{next(_savepoints)}"
+                conn.execute(f"SAVEPOINT {self._savepoint}")
+            except BaseException:
+                self._released = True
+                pool.release(conn, owner)
+                raise
+
+    def __getattr__(self, name):
+        # Only called for attributes not defined on the proxy itself
+        if self._released:
+            raise sqlite3.ProgrammingError("Connection has already been returned to the pool")
+        if threading.get_ident() != self._owner:
+            raise sqlite3.ProgrammingError(
+                "Pooled connection used outside the thread that checked it out"
+            )
+        return getattr(self._conn, name)
+
+    def __enter__(self):
+        return self
+
+    def commit(self):
+        """Commit, after giving the pool's on_commit hook a look at the transaction."""
+        commit = self.__getattr__('commit')  # same ownership checks as any other call
+        if self._savepoint:
+            # The outer checkout commits; keep isolating whatever comes next
+            self._conn.execute(f"RELEASE {self._savepoint}")
+            self._conn.execute(f"SAVEPOINT {self._savepoint}")
+            return
+        undo = None
+        if self._pool.on_commit and self._conn.in_transaction:
+            undo = self._pool.on_commit(self._conn)
+        try:
+            commit()
+        except BaseException:
+            if undo:
+                undo()
+            raise
+
+    def rollback(self):
+        """Roll back this checkout's work (only back to its savepoint when nested)."""
+        rollback = self.__getattr__('rollback')
+        if self._savepoint:
+            self._conn.execute(f"ROLLBACK TO {self._savepoint}")
+        else:
+            rollback()
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+        return False
+
+    def __del__(self):
+        # Safety net for callers that raise before reaching close()
+        try:
+            self.close()
+        except Exception:
+            pass
+
+    def close(self):
+        """Return the connection to the pool."""
+        if not self._released:
+            self._released = True
+            try:
+                if self._nested:
+                    self._end_nested()
+            finally:
+                self._pool.release(self._conn, self._owner)
+
+    def _end_nested(self):
+        """Roll back what a nested checkout left uncommitted, leaving the outer work alone."""
+        try:
+            if self._savepoint:
+                if self._conn.in_transaction:
+                    self._conn.execute(f"ROLLBACK TO {self._savepoint}")
+                    self._conn.execute(f"RELEASE {self._savepoint}")
+            elif self._conn.in_transaction:
+                # No transaction was open at checkout, so this one is ours
+                self._conn.rollback()
+        except sqlite3.Error:
+            # The outer transaction already ended, taking the savepoint with it
+            pass
+
+
+class ConnectionPool:
+    """Bounded set of long-lived SQLite connections shared by the whole app.
+
+    Ownership rules:
+    - a connection belongs to the thread that checked it out until it is released
+    - nested checkouts on the same thread share that thread's connection; inside
+      an open transaction they run in a savepoint (see PooledConnection)
+    - uncommitted work is rolled back when the checkout that did it is released
+    """
+
+    def __init__(self, database, max_size=5, timeout=10.0, health_check_interval=30.0,
+                 on_connect=None, on_commit=None):
+        self.database = database
+        self.max_size = max_size
+        self.timeout = timeout
+        self.health_check_interval = health_check_interval
+        self.on_connect = on_connect
+        # Called with the raw connection just before a pooled commit, still inside
+        # the transaction; may return a callable that undoes it if the commit fails
+        self.on_commit = on_commit
+
+        self._idle = queue.LifoQueue()  # LIFO so the warmest connection is reused first
+        self._lock = threading.Lock()
+        self._checked_out = {}  # thread id -> [conn, refcount]
+        self._last_used = {}  # id(conn) -> timestamp of last release
+        self._created = 0
+        self._closed = False
+
+    def _connect(self):
+        """Open a new raw connection."""
+        conn = sqlite3.connect(self.database, timeout=self.timeout, check_same_thread=False)
+        conn.row_factory = sqlite3.Row  # allows dictionary-like access
+        if self.on_connect:
+            self.on_connect(conn)
+        return conn
+
+    def _is_healthy(self, conn):
+        """Ping connections that sat idle for a while before handing them out."""
+        last_used = self._last_used.get(id(conn), 0)
+        if time.monotonic() - last_used < self.health_check_interval:
+            return True
+        try:
+            conn.execute("SELECT 1").fetchone()
+            return True
+        except sqlite3.Error:
+            return False
+
+    def _discard(self, conn):
+        """Drop a broken connection and free its slot."""
+        with self._lock:
+            self._created -= 1
+            self._last_used.pop(id(conn), None)
+        try:
+            conn.close()
+        except sqlite3.Error:
+            pass
+
+    def acquire(self):
+        """Check out a connection for the calling thread."""
+        if self._closed:
+            raise sqlite3.ProgrammingError("Connection pool is closed")
+
+        owner = threading.get_ident()
+        with self._lock:
+            entry = self._checked_out.get(owner)
+            if entry:
+                entry[1] += 1
+        if entry:
+            return PooledConnection(self, entry[0], owner, nested=True)
+
+        deadline = time.monotonic() + self.timeout
+        while True:
+            conn = None
+            try:
+                conn = self._idle.get_nowait()
+            except queue.Empty:
+                with self._lock:
+                    can_create = self._created < self.max_size
+                    if can_create:
+                        self._created += 1
+                if can_create:
+                    try:
+                        conn = self._connect()
+                    except Exception:
+                        with self._lock:
+                            self._created -= 1
+                        raise
+                else:
+                    remaining = deadline - time.monotonic()
+                    if remaining <= 0:
+                        raise PoolTimeoutError(
+                            f"No database connection available after {self.timeout}s"
+                        )
+                    try:
+                        conn = self._idle.get(timeout=remaining)
+                    except queue.Empty:
+                        continue
+
+            if not self._is_healthy(conn):
+                self._discard(conn)
+                continue
+
+            with self._lock:
+                self._checked_out[owner] = [conn, 1]
+            return PooledConnection(self, conn, owner)
+
+    def release(self, conn, owner):
+        """Give a checkout back; the connection returns to the pool on the last release."""
+        with self._lock:
+            entry = self._checked_out.get(owner)
+            if not entry or entry[0] is not conn:
+                return
+            entry[1] -= 1
+            if entry[1] > 0:
+                return
+            del self._checked_out[owner]
+
+        try:
+            if conn.in_transaction:
+                conn.rollback()
+        except sqlite3.Error:
+            self._discard(conn)
+            return
+
+        if self._closed:
+            self._discard(conn)
+            return
+
+        self._last_used[id(conn)] = time.monotonic()
+        self._idle.put(conn)
+
+    def connection(self):
+        """Context manager checkout: ``with pool.connection() as conn: ...``"""
+        return self.acquire()
+
+    def stats(self):
+        """Return a snapshot of pool usage."""
+        with self._lock:
+            return {
+                'database': self.database,
+                'max_size': self.max_size,
+                'open': self._created,
+                'idle': self._idle.qsize(),
+                'in_use': len(self._checked_out),
+            }
+
+    def close(self):
+        """Close every idle connection; busy ones are closed when released."""
+        self._closed = True
+        while True:
+            try:
+                conn = self._idle.get_nowait()
+            except queue.Empty:
+                break
+            self._discard(conn)
+
+
+_pools = {}
+_pools_lock = threading.Lock()
+
+
+def get_pool(database, key=None, **kwargs):
+    """Return the shared pool for a database file (and optional key), creating it on first use."""
+    with _pools_lock:
+        pool = _pools.get((database, key))
+        if pool is None or pool._closed:
+            pool = ConnectionPool(database, **kwargs)
+            _pools[(database, key)] = pool
+        return pool
+
+
+def close_all_pools():
+    """Close every shared pool (called automatically at interpreter exit)."""
+    with _pools_lock:
+        pools = list(_pools.values())
+        _pools.clear()
+    for pool in pools:
+        pool.close()
+
+
+atexit.register(close_all_pools)
@@ -0,0 +1,137 @@
+# -*- coding: utf-8 -*-
+# backend/daily_stats.py
+
+# Per-day counters behind the dashboard, kept current by triggers so reading
+# today's figures is a handful of primary key lookups instead of a scan of
+# bookings and tickets:
+#   flights     flights departing that day
+#   bookings    bookings made that day
+#   passengers  active (not cancelled) tickets on flights departing that day
+#   revenue     price of the active tickets of bookings made that day
+
+METRICS = ('flights', 'bookings', 'passengers', 'revenue')
+
+CREATE_TABLE = """
+    CREATE TABLE IF NOT EXISTS daily_stats (
+        day TEXT NOT NULL,
+        metric TEXT NOT NULL,
+        value REAL NOT NULL DEFAULT 0,
+        PRIMARY KEY (day, metric)
+    ) WITHOUT ROWID
+"""
+
+# Days of the rows a ticket counts towards
+_FLIGHT_DAY = "(SELECT departure_date FROM flights WHERE id = {row}.flight_id)"
+_BOOKING_DAY = "(SELECT booking_date FROM bookings WHERE id = {row}.booking_id)"
+_ACTIVE = "{row}.status <> 'cancelled'"
+
+
+def _add(metric, day, amount, condition='1'):
+    """Trigger statement adding amount to a day's metric (no-op when the condition fails)."""
+    return (f"INSERT INTO daily_stats (day, metric, value) "
+            f"SELECT day, '{metric}', {amount} FROM (SELECT {day} AS day) "
+            f"WHERE day IS NOT NULL AND {condition} "
+            f"ON CONFLICT (day, metric) DO UPDATE SET value = value + excluded.value;")
+
+
+def _ticket(row, sign):
+    """Statements adding (sign '+') or removing (sign '-') one ticket's share."""
+    active = _ACTIVE.format(row=row)
+    return "\n".join([
+        _add('passengers', _FLIGHT_DAY.format(row=row), f"{sign}1", active),
+        _add('revenue', _BOOKING_DAY.format(row=row), f"{sign}IFNULL({row}.price, 0)", active),
+    ])
+
+
+def _trigger(name, event, body):
+    return f"CREATE TRIGGER IF NOT EXISTS {name} {event} BEGIN\n{body}\nEND"
+
+
+# (name, event, body) for every trigger that keeps the counters current
+_TRIGGERS = [
+    ('flights_stats_insert', "AFTER INSERT ON flights", _add('flights', "new.departure_date", "1")),
+    ('flights_stats_delete', "AFTER DELETE ON flights", _add('flights', "old.departure_date", "-1")),
+    # A moved flight takes its passengers with it
+    ('flights_stats_update', "AFTER UPDATE OF departure_date ON flights "
+                             "WHEN old.departure_date IS NOT new.departure_date",
+     "\n".join([
+         _add('flights', "old.departure_date", "-1"),
+         _add('flights', "new.departure_date", "1"),
+         _add('passengers', "old.departure_date",
+              "-(SELECT COUNT(*) FROM tickets WHERE flight_id = new.id AND status <> 'cancelled')"),
+         _add('passengers', "new.departure_date",
+              "(SELECT COUNT(*) FROM tickets WHERE flight_id = new.id AND status <> 'cancelled')"),
+     ])),
+
+    ('bookings_stats_insert', "AFTER INSERT ON bookings", _add('bookings', "new.booking_date", "1")),
+    ('bookings_stats_delete', "AFTER DELETE ON bookings", _add('bookings', "old.booking_date", "-1")),
+    ('bookings_stats_update', "AFTER UPDATE OF booking_date ON bookings "
+                              "WHEN old.booking_date IS NOT new.booking_date",
+     "\n".join([
+         _add('bookings', "old.booking_date", "-1"),
+         _add('bookings', "new.booking_date", "1"),
+         _add('revenue', "old.booking_date",
+              "-(SELECT IFNULL(SUM(price), 0) FROM tickets "
+              "WHERE booking_id = new.id AND status <> 'cancelled')"),
+         _add('revenue', "new.booking_date",
+              "(SELECT IFNULL(SUM(price), 0) FROM tickets "
+              "WHERE booking_id = new.id AND status <> 'cancelled')"),
+     ])),
+
+    ('tickets_stats_insert', "AFTER INSERT ON tickets", _ticket('new', '+')),
+    ('tickets_stats_delete', "AFTER DELETE ON tickets", _ticket('old', '-')),
+    # Cancelling a ticket, repricing it or moving it to another flight or booking
+    ('tickets_stats_update', "AFTER UPDATE OF status, price, flight_id, booking_id ON tickets",
+     _ticket('old', '-') + "\n" + _ticket('new', '+')),
+]
+
+CREATE_TRIGGERS = [_trigger(name, event, body) for name, event, body in _TRIGGERS]
+DROP_TRIGGERS = [f"DROP TRIGGER IF EXISTS {name}" for name, _, _ in _TRIGGERS]
+
+REBUILD = [
+    "DELETE FROM daily_stats",
+    """
+    INSERT INTO daily_stats (day, metric, value)
+    SELECT departure_date, 'flights', COUNT(*) FROM flights
+    WHERE departure_date IS NOT NULL GROUP BY departure_date
+    """,
+    """
+    INSERT INTO daily_stats (day, metric, value)
+    SELECT booking_date, 'bookings', COUNT(*) FROM bookings
+    WHERE booking_date IS NOT NULL GROUP BY booking_date
+    """,
+    """
+    INSERT INTO daily_stats (day, metric, value)
+    SELECT f.departure_date, 'passengers', COUNT(*)
+    FROM tickets t JOIN flights f ON t.flight_id = f.id
+    WHERE t.status <> 'cancelled' AND f.departure_date IS NOT NULL
+    GROUP BY f.departure_date
+    """,
+    """
+    INSERT INTO daily_stats (day, metric, value)
+    SELECT b.booking_date, 'revenue', SUM(IFNULL(t.price, 0))
+    FROM tickets t JOIN bookings b ON t.booking_id = b.id
+    WHERE t.status <> 'cancelled' AND b.booking_date IS NOT NULL
+    GROUP BY b.booking_date
+    """,
+]
+
+# Migration steps: table, initial fill, then the triggers
+DAILY_STATS = [CREATE_TABLE] + REBUILD + CREATE_TRIGGERS
+
+
+def rebuild_daily_stats(conn):
+    """Recount every day from the base tables (after a bulk load with the triggers off)."""
+    for statement in REBUILD:
+        conn.execute(statement)
+
+
+def suspend_stats_triggers(conn):
+    """Drop the counter triggers; bulk loads call rebuild_daily_stats and resume_stats_triggers after."""
+    for statement in DROP_TRIGGERS:
+        conn.execute(statement)
+
+
+def resume_stats_triggers(conn):
+    for statement in CREATE_TRIGGERS:
+        conn.execute(statement)
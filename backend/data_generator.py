@@ -0,0 +1,340 @@
+# -*- coding: utf-8 -*-
+# backend/data_generator.py
+import argparse
+import random
+import time
+from datetime import date, datetime, timedelta
+
+from backend.booking_engine import seat_label
+from backend.change_log import resume_change_log, suspend_change_log
+from backend.daily_stats import rebuild_daily_stats, resume_stats_triggers, suspend_stats_triggers
+from backend.database import get_connection
+from backend.migrations import migrate
+from backend.search_index import (rebuild_search_index, resume_search_triggers,
+                                  suspend_search_triggers)
+from backend.seeder import FIXTURES, load_fixtures
+
+# Dataset sizes: (passengers, flights, tickets)
+SCALES = {
+    'small': (10_000, 2_000, 50_000),
+    'medium': (100_000, 20_000, 500_000),
+    'large': (1_000_000, 200_000, 5_000_000),
+}
+
+# Reference tables the generated rows point at; loaded from the seeder fixtures
+REFERENCE_TABLES = ('countries', 'genders', 'classes', 'plane_types', 'branches', 'terminals',
+                    'airports', 'planes', 'plane_available_classes', 'airport_terminals', 'users')
+
+MALE_NAMES = ['Mohammed', 'Ahmed', 'Omar', 'Khalid', 'Yousef', 'Ali', 'Hassan', 'Ibrahim',
+              'Abdullah', 'Saeed', 'Faisal', 'Hamad', 'Tariq', 'Mustafa', 'Karim', 'James',
+              'David', 'Michael', 'Rahul', 'Arjun', 'Wei', 'Kenji', 'Luca', 'Carlos']
+FEMALE_NAMES = ['Aisha', 'Fatima', 'Layla', 'Mariam', 'Noura', 'Sara', 'Huda', 'Amal',
+                'Reem', 'Hessa', 'Salma', 'Yasmin', 'Dina', 'Rania', 'Emma', 'Olivia',
+                'Sophia', 'Priya', 'Ananya', 'Mei', 'Yuki', 'Giulia', 'Lucia', 'Hana']
+FAMILY_NAMES = ['Al-Mansoori', 'Al-Qasimi', 'Al-Otaibi', 'Rahman', 'Hassan', 'Khalid',
+                'Ibrahim', 'Ahmed', 'Al-Harbi', 'Al-Ghamdi', 'Al-Zahrani', 'Al-Shamsi',
+                'El-Sayed', 'Mahmoud', 'Abdelaziz', 'Al-Kuwari', 'Al-Thani', 'Smith',
+                'Johnson', 'Sharma', 'Patel', 'Chen', 'Tanaka', 'Rossi', 'Garcia']
+
+# Nationality mix skewed towards the Gulf and Egypt routes we fly
+NATIONALITY_WEIGHTS = {'UAE': 20, 'SA': 25, 'EG': 20, 'QA': 6, 'IN': 10, 'UK': 3, 'US': 3,
+                       'CA': 1, 'FR': 1, 'DE': 1, 'TR': 2, 'MY': 1, 'CN': 2, 'AU': 1}
+
+CLASS_WEIGHTS = {'Economy': 80, 'Business': 16, 'First': 4}
+CLASS_PRICES = {'Economy': 450, 'Business': 850, 'First': 1200}
+
+# Tickets per booking: mostly solo travellers, some families
+GROUP_SIZES = [1, 2, 3, 4, 5, 6]
+GROUP_WEIGHTS = [58, 24, 9, 5, 2, 2]
+
+
+def _load_reference_data(cursor):
+    """Read the ids generated rows will point at."""
+    def id_map(sql):
+        cursor.execute(sql)
+        return {row[0]: row[1] for row in cursor.fetchall()}
+
+    refs = {
+        'countries': id_map("SELECT code, id FROM countries"),
+        'genders': id_map("SELECT name, id FROM genders"),
+        'classes': id_map("SELECT name, id FROM classes"),
+        'airports': [row[0] for row in cursor.execute("SELECT id FROM airports ORDER BY id")],
+        'branches': [row[0] for row in cursor.execute("SELECT id FROM branches ORDER BY id")],
+        'users': [row[0] for row in cursor.execute("SELECT user_id FROM users ORDER BY user_id")],
+        'terminals': [row[0] for row in cursor.execute("SELECT MIN(id) FROM terminals GROUP BY number")],
+    }
+
+    cursor.execute("SELECT p.id, p.plane_type_id FROM planes p ORDER BY p.id")
+    refs['planes'] = cursor.fetchall()
+    refs['seat_capacity'] = id_map("SELECT id, seat_capacity FROM plane_types")
+
+    plane_classes = {}
+    cursor.execute("SELECT plane_type_id, class_id FROM plane_available_classes")
+    for plane_type_id, class_id in cursor.fetchall():
+        plane_classes.setdefault(plane_type_id, set()).add(class_id)
+    refs['plane_classes'] = plane_classes
+
+    airport_terminals = {}
+    cursor.execute("SELECT airport_id, terminal_id FROM airport_terminals")
+    for airport_id, terminal_id in cursor.fetchall():
+        airport_terminals.setdefault(airport_id, []).append(terminal_id)
+    refs['airport_terminals'] = airport_terminals
+    return refs
+
+
+def _passenger_rows(rng, refs, count, first_id):
+    """Yield passenger rows with unique passport numbers."""
+    male_id = refs['genders'].get('Male')
+    female_id = refs['genders'].get('Female')
+    codes = [c for c in NATIONALITY_WEIGHTS if c in refs['countries']]
+    weights = [NATIONALITY_WEIGHTS[c] for c in codes]
+    for n in range(count):
+        if rng.random() < 0.5:
+            first, gender_id = rng.choice(MALE_NAMES), male_id
+        else:
+            first, gender_id = rng.choice(FEMALE_NAMES), female_id
+        country_id = refs['countries'][rng.choices(codes, weights)[0]]
+        passport = f"G{first_id + n:08d}"
+        yield (first_id + n, passport, f"{first} {rng.choice(FAMILY_NAMES)}", gender_id, country_id)
+
+
+def _flight_rows(rng, refs, count, first_id, start_date, flights_per_day):
+    """Yield flight rows spread over consecutive days from start_date."""
+    today = date.today().isoformat()
+    airports = refs['airports']
+    for n in range(count):
+        day = start_date + timedelta(days=n // flights_per_day)
+        number = 100 + n % flights_per_day  # unique per day, so (flight_number, date) is unique
+        origin, destination = rng.sample(airports, 2)
+        plane_id = rng.choice(refs['planes'])[0]
+        departure = datetime.combine(day, datetime.min.time()) + timedelta(minutes=rng.randrange(0, 24 * 60, 5))
+        arrival = departure + timedelta(minutes=rng.randrange(60, 6 * 60, 5))
+        if departure.date().isoformat() < today:
+            status = 'cancelled' if rng.random() < 0.03 else 'arrived'
+        else:
+            roll = rng.random()
+            status = 'cancelled' if roll < 0.02 else 'delayed' if roll < 0.05 else 'scheduled'
+        yield (first_id + n, f"AK{number}", plane_id, rng.choice(refs['branches']), origin, destination,
+               departure.strftime("%Y-%m-%d"), departure.strftime("%H:%M"),
+               arrival.strftime("%Y-%m-%d"), arrival.strftime("%H:%M"), status)
+
+
+def _pick_class(rng, refs, plane_type_id):
+    """Weighted class choice, downgraded to what the plane type offers."""
+    available = refs['plane_classes'].get(plane_type_id)
+    name = rng.choices(list(CLASS_WEIGHTS), list(CLASS_WEIGHTS.values()))[0]
+    for candidate in (name, 'Business', 'Economy'):
+        class_id = refs['classes'].get(candidate)
+        if class_id and (not available or class_id in available):
+            return candidate, class_id
+    return 'Economy', next(iter(refs['classes'].values()))
+
+
+def generate_dataset(database=None, passengers=10_000, flights=2_000, tickets=50_000,
+                     seed=42, batch_size=20_000, start_date=None, flights_per_day=None,
+                     verbose=True):
+    """Stream a synthetic dataset into a database in batched transactions.
+
+    Returns a dict with the row counts and elapsed time.
+    """
+    rng = random.Random(seed)
+    started = time.perf_counter()
+    conn = get_connection('bulk_import', database)
+    cursor = conn.cursor()
+
+    def log(message):
+        if verbose:
+            print(message)
+
+    def insert_batches(sql, rows, label, total):
+        batch = []
+        done = 0
+        for row in rows:
+            batch.append(row)
+            if len(batch) >= batch_size:
+                conn.execute("BEGIN IMMEDIATE")
+                cursor.executemany(sql, batch)
+                conn.commit()
+                done += len(batch)
+                batch = []
+                log(f"   {label}: {done:,}/{total:,}")
+        if batch:
+            conn.execute("BEGIN IMMEDIATE")
+            cursor.executemany(sql, batch)
+            conn.commit()
+            done += len(batch)
+        return done
+
+    def restore_derived_data():
+        conn.execute("BEGIN IMMEDIATE")
+        rebuild_search_index(conn)
+        resume_search_triggers(conn)
+        rebuild_daily_stats(conn)
+        resume_stats_triggers(conn)
+        resume_change_log(conn)
+        conn.commit()
+
+    suspended = False
+    try:
+        migrate(conn)
+        conn.execute("BEGIN IMMEDIATE")
+        load_fixtures(conn, [f for f in FIXTURES if f['table'] in REFERENCE_TABLES])
+        # Keeping the search index and dashboard counters current row by row
+        # would dominate the load; they are rebuilt once at the end instead.
+        # The change log gets one entry per table rather than one per row.
+        suspend_search_triggers(conn)
+        suspend_stats_triggers(conn)
+        suspend_change_log(conn)
+        conn.commit()
+        suspended = True
+        refs = _load_reference_data(cursor)
+
+        def next_id(table):
+            return (cursor.execute(f"SELECT MAX(id) FROM {table}").fetchone()[0] or 0) + 1
+
+        # Passengers
+        log(f"🔄 Generating {passengers:,} passengers...")
+        first_passenger = next_id('passengers')
+        insert_batches(
+            "INSERT INTO passengers (id, passport_number, name, gender_id, nationality_country_id) "
+            "VALUES (?, ?, ?, ?, ?)",
+            _passenger_rows(rng, refs, passengers, first_passenger), 'passengers', passengers)
+
+        # Flights: six months of history, the rest in the future
+        flights_per_day = flights_per_day or max(1, flights // 365)
+        start_date = start_date or (date.today() - timedelta(days=180))
+        log(f"🔄 Generating {flights:,} flights ({flights_per_day}/day from {start_date})...")
+        first_flight = next_id('flights')
+        flight_info = []  # (plane_type_id, origin_airport_id, departure_date) per generated flight
+        plane_types = dict(refs['planes'])
+
+        def tracked_flights():
+            for row in _flight_rows(rng, refs, flights, first_flight, start_date, flights_per_day):
+                flight_info.append((plane_types[row[2]], row[4], row[6]))
+                yield row
+
+        insert_batches(
+            "INSERT INTO flights (id, flight_number, plane_id, branch_id, origin_airport_id, "
+            "destination_airport_id, departure_date, departure_time, arrival_date, arrival_time, status) "
+            "VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)",
+            tracked_flights(), 'flights', flights)
+
+        # Bookings and their tickets, batched together so every batch is consistent
+        seats_taken = [0] * flights
+        capacity = [refs['seat_capacity'][plane_type_id] for plane_type_id, _, _ in flight_info]
+        if tickets > sum(capacity):
+            log(f"⚠️ Only {sum(capacity):,} seats on {flights:,} flights; generating that many tickets")
+            tickets = sum(capacity)
+        # Flights with seats left, in schedule order until the first one fills up
+        open_flights = [index for index in range(flights) if capacity[index]]
+        log(f"🔄 Generating {tickets:,} tickets...")
+        first_booking = next_id('bookings')
+        first_ticket = next_id('tickets')
+        passenger_count = passengers
+        booking_batch, ticket_batch = [], []
+        booking_id, ticket_id = first_booking, first_ticket
+        written = 0
+
+        def flush():
+            conn.execute("BEGIN IMMEDIATE")
+            cursor.executemany(
+                "INSERT INTO bookings (id, user_id, flight_id, seat_count, booking_date, total_price, "
+                "booking_reference) VALUES (?, ?, ?, ?, ?, ?, ?)", booking_batch)
+            cursor.executemany(
+                "INSERT INTO tickets (id, ticket_number, passenger_id, flight_id, booking_id, class_id, "
+                "terminal_id, seat_number, price, status) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                ticket_batch)
+            conn.commit()
+            booking_batch.clear()
+            ticket_batch.clear()
+
+        while written < tickets and passenger_count and open_flights:
+            # Popular flights sell more: skew towards a random subset of the schedule
+            position = int(len(open_flights) * rng.random() ** 1.5)
+            index = open_flights[position]
+            group = min(rng.choices(GROUP_SIZES, GROUP_WEIGHTS)[0], tickets - written,
+                        capacity[index] - seats_taken[index])
+            if seats_taken[index] + group == capacity[index]:
+                # Full after this booking: swap it out of the pool
+                open_flights[position] = open_flights[-1]
+                open_flights.pop()
+            plane_type_id, origin_id, departure_date = flight_info[index]
+            flight_id = first_flight + index
+            class_name, class_id = _pick_class(rng, refs, plane_type_id)
+            terminal_id = rng.choice(refs['airport_terminals'].get(origin_id) or refs['terminals'])
+            price = round(CLASS_PRICES[class_name] * rng.uniform(0.8, 1.4), 2)
+            booked_on = date.fromisoformat(departure_date) - timedelta(days=int(rng.expovariate(1 / 21)))
+            status = 'cancelled' if rng.random() < 0.04 else 'confirmed'
+
+            booking_batch.append((booking_id, rng.choice(refs['users']), flight_id, group,
+                                  booked_on.isoformat(), round(price * group, 2), f"GBR{booking_id:09d}"))
+            lead_passenger = first_passenger + rng.randrange(passenger_count)
+            for member in range(group):
+                passenger_id = first_passenger + (lead_passenger - first_passenger + member) % passenger_count
+                ticket_batch.append((ticket_id, f"GTK{ticket_id:010d}", passenger_id, flight_id, booking_id,
+                                     class_id, terminal_id, seat_label(seats_taken[index]), price, status))
+                seats_taken[index] += 1
+                ticket_id += 1
+            booking_id += 1
+            written += group
+
+            if len(ticket_batch) >= batch_size:
+                flush()
+                log(f"   tickets: {written:,}/{tickets:,}")
+        if ticket_batch:
+            flush()
+
+        log("🔄 Building the search index and dashboard counters...")
+        restore_derived_data()
+        suspended = False
+
+        log("🔄 Updating planner statistics...")
+        conn.execute("ANALYZE")
+        conn.commit()
+
+        elapsed = time.perf_counter() - started
+        summary = {
+            'database': database,
+            'passengers': passengers,
+            'flights': flights,
+            'bookings': booking_id - first_booking,
+            'tickets': written,
+            'seconds': round(elapsed, 2),
+        }
+        log(f"🎉 Generated {written:,} tickets in {summary['bookings']:,} bookings in {elapsed:.1f}s")
+        return summary
+    except BaseException:
+        # Never leave the triggers off: whatever was written must stay searchable
+        if conn.in_transaction:
+            conn.rollback()
+        if suspended:
+            restore_derived_data()
+        raise
+    finally:
+        conn.close()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Generate a synthetic Al Kawthar dataset for scale testing")
+    parser.add_argument('--db', required=True, help="target database file (created if missing)")
+    parser.add_argument('--scale', choices=SCALES, default='small', help="preset volumes")
+    parser.add_argument('--passengers', type=int, help="override the preset passenger count")
+    parser.add_argument('--flights', type=int, help="override the preset flight count")
+    parser.add_argument('--tickets', type=int, help="override the preset ticket count")
+    parser.add_argument('--seed', type=int, default=42, help="random seed (same seed, same data)")
+    parser.add_argument('--batch-size', type=int, default=20_000, help="rows per transaction")
+    args = parser.parse_args()
+
+    passengers, flights, tickets = SCALES[args.scale]
+    generate_dataset(
+        args.db,
+        passengers=args.passengers or passengers,
+        flights=args.flights or flights,
+        tickets=args.tickets or tickets,
+        seed=args.seed,
+        batch_size=args.batch_size,
+    )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,157 @@
+# -*- coding: utf-8 -*-
+# backend/id_allocator.py
+import os
+import threading
+
+from backend.database import get_connection
+
+# Booking references and ticket numbers come from counters in id_sequences.
+# A workstation reserves a block of values in one short write and hands them
+# out from memory, so references never collide between workstations and most
+# bookings cost no extra round trip. Values of a block that is never used
+# (the app is closed, a booking fails) are simply skipped.
+
+# Sequence -> (prefix, minimum digits before the check digit)
+SEQUENCES = {
+    'booking_reference': ('BK', 7),
+    'ticket_number': ('TK', 9),
+}
+
+# Values reserved per write
+BLOCK_SIZE = 100
+
+CREATE_TABLE = """
+    CREATE TABLE IF NOT EXISTS id_sequences (
+        name TEXT PRIMARY KEY,
+        next_value INTEGER NOT NULL
+    ) WITHOUT ROWID
+"""
+
+# Migration steps. The prefixes are new, so numbering starts at 1 without
+# meeting references written before the allocator (BRN..., TKT..., GBR..., GTK...)
+ID_SEQUENCES = [CREATE_TABLE] + [
+    f"INSERT OR IGNORE INTO id_sequences (name, next_value) VALUES ('{name}', 1)"
+    for name in SEQUENCES
+]
+
+
+def check_digit(digits):
+    """Luhn check digit for a string of digits: catches any mistyped digit
+    and most swapped neighbours."""
+    total = 0
+    for position, digit in enumerate(reversed(digits)):
+        value = int(digit)
+        if position % 2 == 0:
+            value *= 2
+            if value > 9:
+                value -= 9
+        total += value
+    return str(-total % 10)
+
+
+def format_reference(name, value):
+    """'ticket_number', 42 -> 'TK0000000426'"""
+    prefix, width = SEQUENCES[name]
+    digits = f"{value:0{width}d}"
+    return f"{prefix}{digits}{check_digit(digits)}"
+
+
+def is_valid_reference(text, name=None):
+    """Whether text is a reference the allocator could have made (of sequence name, if given)."""
+    text = (text or '').strip().upper()
+    for sequence, (prefix, width) in SEQUENCES.items():
+        if name not in (None, sequence) or not text.startswith(prefix):
+            continue
+        digits = text[len(prefix):]
+        if len(digits) > width and digits.isdigit() and check_digit(digits[:-1]) == digits[-1]:
+            return True
+    return False
+
+
+class IdAllocator:
+    """Hands out booking references and ticket numbers from reserved blocks.
+
+    Thread-safe. Use the shared instance from get_allocator() so the whole
+    application serves one block per sequence.
+    """
+
+    def __init__(self, database=None, profile=None, block_size=BLOCK_SIZE):
+        self.database = database
+        self.profile = profile
+        self.block_size = block_size
+        self._lock = threading.Lock()
+        self._blocks = {}  # sequence -> [next value, end of block (exclusive)]
+        self._pid = os.getpid()
+
+    def allocate(self, **counts):
+        """{sequence: [values]} for the given number of values per sequence.
+
+        Sequences whose block runs out are topped up together, in a single
+        write.
+        """
+        with self._lock:
+            if self._pid != os.getpid():
+                # A forked child must not serve the blocks its parent is serving
+                self._blocks.clear()
+                self._pid = os.getpid()
+            short = {}
+            for name, count in counts.items():
+                next_value, end = self._blocks.get(name, (0, 0))
+                if end - next_value < count:
+                    short[name] = max(self.block_size, count)
+            if short:
+                for name, block in self._reserve(short).items():
+                    # What was left of the old block is dropped with it
+                    self._blocks[name] = list(block)
+
+            values = {}
+            for name, count in counts.items():
+                block = self._blocks[name]
+                values[name] = list(range(block[0], block[0] + count))
+                block[0] += count
+        return values
+
+    def references(self, tickets):
+        """(booking reference, [ticket numbers]) for a booking of that many tickets."""
+        values = self.allocate(booking_reference=1, ticket_number=tickets)
+        return (format_reference('booking_reference', values['booking_reference'][0]),
+                [format_reference('ticket_number', value) for value in values['ticket_number']])
+
+    def _reserve(self, sizes):
+        """Claim the next sizes[name] values of each sequence: {name: (start, end)}."""
+        with get_connection(self.profile, self.database) as conn:
+            if conn.in_transaction:
+                # Rolling that transaction back would hand the block out twice
+                raise RuntimeError("Blocks must be reserved outside any other transaction")
+            conn.execute("BEGIN IMMEDIATE")
+            try:
+                blocks = {}
+                for name, size in sizes.items():
+                    cursor = conn.execute(
+                        "UPDATE id_sequences SET next_value = next_value + ? WHERE name = ?",
+                        (size, name)
+                    )
+                    if cursor.rowcount != 1:
+                        raise KeyError(f"Unknown id sequence: {name}")
+                    end = conn.execute("SELECT next_value FROM id_sequences WHERE name = ?",
+                                       (name,)).fetchone()[0]
+                    blocks[name] = (end - size, end)
+                conn.commit()
+            except BaseException:
+                conn.rollback()
+                raise
+        return blocks
+
+
+_allocators = {}
+_allocators_lock = threading.Lock()
+
+
+def get_allocator(database=None, profile=None):
+    """Return the shared allocator for a database file, creating it on first use."""
+    with _allocators_lock:
+        allocator = _allocators.get((database, profile))
+        if allocator is None:
+            allocator = IdAllocator(database, profile)
+            _allocators[(database, profile)] = allocator
+        return allocator
@@ -0,0 +1,437 @@
+# -*- coding: utf-8 -*-
+# backend/migrations.py
+import sqlite3
+import sys
+
+from backend.change_log import CHANGE_LOG
+from backend.daily_stats import DAILY_STATS
+from backend.database import get_connection
+from backend.id_allocator import ID_SEQUENCES
+from backend.search_index import SEARCH_INDEX
+
+# Schema version 1: the original tables. IF NOT EXISTS keeps it safe to apply
+# to databases created before migrations existed (user_version 0).
+SCHEMA_TABLES = [
+    # Countries table
+    """
+    CREATE TABLE IF NOT EXISTS countries (
+        id INTEGER PRIMARY KEY AUTOINCREMENT,
+        code TEXT UNIQUE NOT NULL,
+        name TEXT NOT NULL
+    )
+    """,
+    # Genders table
+    """
+    CREATE TABLE IF NOT EXISTS genders (
+        id INTEGER PRIMARY KEY AUTOINCREMENT,
+        name TEXT UNIQUE NOT NULL
+    )
+    """,
+    # Classes table
+    """
+    CREATE TABLE IF NOT EXISTS classes (
+        id INTEGER PRIMARY KEY AUTOINCREMENT,
+        name TEXT UNIQUE NOT NULL,
+        description TEXT
+    )
+    """,
+    # Plane types table
+    """
+    CREATE TABLE IF NOT EXISTS plane_types (
+        id INTEGER PRIMARY KEY AUTOINCREMENT,
+        name TEXT UNIQUE NOT NULL,
+        manufacturer TEXT NOT NULL,
+        model TEXT NOT NULL
+    )
+    """,
+    # Branches table
+    """
+    CREATE TABLE IF NOT EXISTS branches (
+        id INTEGER PRIMARY KEY AUTOINCREMENT,
+        code TEXT UNIQUE NOT NULL,
+        name TEXT NOT NULL,
+        address TEXT NOT NULL,
+        phone_number TEXT NOT NULL
+    )
+    """,
+    # Terminals table
+    """
+    CREATE TABLE IF NOT EXISTS terminals (
+        id INTEGER PRIMARY KEY AUTOINCREMENT,
+        number TEXT NOT NULL,
+        name TEXT
+    )
+    """,
+    # Airports table
+    """
+    CREATE TABLE IF NOT EXISTS airports (
+        id INTEGER PRIMARY KEY AUTOINCREMENT,
+        airport_code TEXT UNIQUE NOT NULL,
+        name TEXT NOT NULL,
+        country_id INTEGER NOT NULL,
+        FOREIGN KEY (country_id) REFERENCES countries(id)
+    )
+    """,
+    # Planes table
+    """
+    CREATE TABLE IF NOT EXISTS planes (
+        id INTEGER PRIMARY KEY AUTOINCREMENT,
+        tail_number TEXT UNIQUE NOT NULL,
+        plane_type_id INTEGER NOT NULL,
+        FOREIGN KEY (plane_type_id) REFERENCES plane_types(id)
+    )
+    """,
+    # Users table - MOVED BEFORE BOOKINGS
+    """
+    CREATE TABLE IF NOT EXISTS users (
+        user_id INTEGER PRIMARY KEY AUTOINCREMENT,
+        username TEXT UNIQUE NOT NULL,
+        password TEXT NOT NULL,
+        email TEXT,
+        is_admin INTEGER DEFAULT 0
+    )
+    """,
+    # Employees table
+    """
+    CREATE TABLE IF NOT EXISTS employees (
+        id INTEGER PRIMARY KEY AUTOINCREMENT,
+        employee_number TEXT UNIQUE NOT NULL,
+        name TEXT NOT NULL,
+        address TEXT NOT NULL,
+        phone_number TEXT NOT NULL,
+        job TEXT NOT NULL,
+        branch_id INTEGER NOT NULL,
+        FOREIGN KEY (branch_id) REFERENCES branches(id)
+    )
+    """,
+    # Passengers table
+    """
+    CREATE TABLE IF NOT EXISTS passengers (
+        id INTEGER PRIMARY KEY AUTOINCREMENT,
+        passport_number TEXT UNIQUE NOT NULL,
+        name TEXT NOT NULL,
+        gender_id INTEGER NOT NULL,
+        nationality_country_id INTEGER NOT NULL,
+        FOREIGN KEY (gender_id) REFERENCES genders(id),
+        FOREIGN KEY (nationality_country_id) REFERENCES countries(id)
+    )
+    """,
+    # Junction table: Plane available classes
+    """
+    CREATE TABLE IF NOT EXISTS plane_available_classes (
+        plane_type_id INTEGER NOT NULL,
+        class_id INTEGER NOT NULL,
+        PRIMARY KEY (plane_type_id, class_id),
+        FOREIGN KEY (plane_type_id) REFERENCES plane_types(id),
+        FOREIGN KEY (class_id) REFERENCES classes(id)
+    )
+    """,
+    # Junction table: Airport terminals
+    """
+    CREATE TABLE IF NOT EXISTS airport_terminals (
+        airport_id INTEGER NOT NULL,
+        terminal_id INTEGER NOT NULL,
+        PRIMARY KEY (airport_id, terminal_id),
+        FOREIGN KEY (airport_id) REFERENCES airports(id),
+        FOREIGN KEY (terminal_id) REFERENCES terminals(id)
+    )
+    """,
+    # Flights table
+    """
+    CREATE TABLE IF NOT EXISTS flights (
+        id INTEGER PRIMARY KEY AUTOINCREMENT,
+        flight_number TEXT NOT NULL,
+        plane_id INTEGER NOT NULL,
+        branch_id INTEGER NOT NULL,
+        origin_airport_id INTEGER NOT NULL,
+        destination_airport_id INTEGER NOT NULL,
+        departure_date TEXT NOT NULL,
+        departure_time TEXT NOT NULL,
+        arrival_date TEXT NOT NULL,
+        arrival_time TEXT NOT NULL,
+        status TEXT DEFAULT 'scheduled',
+        FOREIGN KEY (plane_id) REFERENCES planes(id),
+        FOREIGN KEY (branch_id) REFERENCES branches(id),
+        FOREIGN KEY (origin_airport_id) REFERENCES airports(id),
+        FOREIGN KEY (destination_airport_id) REFERENCES airports(id)
+    )
+    """,
+    # Create bookings table - NOW AFTER USERS TABLE
+    """
+    CREATE TABLE IF NOT EXISTS bookings (
+        id INTEGER PRIMARY KEY AUTOINCREMENT,
+        user_id INTEGER NOT NULL,
+        flight_id INTEGER NOT NULL,
+        seat_count INTEGER NOT NULL,
+        booking_date TEXT NOT NULL,
+        total_price REAL NOT NULL,
+        booking_reference TEXT UNIQUE NOT NULL,
+        FOREIGN KEY(user_id) REFERENCES users(id),
+        FOREIGN KEY(flight_id) REFERENCES flights(id)
+    )
+    """,
+    # Create tickets table
+    """
+    CREATE TABLE IF NOT EXISTS tickets (
+        id INTEGER PRIMARY KEY AUTOINCREMENT,
+        ticket_number TEXT UNIQUE NOT NULL,
+        passenger_id INTEGER NOT NULL,
+        flight_id INTEGER NOT NULL,
+        booking_id INTEGER NOT NULL,
+        class_id INTEGER NOT NULL,
+        terminal_id INTEGER NOT NULL,
+        seat_number TEXT NOT NULL,
+        price REAL NOT NULL,
+        status TEXT DEFAULT 'confirmed',
+        FOREIGN KEY(passenger_id) REFERENCES passengers(id),
+        FOREIGN KEY(flight_id) REFERENCES flights(id),
+        FOREIGN KEY(booking_id) REFERENCES bookings(id),
+        FOREIGN KEY(class_id) REFERENCES classes(id),
+        FOREIGN KEY(terminal_id) REFERENCES terminals(id)
+    )
+    """,
+    # Crew assignments table (bonus - many-to-many between employees and flights)
+    """
+    CREATE TABLE IF NOT EXISTS crew_assignments (
+        id INTEGER PRIMARY KEY AUTOINCREMENT,
+        employee_id INTEGER NOT NULL,
+        flight_id INTEGER NOT NULL,
+        role TEXT NOT NULL,
+        FOREIGN KEY (employee_id) REFERENCES employees(id),
+        FOREIGN KEY (flight_id) REFERENCES flights(id),
+        UNIQUE(employee_id, flight_id)
+    )
+    """,
+]
+
+# Secondary indexes for every join, search and sort column used by the frames
+SECONDARY_INDEXES = [
+    # Ticket joins (load_bookings, load_passenger_bookings_tab); the booking
+    # index also covers every ticket column the bookings list reads
+    "CREATE INDEX IF NOT EXISTS idx_tickets_booking_list ON tickets(booking_id, passenger_id, flight_id, status)",
+    "CREATE INDEX IF NOT EXISTS idx_tickets_passenger_id ON tickets(passenger_id)",
+    "CREATE INDEX IF NOT EXISTS idx_tickets_flight_id ON tickets(flight_id)",
+    # Flight lookups: flight_number_exists, schedule ordering, scheduled-only lists
+    "CREATE INDEX IF NOT EXISTS idx_flights_number_date ON flights(flight_number, departure_date)",
+    "CREATE INDEX IF NOT EXISTS idx_flights_departure ON flights(departure_date, departure_time)",
+    "CREATE INDEX IF NOT EXISTS idx_flights_status_departure ON flights(status, departure_date, departure_time)",
+    "CREATE INDEX IF NOT EXISTS idx_flights_origin ON flights(origin_airport_id)",
+    "CREATE INDEX IF NOT EXISTS idx_flights_destination ON flights(destination_airport_id)",
+    # Bookings list is ordered by date
+    "CREATE INDEX IF NOT EXISTS idx_bookings_booking_date ON bookings(booking_date)",
+    "CREATE INDEX IF NOT EXISTS idx_bookings_flight_id ON bookings(flight_id)",
+    # Crew per flight
+    "CREATE INDEX IF NOT EXISTS idx_crew_assignments_flight_id ON crew_assignments(flight_id)",
+    # Covering index for the passengers list (ORDER BY name, no table lookups)
+    "CREATE INDEX IF NOT EXISTS idx_passengers_list ON passengers(name, passport_number, gender_id, nationality_country_id)",
+    # Dialog lookups
+    "CREATE INDEX IF NOT EXISTS idx_terminals_number ON terminals(number)",
+]
+
+# bookings.user_id pointed at users(id), but the users key is user_id, which made
+# every booking insert fail once foreign keys were enforced. SQLite cannot alter a
+# constraint, so the table is rebuilt (create, copy, drop, rename).
+FIX_BOOKINGS_USER_FOREIGN_KEY = [
+    """
+    CREATE TABLE bookings_rebuild (
+        id INTEGER PRIMARY KEY AUTOINCREMENT,
+        user_id INTEGER NOT NULL,
+        flight_id INTEGER NOT NULL,
+        seat_count INTEGER NOT NULL,
+        booking_date TEXT NOT NULL,
+        total_price REAL NOT NULL,
+        booking_reference TEXT UNIQUE NOT NULL,
+        FOREIGN KEY(user_id) REFERENCES users(user_id),
+        FOREIGN KEY(flight_id) REFERENCES flights(id)
+    )
+    """,
+    """
+    INSERT INTO bookings_rebuild
+    (id, user_id, flight_id, seat_count, booking_date, total_price, booking_reference)
+    SELECT id, user_id, flight_id, seat_count, booking_date, total_price, booking_reference
+    FROM bookings
+    """,
+    "DROP TABLE bookings",
+    "ALTER TABLE bookings_rebuild RENAME TO bookings",
+    "CREATE INDEX IF NOT EXISTS idx_bookings_booking_date ON bookings(booking_date)",
+    "CREATE INDEX IF NOT EXISTS idx_bookings_flight_id ON bookings(flight_id)",
+]
+
+# Every FlightsFrame header sorts through an index: the flight id tiebreak is
+# the rowid each index already ends with, and airport names drive the join
+FLIGHT_SORT_INDEXES = [
+    "CREATE INDEX IF NOT EXISTS idx_flights_flight_number ON flights(flight_number)",
+    "CREATE INDEX IF NOT EXISTS idx_flights_arrival ON flights(arrival_date, arrival_time)",
+    "CREATE INDEX IF NOT EXISTS idx_flights_status_sort ON flights(IFNULL(status, ''))",
+    "CREATE INDEX IF NOT EXISTS idx_airports_name ON airports(name)",
+]
+
+
+def analyze_if_analyzed(*indexes):
+    """Migration step: gather planner statistics for new indexes if the database has any.
+
+    On an analyzed database (e.g. one from backend/data_generator.py) an index
+    missing from sqlite_stat1 skews the estimates for its whole table and can
+    push unrelated queries off their index. Without statistics nothing is done.
+    """
+    def step(conn):
+        if conn.execute("SELECT 1 FROM sqlite_master WHERE name = 'sqlite_stat1'").fetchone():
+            for index in indexes:
+                conn.execute(f"ANALYZE {index}")
+    return step
+
+
+# Type-ahead pickers match what was typed against the start of a name, passport
+# or flight number, case-insensitively: a NOCASE range read on these indexes
+# returns the first candidates in order without touching the rest
+PICKER_INDEXES = [
+    "CREATE INDEX IF NOT EXISTS idx_passengers_name_prefix ON passengers(name COLLATE NOCASE, passport_number)",
+    "CREATE INDEX IF NOT EXISTS idx_passengers_passport_prefix ON passengers(passport_number COLLATE NOCASE, name)",
+    "CREATE INDEX IF NOT EXISTS idx_flights_scheduled_number ON flights(status, flight_number COLLATE NOCASE, departure_date, departure_time)",
+    # Also covers the flight sort indexes, which migration 5 added without statistics
+    analyze_if_analyzed('idx_passengers_name_prefix', 'idx_passengers_passport_prefix',
+                        'idx_flights_scheduled_number', 'idx_flights_flight_number',
+                        'idx_flights_arrival', 'idx_flights_status_sort', 'idx_airports_name'),
+]
+
+def reseat_duplicate_tickets(conn):
+    """Migration step: move every active ticket but the first off a seat sold twice.
+
+    Before the booking engine nothing stopped two tickets from holding one
+    seat. The later ones get "<seat> (duplicate <ticket id>)" so the unique
+    seat index can be built and an agent can find and reseat them.
+    """
+    duplicates = conn.execute("""
+        SELECT id FROM (
+            SELECT id, ROW_NUMBER() OVER (PARTITION BY flight_id, seat_number ORDER BY id) AS n
+            FROM tickets
+            WHERE status <> 'cancelled'
+        )
+        WHERE n > 1
+    """).fetchall()
+    conn.executemany(
+        "UPDATE tickets SET seat_number = seat_number || ' (duplicate ' || id || ')' WHERE id = ?",
+        duplicates
+    )
+    if duplicates:
+        print(f"⚠️ {len(duplicates)} tickets shared a seat and were marked for reseating")
+
+
+# Seat inventory for the booking engine (backend/booking_engine.py): a seat
+# capacity per plane type, and at most one active ticket per seat of a flight
+DEFAULT_SEAT_CAPACITY = 180
+
+SEAT_INVENTORY = [
+    f"ALTER TABLE plane_types ADD COLUMN seat_capacity INTEGER NOT NULL DEFAULT {DEFAULT_SEAT_CAPACITY}",
+    "UPDATE plane_types SET seat_capacity = 189 WHERE name = 'Boeing 737'",
+    "UPDATE plane_types SET seat_capacity = 180 WHERE name = 'Airbus A320'",
+    "UPDATE plane_types SET seat_capacity = 396 WHERE name = 'Boeing 777'",
+    "UPDATE plane_types SET seat_capacity = 555 WHERE name = 'Airbus A380'",
+    reseat_duplicate_tickets,
+    "CREATE UNIQUE INDEX IF NOT EXISTS idx_tickets_flight_seat ON tickets(flight_id, seat_number) "
+    "WHERE status <> 'cancelled'",
+    analyze_if_analyzed('idx_tickets_flight_seat'),
+]
+
+# Numbered migrations: (version, description, steps). A step is either an SQL
+# statement or a callable taking the connection. Never edit a released migration;
+# append a new one instead.
+MIGRATIONS = [
+    (1, "base schema", SCHEMA_TABLES),
+    (2, "secondary indexes", SECONDARY_INDEXES),
+    (3, "fix bookings.user_id foreign key", FIX_BOOKINGS_USER_FOREIGN_KEY),
+    (4, "full-text search index", SEARCH_INDEX),
+    (5, "flight sort indexes", FLIGHT_SORT_INDEXES),
+    (6, "change log for other workstations", CHANGE_LOG),
+    (7, "type-ahead picker indexes", PICKER_INDEXES),
+    (8, "seat inventory", SEAT_INVENTORY),
+    (9, "booking reference sequences", ID_SEQUENCES),
+    (10, "dashboard counters", DAILY_STATS),
+]
+
+LATEST_VERSION = MIGRATIONS[-1][0]
+
+
+class MigrationError(Exception):
+    """Raised when the schema cannot be brought up to date."""
+
+
+def get_schema_version(conn):
+    """Return the schema version stored in PRAGMA user_version."""
+    return conn.execute("PRAGMA user_version").fetchone()[0]
+
+
+def pending_migrations(version, target=LATEST_VERSION):
+    """Return the migrations still to apply to a database at the given version."""
+    return [m for m in MIGRATIONS if version < m[0] <= target]
+
+
+def _newer_schema(version, target):
+    return MigrationError(
+        f"Database schema version {version} is newer than this application ({target})"
+    )
+
+
+def migrate(conn=None, target=LATEST_VERSION):
+    """Apply pending migrations in one transaction and return the resulting version.
+
+    A database that is already current costs a single PRAGMA read.
+    """
+    own_conn = conn is None
+    if own_conn:
+        conn = get_connection()
+
+    try:
+        version = get_schema_version(conn)
+        if version == target:
+            return version
+        if version > target:
+            raise _newer_schema(version, target)
+
+        # Constraints cannot be toggled inside a transaction, and table rebuilds
+        # would trip them half way through
+        foreign_keys = conn.execute("PRAGMA foreign_keys").fetchone()[0]
+        conn.execute("PRAGMA foreign_keys = OFF")
+        try:
+            conn.execute("BEGIN IMMEDIATE")
+            try:
+                # Another workstation may have migrated while we waited for the lock
+                version = get_schema_version(conn)
+                if version >= target:
+                    # Leave its version alone, whichever release wrote it
+                    conn.rollback()
+                    if version > target:
+                        raise _newer_schema(version, target)
+                    return version
+                applied = []
+                for number, description, steps in pending_migrations(version, target):
+                    for step in steps:
+                        if callable(step):
+                            step(conn)
+                        else:
+                            conn.execute(step)
+                    applied.append(f"{number} ({description})")
+                if applied:
+                    conn.execute(f"PRAGMA user_version = {int(target)}")
+                conn.commit()
+            except sqlite3.Error as e:
+                conn.rollback()
+                raise MigrationError(f"Migration failed, schema left at version {version}: {e}") from e
+        finally:
+            conn.execute(f"PRAGMA foreign_keys = {foreign_keys}")
+
+        for migration in applied:
+            print(f"✅ Applied migration {migration}")
+        return target if applied else version
+    finally:
+        if own_conn:
+            conn.close()
+
+
+if __name__ == "__main__":
+    try:
+        version = migrate()
+    except MigrationError as e:
+        print(f"❌ {e}")
+        sys.exit(1)
+    print(f"✅ Database schema is at version {version}")
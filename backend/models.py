@@ -1,4 +1,6 @@
 # -*- coding: utf-8 -*-
+from collections import namedtuple
+
 class Flight:
     def __init__(self, flight_id, flight_number, origin, destination, 
                  departure_date, departure_time, arrival_date, arrival_time, status):
@@ -29,4 +31,33 @@ class Ticket:
         self.flight_number = flight_number
         self.seat_number = seat_number
         self.price = price
-        self.status = status
\ No newline at end of file
+        self.status = status
+
+# Compact rows returned by the repositories (backend/repositories.py).
+# They are plain tuples, so they can be handed straight to a Treeview.
+FlightRow = namedtuple('FlightRow', 'id flight_number origin destination departure arrival status')
+
+BookingRow = namedtuple(
+    'BookingRow',
+    'booking_reference passenger_name flight_number route booking_date seat_count total_price status'
+)
+
+PassengerRow = namedtuple('PassengerRow', 'id passport_number name gender nationality')
+
+PassengerDetail = namedtuple('PassengerDetail', 'passport_number name gender nationality country_code')
+
+PassengerBookingRow = namedtuple(
+    'PassengerBookingRow',
+    'booking_reference flight_number route booking_date ticket_number class_name seat_number price status'
+)
+
+RecentBookingRow = namedtuple(
+    'RecentBookingRow',
+    'booking_reference flight_number route booking_date seat_count total_price'
+)
+
+# What the booking engine (backend/booking_engine.py) returns for a sale
+BookingResult = namedtuple(
+    'BookingResult',
+    'booking_id booking_reference ticket_ids ticket_numbers seat_numbers total_price'
+)
@@ -0,0 +1,219 @@
+# -*- coding: utf-8 -*-
+# backend/query_plans.py
+import re
+import sys
+
+from backend.booking_engine import BookingEngine
+from backend.booking_import import BookingImporter
+from backend.database import get_connection
+from backend.report_engine import ReportEngine
+from backend.repositories import (BookingRepository, DashboardRepository, FlightRepository,
+                                  PassengerRepository, PICKER_LIMIT, PREFIX_END)
+
+# Hot queries behind the list, search and lookup screens, built by the same
+# repository code the frames call.
+# allowed_scans lists aliases that may be read in full: the driving table of an
+# unfiltered list view. Any other bare "SCAN <alias>" is a regression.
+_flights_list_sql, _flights_list_params = FlightRepository().build_list_query()
+_bookings_list_sql, _bookings_list_params = BookingRepository().build_list_query()
+_passengers_list_sql, _passengers_list_params = PassengerRepository().build_list_query()
+# Searches go through the full-text index (backend/search_index.py)
+_flights_search_sql, _flights_search_params = FlightRepository().build_list_query('dubai')
+_bookings_search_sql, _bookings_search_params = BookingRepository().build_list_query('ali')
+_passengers_search_sql, _passengers_search_params = PassengerRepository().build_list_query('ali')
+
+HOT_QUERIES = {
+    'FlightsFrame.load_flights': {
+        'sql': _flights_list_sql,
+        'params': _flights_list_params,
+        'allowed_scans': {'f'},
+    },
+    'FlightsFrame.on_search': {
+        'sql': _flights_search_sql,
+        'params': _flights_search_params,
+        'allowed_scans': {'f'},
+    },
+    'FlightsFrame.flight_number_exists': {
+        'sql': "SELECT COUNT(*) FROM flights WHERE flight_number = ? AND departure_date = ?",
+        'params': ('AK101', '2024-02-01'),
+        'allowed_scans': set(),
+    },
+    'BookingsFrame.load_bookings': {
+        'sql': _bookings_list_sql,
+        'params': _bookings_list_params,
+        'allowed_scans': {'b'},
+    },
+    'BookingsFrame.on_search': {
+        'sql': _bookings_search_sql,
+        'params': _bookings_search_params,
+        'allowed_scans': {'b'},
+    },
+    # Type-ahead pickers read a prefix range (frontend/autocomplete.py)
+    'BookingsFrame.flight_picker': {
+        'sql': FlightRepository.CANDIDATES_SQL,
+        'params': ('ak1', 'ak1' + PREFIX_END, PICKER_LIMIT),
+        'allowed_scans': set(),
+    },
+    'BookingsFrame.passenger_picker': {
+        'sql': PassengerRepository.CANDIDATES_SQL,
+        'params': ('ali', 'ali' + PREFIX_END, PICKER_LIMIT) * 2 + (PICKER_LIMIT,),
+        'allowed_scans': set(),
+    },
+    # Checked inside the booking engine's write lock: keep them index lookups
+    'BookingEngine.seats_sold': {
+        'sql': BookingEngine.SEATS_SOLD_SQL,
+        'params': (1,),
+        'allowed_scans': set(),
+    },
+    'BookingEngine.seat_taken': {
+        'sql': BookingEngine.SEAT_TAKEN_SQL,
+        'params': (1, '15A'),
+        'allowed_scans': set(),
+    },
+    'BookingEngine.taken_seats': {
+        'sql': BookingEngine.TAKEN_SEATS_SQL,
+        'params': (1,),
+        'allowed_scans': set(),
+    },
+    'BookingEngine.flight': {
+        'sql': BookingEngine.FLIGHT_SQL,
+        'params': (1,),
+        'allowed_scans': set(),
+    },
+    # Resolved per chunk inside the importer's write lock
+    'BookingImporter.passengers': {
+        'sql': BookingImporter.PASSENGERS_SQL.format(marks='?, ?'),
+        'params': ('P12345678', 'P87654321'),
+        'allowed_scans': set(),
+    },
+    'BookingImporter.flight': {
+        'sql': BookingImporter.FLIGHT_SQL,
+        'params': ('AK101', '2024-02-01'),
+        'allowed_scans': set(),
+    },
+    'BookingImporter.taken_seats': {
+        'sql': BookingImporter.TAKEN_SEATS_SQL.format(marks='?, ?'),
+        'params': (1, 2),
+        'allowed_scans': set(),
+    },
+    # Polled by the dashboard: primary key reads only
+    'DashboardFrame.day_stats': {
+        'sql': DashboardRepository.STATS_SQL,
+        'params': ('2024-02-01',),
+        'allowed_scans': set(),
+    },
+    'DashboardFrame.recent_bookings': {
+        'sql': DashboardRepository.RECENT_BOOKINGS_SQL,
+        'params': (5,),
+        'allowed_scans': {'b'},
+        'ordered': True,
+    },
+    # A period's flights through the departure index, their tickets by flight
+    'ReportsFrame.flights': {
+        'sql': ReportEngine.FLIGHTS_SQL,
+        'params': ('2024-01-01', '2024-12-31'),
+        'allowed_scans': {'p', 'pt'},
+    },
+    'ReportsFrame.tickets': {
+        'sql': ReportEngine.TICKETS_SQL,
+        'params': ('2024-01-01', '2024-12-31'),
+        'allowed_scans': set(),
+    },
+    'PassengersFrame.load_passengers': {
+        'sql': _passengers_list_sql,
+        'params': _passengers_list_params,
+        'allowed_scans': {'p'},
+    },
+    'PassengersFrame.on_search': {
+        'sql': _passengers_search_sql,
+        'params': _passengers_search_params,
+        'allowed_scans': {'p'},
+    },
+    'PassengersFrame.load_passenger_bookings_tab': {
+        'sql': PassengerRepository.BOOKINGS_SQL,
+        'params': (1,),
+        'allowed_scans': set(),
+    },
+}
+
+# Every FlightsFrame header sort, first page and keyset continuation, must read
+# its order straight from an index: ordered=True also rejects a temp B-tree sort
+_flight_sort_scans = {'flight_id': {'f'}, 'origin': {'o_airport'}, 'destination': {'d_airport'}}
+for _column, _expressions in FlightRepository.SORT_COLUMNS.items():
+    _after = ('',) * len(_expressions) + (() if 'f.id' in _expressions else (0,))
+    for _direction in ('ASC', 'DESC'):
+        for _suffix, _key in (('', None), (':next', _after)):
+            _sql, _params = FlightRepository().build_list_query(
+                sort=_column, direction=_direction, limit=100, after=_key, with_keys=True)
+            HOT_QUERIES[f'FlightsFrame.sort_treeview[{_column} {_direction}{_suffix}]'] = {
+                'sql': _sql,
+                'params': _params,
+                # A keyset page seeks instead of scanning
+                'allowed_scans': set() if _key else _flight_sort_scans.get(_column, {'f'}),
+                'ordered': True,
+            }
+
+# "SCAN t" or "SCAN tickets AS t" with no index - "SCAN t USING INDEX ..." is fine
+_BARE_SCAN = re.compile(r'^SCAN (\w+)(?: AS (\w+))?$')
+
+
+class QueryPlanRegression(Exception):
+    """Raised when a hot query falls back to a full table scan or sort."""
+
+
+def explain(conn, sql, params=()):
+    """Return the EXPLAIN QUERY PLAN detail lines for a query."""
+    rows = conn.execute("EXPLAIN QUERY PLAN " + sql, params).fetchall()
+    return [row[3] for row in rows]
+
+
+def find_table_scans(plan, allowed_scans=()):
+    """Return plan lines that read a whole table without an index."""
+    scans = []
+    for detail in plan:
+        match = _BARE_SCAN.match(detail.strip())
+        if not match:
+            continue
+        alias = match.group(2) or match.group(1)
+        if alias not in allowed_scans:
+            scans.append(detail.strip())
+    return scans
+
+
+def find_sorts(plan):
+    """Return plan lines that sort rows in a temporary B-tree."""
+    return [detail.strip() for detail in plan if 'USE TEMP B-TREE' in detail]
+
+
+def check_query_plans(conn=None, queries=None):
+    """Raise QueryPlanRegression if any hot query plans a table scan, or an ordered one a sort."""
+    queries = queries or HOT_QUERIES
+    own_conn = conn is None
+    if own_conn:
+        conn = get_connection()
+
+    try:
+        failures = {}
+        for name, query in queries.items():
+            plan = explain(conn, query['sql'], query['params'])
+            scans = find_table_scans(plan, query['allowed_scans'])
+            if query.get('ordered'):
+                scans += find_sorts(plan)
+            if scans:
+                failures[name] = scans
+    finally:
+        if own_conn:
+            conn.close()
+
+    if failures:
+        lines = [f"{name}: {', '.join(scans)}" for name, scans in failures.items()]
+        raise QueryPlanRegression("Hot queries regressed to table scans or sorts:\n" + "\n".join(lines))
+
+
+if __name__ == "__main__":
+    try:
+        check_query_plans()
+    except QueryPlanRegression as e:
+        print(f"❌ {e}")
+        sys.exit(1)
+    print("✅ All hot queries use indexes")
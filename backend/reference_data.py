@@ -0,0 +1,116 @@
+# -*- coding: utf-8 -*-
+# backend/reference_data.py
+import threading
+
+from backend.change_bus import change_bus
+from backend.repositories import LookupRepository
+
+# Cached list -> entities whose changes make it stale
+DEPENDENCIES = {
+    'airports': ('airports',),
+    'countries': ('countries',),
+    'genders': ('genders',),
+    'classes': ('classes',),
+    'terminals': ('terminals',),
+}
+
+
+class ReferenceData:
+    """In-memory copies of the lists behind the dialog dropdowns.
+
+    Each list is read once and kept until a change bus event for one of its
+    DEPENDENCIES (a local write, or another workstation's through the change
+    feed) drops it; the next request reads it again. index() gives dict
+    access by any field, e.g. index('genders', 'name')[name]['id'].
+
+    The returned lists and dicts are shared: callers must not modify them.
+    """
+
+    def __init__(self, database=None, profile=None, bus=change_bus):
+        lookups = LookupRepository(database, profile)
+        self._loaders = {
+            'airports': lookups.airports,
+            'countries': lookups.countries,
+            'genders': lookups.genders,
+            'classes': lookups.classes,
+            'terminals': lookups.terminals,
+        }
+        self._lock = threading.Lock()
+        self._lists = {}  # name -> rows
+        self._indexes = {}  # (name, field) -> {value: row}
+        self._generations = dict.fromkeys(self._loaders, 0)  # bumped on invalidation
+        entities = {entity for names in DEPENDENCIES.values() for entity in names}
+        self._token = bus.subscribe(self._on_change, entities)
+
+    def get(self, name):
+        """The cached list, read from the database on first use."""
+        with self._lock:
+            rows = self._lists.get(name)
+            generation = self._generations[name]
+        if rows is not None:
+            return rows
+        rows = self._loaders[name]()
+        with self._lock:
+            # Do not keep a read that an invalidation overtook
+            if self._generations[name] == generation:
+                self._lists[name] = rows
+        return rows
+
+    def cached(self, *names):
+        """The lists if all of them are already in memory, else None (never queries)."""
+        with self._lock:
+            lists = tuple(self._lists.get(name) for name in names)
+        return None if any(rows is None for rows in lists) else lists
+
+    def index(self, name, field):
+        """{row[field]: row} over a cached list."""
+        rows = self.get(name)
+        with self._lock:
+            index = self._indexes.get((name, field))
+            if index is None or index[0] is not rows:
+                index = (rows, {row[field]: row for row in rows})
+                self._indexes[(name, field)] = index
+        return index[1]
+
+    def by_id(self, name):
+        return self.index(name, 'id')
+
+    def id_for(self, name, value, field='name'):
+        """Id of the row whose field equals value, or None."""
+        row = self.index(name, field).get(value)
+        return row['id'] if row else None
+
+    def invalidate(self, *names):
+        """Forget the given lists (all when none are given)."""
+        with self._lock:
+            for name in names or tuple(self._loaders):
+                self._generations[name] += 1
+                self._lists.pop(name, None)
+            for key in [key for key in self._indexes if key[0] not in self._lists]:
+                del self._indexes[key]
+
+    def _on_change(self, event):
+        stale = [name for name, entities in DEPENDENCIES.items() if event.entity in entities]
+        if stale:
+            self.invalidate(*stale)
+
+    # The dialog lists
+
+    def airports(self):
+        return self.get('airports')
+
+    def countries(self):
+        return self.get('countries')
+
+    def genders(self):
+        return self.get('genders')
+
+    def classes(self):
+        return self.get('classes')
+
+    def terminals(self):
+        return self.get('terminals')
+
+
+# The cache shared by the whole application (default database)
+reference_data = ReferenceData()
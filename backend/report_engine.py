@@ -0,0 +1,310 @@
+# -*- coding: utf-8 -*-
+# backend/report_engine.py
+import argparse
+import time
+from collections import namedtuple
+from datetime import date
+
+import numpy as np
+
+from backend.repositories import Repository, record_query
+
+# Reports work on columns instead of rows: the flights of a period and their
+# active tickets are read once, a chunk at a time, into NumPy arrays
+# (ReportData), and every report is a few vectorized group-bys over them
+# (np.unique + np.bincount). Switching reports reuses the arrays; only a new
+# period reads the database again.
+
+# Ticket rows fetched and converted to arrays per chunk
+CHUNK_SIZE = 50_000
+
+# The booking curve shows each of the last CURVE_DAYS days before departure;
+# tickets sold earlier are pooled in one row
+CURVE_DAYS = 90
+
+# Julian day of 1970-01-01: julianday(d) - EPOCH_JULIAN_DAY is d as days since the epoch
+EPOCH_JULIAN_DAY = 2440587.5
+
+# A computed report: column keys with how to show them, and the rows.
+# kind is 'text', 'count', 'money' or 'percent'
+ReportTable = namedtuple('ReportTable', 'columns rows')
+
+# The reports, each a ReportData method of the same name
+REPORTS = ('revenue_by_branch', 'revenue_by_route', 'revenue_by_class', 'revenue_by_day',
+           'flight_load', 'booking_curve')
+
+# Columns shared by the reports grouping flights
+_FLIGHT_GROUP_COLUMNS = [('flights', 'count'), ('tickets', 'count'), ('revenue', 'money'),
+                         ('average_fare', 'money'), ('load_factor', 'percent')]
+
+
+def _day_text(days):
+    return np.datetime_as_string(np.asarray(days, dtype='datetime64[D]')).tolist()
+
+
+def _group(keys, *weights):
+    """Vectorized GROUP BY: (unique keys, rows per key, [per-key sum of each weight])."""
+    unique, inverse = np.unique(keys, return_inverse=True)
+    counts = np.bincount(inverse, minlength=len(unique))
+    sums = [np.bincount(inverse, weights=weight, minlength=len(unique)) for weight in weights]
+    return unique, counts, sums
+
+
+def _ratio(numerator, denominator):
+    """numerator / denominator, 0 where the denominator is 0."""
+    numerator = np.asarray(numerator, dtype=np.float64)
+    denominator = np.asarray(denominator, dtype=np.float64)
+    return np.divide(numerator, denominator, out=np.zeros_like(numerator), where=denominator != 0)
+
+
+class ReportData:
+    """The columns of one period, and the reports computed from them.
+
+    Flight columns are parallel arrays, one entry per flight departing in
+    the period (cancelled flights left out). Ticket columns hold the active
+    tickets on those flights, with flight as an index into the flight
+    arrays rather than the flight id. skipped_tickets counts tickets left
+    out because their flight was not among the flights read.
+    """
+
+    def __init__(self, start, end, flights, tickets, labels, read_seconds, skipped_tickets=0):
+        self.start = start
+        self.end = end
+        self.flight_numbers = flights['number']
+        self.branch = flights['branch']
+        self.origin = flights['origin']
+        self.destination = flights['destination']
+        self.departure = flights['departure']
+        self.capacity = flights['capacity']
+        self.ticket_flight = tickets['flight']
+        self.ticket_class = tickets['class']
+        self.price = tickets['price']
+        self.booked = tickets['booked']
+        self.labels = labels  # 'branches' / 'airports' / 'classes' -> {id: name}
+        self.read_seconds = read_seconds
+        self.skipped_tickets = skipped_tickets
+
+        # Per-flight totals, the base of every flight grouping
+        flights_count = len(self.departure)
+        self.sold = np.bincount(self.ticket_flight, minlength=flights_count)
+        self.revenue = np.bincount(self.ticket_flight, weights=self.price, minlength=flights_count)
+
+    @property
+    def flight_count(self):
+        return len(self.departure)
+
+    @property
+    def ticket_count(self):
+        return len(self.price)
+
+    def report(self, name):
+        """Compute a report of REPORTS; returns a ReportTable."""
+        if name not in REPORTS:
+            raise KeyError(f"Unknown report: {name}")
+        return getattr(self, name)()
+
+    # Reports
+
+    def revenue_by_branch(self):
+        branches = self.labels['branches']
+        return self._by_flights('branch', self.branch,
+                                lambda keys: [branches.get(key, str(key)) for key in keys.tolist()])
+
+    def revenue_by_route(self):
+        # One integer key per (origin, destination) pair
+        width = int(max(self.origin.max(initial=0), self.destination.max(initial=0))) + 1
+        airports = self.labels['airports']
+
+        def names(keys):
+            return [f"{airports.get(key // width, key // width)} → {airports.get(key % width, key % width)}"
+                    for key in keys.tolist()]
+
+        return self._by_flights('route', self.origin * width + self.destination, names)
+
+    def revenue_by_day(self):
+        return self._by_flights('departure_date', self.departure, _day_text, by_revenue=False)
+
+    def revenue_by_class(self):
+        classes = self.labels['classes']
+        keys, tickets, (revenue,) = _group(self.ticket_class, self.price)
+        order = np.argsort(-revenue, kind='stable')
+        keys, tickets, revenue = keys[order], tickets[order], revenue[order]
+        rows = zip([classes.get(key, str(key)) for key in keys.tolist()], tickets.tolist(),
+                   revenue.tolist(), _ratio(revenue, tickets).tolist(),
+                   _ratio(revenue, revenue.sum()).tolist())
+        return ReportTable([('seat_class', 'text'), ('tickets', 'count'), ('revenue', 'money'),
+                            ('average_fare', 'money'), ('revenue_share', 'percent')], list(rows))
+
+    def flight_load(self):
+        """Every flight of the period, by departure date."""
+        order = np.lexsort((self.flight_numbers, self.departure))
+        airports = self.labels['airports']
+        routes = [f"{airports.get(origin, origin)} → {airports.get(destination, destination)}"
+                  for origin, destination in zip(self.origin[order].tolist(),
+                                                  self.destination[order].tolist())]
+        rows = zip(self.flight_numbers[order].tolist(), _day_text(self.departure[order]), routes,
+                   self.capacity[order].tolist(), self.sold[order].tolist(),
+                   self.revenue[order].tolist(), _ratio(self.sold, self.capacity)[order].tolist())
+        return ReportTable([('flight_number', 'text'), ('departure_date', 'text'), ('route', 'text'),
+                            ('seats', 'count'), ('tickets', 'count'), ('revenue', 'money'),
+                            ('load_factor', 'percent')], list(rows))
+
+    def booking_curve(self):
+        """Tickets sold by days before departure, and how full the flights were by then.
+
+        Tickets booked on or after the departure day count as day 0.
+        """
+        known = ~np.isnan(self.booked)
+        lead = self.departure[self.ticket_flight[known]] - self.booked[known]
+        lead = np.clip(lead, 0, CURVE_DAYS).astype(np.int64)
+        # Index 0 is CURVE_DAYS+ days out, the last one the departure day
+        tickets = np.bincount(CURVE_DAYS - lead, minlength=CURVE_DAYS + 1)
+        sold = np.cumsum(tickets)
+        labels = [f"{CURVE_DAYS}+"] + [str(days) for days in range(CURVE_DAYS - 1, -1, -1)]
+        rows = zip(labels, tickets.tolist(), sold.tolist(), _ratio(sold, sold[-1]).tolist(),
+                   _ratio(sold, self.capacity.sum()).tolist())
+        return ReportTable([('days_before_departure', 'text'), ('tickets', 'count'),
+                            ('tickets_to_date', 'count'), ('share_of_bookings', 'percent'),
+                            ('load_factor', 'percent')], list(rows))
+
+    def _by_flights(self, label, keys, names, by_revenue=True):
+        """Group flights by keys (one per flight), largest revenue first or in key order."""
+        keys, flights, (sold, revenue, capacity) = _group(keys, self.sold, self.revenue, self.capacity)
+        if by_revenue:
+            order = np.argsort(-revenue, kind='stable')
+            keys, flights, sold, revenue, capacity = (keys[order], flights[order], sold[order],
+                                                      revenue[order], capacity[order])
+        rows = zip(names(keys), flights.tolist(), sold.astype(np.int64).tolist(), revenue.tolist(),
+                   _ratio(revenue, sold).tolist(), _ratio(sold, capacity).tolist())
+        return ReportTable([(label, 'text')] + _FLIGHT_GROUP_COLUMNS, list(rows))
+
+
+class ReportEngine(Repository):
+    """Reads the columns of a period into a ReportData.
+
+    Two statements: the flights departing in the period (through the
+    departure date index), then their active tickets joined to the booking
+    date, streamed with fetchmany and turned into arrays CHUNK_SIZE rows at
+    a time, so no per-row Python objects outlive a chunk. Both run in one
+    read transaction, so they see the same snapshot of the database.
+    """
+
+    FLIGHTS_SQL = f"""
+        SELECT f.id, f.branch_id, f.origin_airport_id, f.destination_airport_id,
+               julianday(f.departure_date) - {EPOCH_JULIAN_DAY}, pt.seat_capacity, f.flight_number
+        FROM flights f
+        JOIN planes p ON f.plane_id = p.id
+        JOIN plane_types pt ON p.plane_type_id = pt.id
+        WHERE f.departure_date BETWEEN ? AND ? AND IFNULL(f.status, '') <> 'cancelled'
+          AND julianday(f.departure_date) IS NOT NULL
+        ORDER BY f.id
+    """
+
+    TICKETS_SQL = f"""
+        SELECT t.flight_id, t.class_id, t.price, julianday(b.booking_date) - {EPOCH_JULIAN_DAY}
+        FROM flights f
+        JOIN tickets t ON t.flight_id = f.id
+        JOIN bookings b ON t.booking_id = b.id
+        WHERE f.departure_date BETWEEN ? AND ? AND IFNULL(f.status, '') <> 'cancelled'
+          AND julianday(f.departure_date) IS NOT NULL AND t.status <> 'cancelled'
+    """
+
+    LABELS_SQL = {
+        'branches': "SELECT id, name FROM branches",
+        'airports': "SELECT id, airport_code FROM airports",
+        'classes': "SELECT id, name FROM classes",
+    }
+
+    def __init__(self, database=None, profile=None, chunk_size=CHUNK_SIZE):
+        super().__init__(database, profile)
+        self.chunk_size = chunk_size
+
+    def load(self, start, end):
+        """The columns of the flights departing from start to end (dates, inclusive)."""
+        started = time.perf_counter()
+        start, end = date.fromisoformat(str(start)).isoformat(), date.fromisoformat(str(end)).isoformat()
+        with self._connect() as conn:
+            if conn.in_transaction:
+                raise RuntimeError("Report data must be read outside any other transaction")
+            conn.execute("BEGIN")
+            try:
+                labels = {name: dict(conn.execute(sql).fetchall())
+                          for name, sql in self.LABELS_SQL.items()}
+                flight_ids, flights = self._read_flights(conn, start, end)
+                columns = self._read_tickets(conn, start, end)
+            finally:
+                # Nothing was written; this only ends the snapshot
+                conn.rollback()
+
+        # flight_ids is sorted, so searchsorted maps ids to positions. Both reads
+        # see one snapshot, so every ticket's flight should be there; any that
+        # is not would otherwise be counted on a neighbouring flight
+        ids = columns[:, 0].astype(np.int64)
+        positions = np.searchsorted(flight_ids, ids)
+        found = positions < len(flight_ids)
+        found[found] = flight_ids[positions[found]] == ids[found]
+        tickets = {
+            'flight': positions[found],
+            'class': columns[found, 1].astype(np.int64),
+            'price': columns[found, 2],
+            'booked': columns[found, 3],
+        }
+        return ReportData(start, end, flights, tickets, labels, time.perf_counter() - started,
+                          skipped_tickets=int(len(ids) - found.sum()))
+
+    def _read_flights(self, conn, start, end):
+        read_started = time.perf_counter()
+        rows = conn.execute(self.FLIGHTS_SQL, (start, end)).fetchall()
+        record_query('reports.flights', time.perf_counter() - read_started, len(rows))
+        flight_ids = np.array([row[0] for row in rows], dtype=np.int64)
+        numeric = np.array([row[1:6] for row in rows], dtype=np.float64).reshape(-1, 5)
+        return flight_ids, {
+            'branch': numeric[:, 0].astype(np.int64),
+            'origin': numeric[:, 1].astype(np.int64),
+            'destination': numeric[:, 2].astype(np.int64),
+            'departure': numeric[:, 3].astype(np.int64),
+            'capacity': numeric[:, 4].astype(np.int64),
+            'number': np.array([row[6] for row in rows], dtype=object),
+        }
+
+    def _read_tickets(self, conn, start, end):
+        """flight id, class id, price and booking day per active ticket, as one float array."""
+        read_started = time.perf_counter()
+        chunks = []
+        cursor = conn.execute(self.TICKETS_SQL, (start, end))
+        while True:
+            batch = cursor.fetchmany(self.chunk_size)
+            if not batch:
+                break
+            # Missing booking dates become NaN
+            chunks.append(np.array(batch, dtype=np.float64))
+        columns = np.concatenate(chunks) if chunks else np.empty((0, 4))
+        record_query('reports.tickets', time.perf_counter() - read_started, len(columns))
+        return columns
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Print a report over the flights of a period")
+    parser.add_argument('report', choices=REPORTS)
+    parser.add_argument('--db', help="database file (default: the application's)")
+    parser.add_argument('--start', default=f"{date.today().year}-01-01", help="first departure date")
+    parser.add_argument('--end', default=f"{date.today().year}-12-31", help="last departure date")
+    parser.add_argument('--limit', type=int, default=20, help="rows to print (0 for all)")
+    args = parser.parse_args()
+
+    data = ReportEngine(args.db).load(args.start, args.end)
+    started = time.perf_counter()
+    table = data.report(args.report)
+    computed = time.perf_counter() - started
+
+    print("\t".join(key for key, _ in table.columns))
+    for row in table.rows[:args.limit or None]:
+        print("\t".join(f"{value:.4f}" if isinstance(value, float) else str(value) for value in row))
+    print(f"✅ {data.ticket_count:,} tickets on {data.flight_count:,} flights: "
+          f"read in {data.read_seconds:.2f}s, computed in {computed * 1000:.1f} ms")
+    if data.skipped_tickets:
+        print(f"⚠️ {data.skipped_tickets:,} tickets skipped: their flight was not read")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,712 @@
+# -*- coding: utf-8 -*-
+# backend/repositories.py
+import random
+import sqlite3
+import threading
+import time
+from datetime import date
+
+from backend.change_bus import publish
+from backend.daily_stats import METRICS
+from backend.database import get_connection
+from backend.models import (BookingRow, FlightRow, PassengerBookingRow, PassengerDetail,
+                            PassengerRow, RecentBookingRow)
+from backend.search_index import normalize_search, search_condition
+
+# Sample prices - in real app, these would come from database
+CLASS_PRICES = {'Economy': 450, 'Business': 850, 'First': 1200}
+DEFAULT_CLASS_PRICE = 500
+
+# Sorts after any character, closing the range of values that start with a prefix
+PREFIX_END = '\U0010ffff'
+
+# Candidates a type-ahead picker shows at most
+PICKER_LIMIT = 20
+
+# A busy database is retried this many times in all, waiting RETRY_DELAY
+# seconds, doubled after every attempt, plus jitter so competing
+# workstations do not wake up together
+MAX_ATTEMPTS = 5
+RETRY_DELAY = 0.05
+
+# Per-query timings: name -> {'calls', 'rows', 'total_ms', 'max_ms'}
+QUERY_STATS = {}
+_stats_lock = threading.Lock()
+
+
+def get_query_stats():
+    """Return a copy of the per-query timings collected so far."""
+    with _stats_lock:
+        return {name: dict(stats) for name, stats in QUERY_STATS.items()}
+
+
+def reset_query_stats():
+    """Forget all collected timings."""
+    with _stats_lock:
+        QUERY_STATS.clear()
+
+
+def record_query(name, elapsed, rows):
+    """Add one run of a named query (seconds, rows) to QUERY_STATS."""
+    with _stats_lock:
+        stats = QUERY_STATS.setdefault(name, {'calls': 0, 'rows': 0, 'total_ms': 0.0, 'max_ms': 0.0})
+        stats['calls'] += 1
+        stats['rows'] += rows
+        stats['total_ms'] += elapsed * 1000
+        stats['max_ms'] = max(stats['max_ms'], elapsed * 1000)
+
+
+def _is_busy(error):
+    message = str(error).lower()
+    return 'locked' in message or 'busy' in message
+
+
+def retry_busy(fn):
+    """Return fn(), called again with backoff while the database is locked or busy.
+
+    fn must leave nothing behind when it fails, e.g. roll back its transaction.
+    """
+    delay = RETRY_DELAY
+    for attempt in range(1, MAX_ATTEMPTS + 1):
+        try:
+            return fn()
+        except sqlite3.OperationalError as e:
+            if attempt == MAX_ATTEMPTS or not _is_busy(e):
+                raise
+            time.sleep(delay * (1 + random.random()))
+            delay *= 2
+
+
+def _sort_expressions(sort_columns, sort, default_sort, id_column):
+    """Whitelisted sort expressions plus the id tiebreak - never raw user input."""
+    expressions = list(sort_columns.get(sort) or sort_columns[default_sort])
+    if id_column not in expressions:
+        expressions.append(id_column)
+    return expressions
+
+
+def _direction(direction):
+    return 'DESC' if str(direction).upper() == 'DESC' else 'ASC'
+
+
+def _prefix_range(prefix):
+    """(low, high) bounds for a NOCASE range read of the values starting with prefix."""
+    prefix = (prefix or '').strip()
+    return prefix, prefix + PREFIX_END
+
+
+def _paging(limit, offset):
+    """LIMIT/OFFSET clause and parameters (empty when not paging)."""
+    if limit is None:
+        return "", ()
+    return "LIMIT ? OFFSET ?", (int(limit), int(offset or 0))
+
+
+class Repository:
+    """Base class: one place for connections, row mapping and query timing.
+
+    SQL strings are built from fixed fragments, so the set of distinct statements is
+    small and sqlite3's per-connection statement cache keeps them prepared on the
+    pooled connections. Every write announces what it changed on the change bus
+    (backend/change_bus.py) once it has committed.
+    """
+
+    def __init__(self, database=None, profile=None):
+        self.database = database
+        self.profile = profile
+
+    def _connect(self):
+        return get_connection(self.profile, self.database)
+
+    def _fetch_all(self, name, sql, params=(), row_type=None):
+        start = time.perf_counter()
+        with self._connect() as conn:
+            cursor = conn.cursor()
+            if row_type:
+                cursor.row_factory = lambda _cursor, row: row_type._make(row)
+            rows = cursor.execute(sql, params).fetchall()
+        record_query(name, time.perf_counter() - start, len(rows))
+        return rows
+
+    def _fetch_one(self, name, sql, params=(), row_type=None):
+        start = time.perf_counter()
+        with self._connect() as conn:
+            cursor = conn.cursor()
+            if row_type:
+                cursor.row_factory = lambda _cursor, row: row_type._make(row)
+            row = cursor.execute(sql, params).fetchone()
+        record_query(name, time.perf_counter() - start, 1 if row else 0)
+        return row
+
+    def _execute(self, name, sql, params=()):
+        """Run a single write in its own transaction; returns the cursor."""
+        start = time.perf_counter()
+        with self._connect() as conn:
+            cursor = conn.cursor()
+            cursor.execute(sql, params)
+            conn.commit()
+        record_query(name, time.perf_counter() - start, cursor.rowcount)
+        return cursor
+
+    def _changed(self, entity, action, *ids):
+        """Announce a committed write on the change bus."""
+        publish(entity, action, ids)
+
+
+class ListRepository(Repository):
+    """Repository behind a sortable, searchable list screen.
+
+    Subclasses provide LIST_SQL and COUNT_SQL templates with {keys}, {where},
+    {order} and {paging} slots, the whitelisted SORT_COLUMNS, and the
+    SEARCH_TABLE (backend/search_index.py) whose entry for a row holds every
+    field the search box looks at. ROW_SORT_FIELDS optionally gives, per sort
+    key, the row fields that order rows the same way in Python. A template
+    may also take its FROM clause from a {tables} slot: TABLES, or the
+    SORT_TABLES entry for sorts that need a fixed join order.
+    """
+
+    NAME = None
+    ROW_TYPE = None
+    ID_COLUMN = None
+    LIST_SQL = None
+    COUNT_SQL = None
+    COUNT_CONDITION = None
+    SEARCH_TABLE = None
+    TABLES = None
+    SORT_TABLES = {}
+    SORT_COLUMNS = {}
+    ROW_SORT_FIELDS = {}
+    DEFAULT_SORT = None
+    DEFAULT_DIRECTION = 'ASC'
+
+    def build_list_query(self, search=None, sort=None, direction=None, limit=None, offset=0,
+                         after=None, with_keys=False, with_text=False):
+        """Return (sql, params) for the list.
+
+        after is the sort key of the last row already shown (keyset pagination);
+        with_keys appends the sort key columns to every row, with_text puts the
+        row's search text in front of them.
+        """
+        direction = _direction(direction or self.DEFAULT_DIRECTION)
+        expressions = _sort_expressions(self.SORT_COLUMNS, sort, self.DEFAULT_SORT, self.ID_COLUMN)
+
+        conditions, params = [], ()
+        if search and search.strip():
+            condition, params = search_condition(self.SEARCH_TABLE, self.ID_COLUMN, search)
+            conditions.append(condition)
+        if after is not None:
+            # Row-value comparison walks the sort index from the last key onwards;
+            # the bound on the first column alone is what lets SQLite seek into an
+            # expression index instead of scanning up to the key
+            placeholders = ", ".join("?" * len(expressions))
+            operator = '<' if direction == 'DESC' else '>'
+            conditions.append(f"{expressions[0]} {operator}= ?")
+            conditions.append(f"({', '.join(expressions)}) {operator} ({placeholders})")
+            params += (after[0],) + tuple(after)
+
+        search_text = f"(SELECT text FROM {self.SEARCH_TABLE} WHERE rowid = {self.ID_COLUMN})"
+        extra = ([search_text] if with_text else []) + (expressions if with_keys else [])
+        paging, paging_params = _paging(limit, offset)
+        sql = self.LIST_SQL.format(
+            keys="".join(f", {expr}" for expr in extra),
+            where="WHERE " + " AND ".join(conditions) if conditions else "",
+            order="ORDER BY " + ", ".join(f"{expr} {direction}" for expr in expressions),
+            tables=self.SORT_TABLES.get(sort, self.TABLES),
+            paging=paging,
+        )
+        return sql, params + paging_params
+
+    def row_sort_key(self, sort):
+        """Python sort key matching SORT_COLUMNS[sort], or None when rows cannot be sorted locally.
+
+        Used with reverse=True for DESC, like the SQL where every column
+        (including the id tiebreak) follows the direction.
+        """
+        fields = self.ROW_SORT_FIELDS.get(sort)
+        if not fields:
+            return None
+
+        def key(row):
+            # NULLs sort like the IFNULL(..., '') wrappers in SORT_COLUMNS
+            return tuple('' if value is None else value
+                         for value in (getattr(row, field) for field in fields))
+        return key
+
+    def list_rows(self, search=None, sort=None, direction=None, limit=None, offset=0):
+        """Rows for the list screen, optionally filtered by a search term."""
+        sql, params = self.build_list_query(search, sort, direction, limit, offset)
+        name = f"{self.NAME}.search" if search else f"{self.NAME}.list"
+        return self._fetch_all(name, sql, params, self.ROW_TYPE)
+
+    def count(self, search=None):
+        """Number of rows the list would show."""
+        conditions, params = [], ()
+        if self.COUNT_CONDITION:
+            conditions.append(f"({self.COUNT_CONDITION})")
+        if search and search.strip():
+            condition, params = search_condition(self.SEARCH_TABLE, self.ID_COLUMN, search)
+            conditions.append(condition)
+        where = "WHERE " + " AND ".join(conditions) if conditions else ""
+        return self._fetch_one(f"{self.NAME}.count", self.COUNT_SQL.format(where=where), params)[0]
+
+    def fetch_page(self, search=None, sort=None, direction=None, limit=100, after=None, offset=0):
+        """One page of the list: (rows, keys) where keys[i] is the sort key of rows[i].
+
+        Pass the last key of the previous page as after to continue with keyset
+        pagination; offset is only used for random jumps.
+        """
+        sql, params = self.build_list_query(search, sort, direction, limit,
+                                            0 if after is not None else offset, after, True)
+        width = len(self.ROW_TYPE._fields)
+        row_type = self.ROW_TYPE
+        start = time.perf_counter()
+        with self._connect() as conn:
+            cursor = conn.cursor()
+            cursor.row_factory = lambda _cursor, row: (row_type._make(row[:width]), row[width:])
+            pairs = cursor.execute(sql, params).fetchall()
+        record_query(f"{self.NAME}.page", time.perf_counter() - start, len(pairs))
+        return [row for row, _ in pairs], [key for _, key in pairs]
+
+    def fetch_matches(self, search, sort=None, direction=None, limit=2000):
+        """The complete search result as (row, search text) pairs, or None when it has more than limit rows.
+
+        A complete result can answer any longer search term starting with the
+        same text without going back to the database.
+        """
+        sql, params = self.build_list_query(search, sort, direction, limit + 1, with_text=True)
+        width = len(self.ROW_TYPE._fields)
+        row_type = self.ROW_TYPE
+        start = time.perf_counter()
+        with self._connect() as conn:
+            cursor = conn.cursor()
+            cursor.row_factory = lambda _cursor, row: (row_type._make(row[:width]), normalize_search(row[width]))
+            pairs = cursor.execute(sql, params).fetchall()
+        record_query(f"{self.NAME}.matches", time.perf_counter() - start, len(pairs))
+        return pairs if len(pairs) <= limit else None
+
+
+class FlightRepository(ListRepository):
+    """Flights list, search and creation."""
+
+    LIST_SQL = """
+        SELECT
+            f.id,
+            f.flight_number,
+            o_airport.name as origin,
+            d_airport.name as destination,
+            f.departure_date || ' ' || f.departure_time as departure,
+            f.arrival_date || ' ' || f.arrival_time as arrival,
+            f.status{keys}
+        FROM {tables}
+        {where}
+        {order}
+        {paging}
+    """
+
+    # Foreign keys guarantee both airports, so counting flights is enough
+    COUNT_SQL = "SELECT COUNT(*) FROM flights f {where}"
+
+    TABLES = """flights f
+        JOIN airports o_airport ON f.origin_airport_id = o_airport.id
+        JOIN airports d_airport ON f.destination_airport_id = d_airport.id"""
+
+    # An airport name sort walks idx_airports_name and then each airport's
+    # flights. The planner only finds that order with fresh statistics, so it
+    # is spelled out: INDEXED BY for the airports, CROSS JOIN for the join order.
+    SORT_TABLES = {
+        'origin': """airports o_airport INDEXED BY idx_airports_name
+        CROSS JOIN flights f ON f.origin_airport_id = o_airport.id
+        JOIN airports d_airport ON f.destination_airport_id = d_airport.id""",
+        'destination': """airports d_airport INDEXED BY idx_airports_name
+        CROSS JOIN flights f ON f.destination_airport_id = d_airport.id
+        JOIN airports o_airport ON f.origin_airport_id = o_airport.id""",
+    }
+
+    # Flight number, airport names and status
+    SEARCH_TABLE = 'flights_fts'
+
+    # Scheduled flights whose number starts with what was typed, read in order
+    # from idx_flights_scheduled_number
+    CANDIDATES_SQL = """
+        SELECT
+            f.id, f.flight_number,
+            o.airport_code, d.airport_code,
+            f.departure_date, f.departure_time,
+            f.status
+        FROM flights f
+        JOIN airports o ON f.origin_airport_id = o.id
+        JOIN airports d ON f.destination_airport_id = d.id
+        WHERE f.status = 'scheduled'
+          AND f.flight_number >= ? COLLATE NOCASE AND f.flight_number < ? COLLATE NOCASE
+        ORDER BY f.flight_number COLLATE NOCASE, f.departure_date, f.departure_time
+        LIMIT ?
+    """
+
+    # Sort keys are the Treeview column names. Nullable values are wrapped so
+    # keyset comparisons never meet a NULL. Each one is backed by an index
+    # (migration 5); the airport id keeps airports that share a name apart so
+    # the airport name index plus idx_flights_origin/destination give the
+    # complete order.
+    SORT_COLUMNS = {
+        'flight_id': ('f.id',),
+        'flight_number': ('f.flight_number',),
+        'origin': ('o_airport.name', 'o_airport.id'),
+        'destination': ('d_airport.name', 'd_airport.id'),
+        'departure': ('f.departure_date', 'f.departure_time'),
+        'arrival': ('f.arrival_date', 'f.arrival_time'),
+        'status': ("IFNULL(f.status, '')",),
+    }
+    # Dates and times are fixed-width text, so 'date time' orders like
+    # (date, time). Only airports sharing a name can come out differently.
+    ROW_SORT_FIELDS = {
+        'flight_id': ('id',),
+        'flight_number': ('flight_number', 'id'),
+        'origin': ('origin', 'id'),
+        'destination': ('destination', 'id'),
+        'departure': ('departure', 'id'),
+        'arrival': ('arrival', 'id'),
+        'status': ('status', 'id'),
+    }
+    DEFAULT_SORT = 'flight_number'
+    NAME = 'flights'
+    ROW_TYPE = FlightRow
+    ID_COLUMN = 'f.id'
+
+    def list_flights(self, search=None, sort=None, direction='ASC', limit=None, offset=0):
+        """Flights for the main list, optionally filtered by a search term."""
+        return self.list_rows(search, sort, direction, limit, offset)
+
+    def first_flight(self):
+        """Any one flight, or None when the table is empty."""
+        sql, params = self.build_list_query(sort='flight_id', limit=1)
+        return self._fetch_one('flights.first', sql, params, FlightRow)
+
+    def find_available_flights(self, prefix='', limit=PICKER_LIMIT):
+        """First scheduled flights whose number starts with prefix, for the booking dialog."""
+        low, high = _prefix_range(prefix)
+        flights = []
+        for row in self._fetch_all('flights.candidates', self.CANDIDATES_SQL, (low, high, limit)):
+            flights.append({
+                'id': row[0],
+                'number': row[1],
+                'route': f"{row[2]} → {row[3]}",
+                'date': row[4],
+                'time': row[5],
+                'status': row[6]
+            })
+        return flights
+
+    def flight_number_exists(self, flight_number, departure_date):
+        """Check if a flight number already exists on the given date"""
+        row = self._fetch_one(
+            'flights.number_exists',
+            "SELECT COUNT(*) FROM flights WHERE flight_number = ? AND departure_date = ?",
+            (flight_number, departure_date)
+        )
+        return row[0] > 0
+
+    def create_flight(self, flight_number, origin_id, destination_id, dep_date, dep_time,
+                      arr_date, arr_time, status='scheduled', plane_id=None, branch_id=None):
+        """Insert a flight and return its id."""
+        start = time.perf_counter()
+        with self._connect() as conn:
+            cursor = conn.cursor()
+            # Get a plane and branch (for demo - in real app you'd let user choose)
+            if plane_id is None:
+                plane_id = cursor.execute("SELECT id FROM planes LIMIT 1").fetchone()[0]
+            if branch_id is None:
+                branch_id = cursor.execute("SELECT id FROM branches LIMIT 1").fetchone()[0]
+
+            cursor.execute("""
+                INSERT INTO flights
+                (flight_number, plane_id, branch_id, origin_airport_id, destination_airport_id,
+                departure_date, departure_time, arrival_date, arrival_time, status)
+                VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+            """, (flight_number, plane_id, branch_id, origin_id, destination_id,
+                  dep_date, dep_time, arr_date, arr_time, status))
+            conn.commit()
+        record_query('flights.create', time.perf_counter() - start, 1)
+        self._changed('flights', 'insert', cursor.lastrowid)
+        return cursor.lastrowid
+
+
+class BookingRepository(ListRepository):
+    """Bookings list, search and cancellation (new bookings go through backend/booking_engine.py)."""
+
+    # One row per booking, shown with its first ticket. Joining that ticket
+    # directly (instead of GROUP BY b.id) lets the list walk the booking_date
+    # index and stop after a page.
+    LIST_SQL = """
+        SELECT
+            b.booking_reference,
+            p.name as passenger_name,
+            f.flight_number,
+            o_airport.airport_code || ' → ' || d_airport.airport_code as route,
+            b.booking_date,
+            b.seat_count,
+            b.total_price,
+            t.status{keys}
+        FROM bookings b
+        JOIN tickets t ON t.id = (SELECT MIN(ft.id) FROM tickets ft WHERE ft.booking_id = b.id)
+        JOIN passengers p ON t.passenger_id = p.id
+        JOIN flights f ON t.flight_id = f.id
+        JOIN airports o_airport ON f.origin_airport_id = o_airport.id
+        JOIN airports d_airport ON f.destination_airport_id = d_airport.id
+        {where}
+        {order}
+        {paging}
+    """
+
+    # Foreign keys guarantee the passenger, flight and airport joins, so counting
+    # the bookings that have a ticket is enough
+    COUNT_SQL = "SELECT COUNT(*) FROM bookings b {where}"
+    COUNT_CONDITION = "EXISTS (SELECT 1 FROM tickets ft WHERE ft.booking_id = b.id)"
+
+    # A booking matches when its reference or any of its tickets (passenger
+    # name, flight number, status) matches
+    SEARCH_TABLE = 'bookings_fts'
+
+    SORT_COLUMNS = {
+        'booking_ref': ('b.booking_reference',),
+        'passenger': ('p.name',),
+        'flight': ('f.flight_number',),
+        'route': ("o_airport.airport_code || ' → ' || d_airport.airport_code",),
+        'booking_date': ('b.booking_date',),
+        'seats': ('b.seat_count',),
+        'total_price': ('b.total_price',),
+        'status': ("IFNULL(t.status, '')",),
+    }
+    DEFAULT_SORT = 'booking_date'
+    DEFAULT_DIRECTION = 'DESC'
+    NAME = 'bookings'
+    ROW_TYPE = BookingRow
+    ID_COLUMN = 'b.id'
+
+    def list_bookings(self, search=None, sort=None, direction='DESC', limit=None, offset=0):
+        """One row per booking, newest first by default."""
+        return self.list_rows(search, sort, direction, limit, offset)
+
+    def cancel_booking(self, booking_reference):
+        """Mark every ticket of a booking as cancelled; returns the number of tickets changed."""
+        start = time.perf_counter()
+        with self._connect() as conn:
+            cursor = conn.cursor()
+            ticket_ids = [row[0] for row in cursor.execute("""
+                SELECT t.id
+                FROM tickets t
+                JOIN bookings b ON t.booking_id = b.id
+                WHERE b.booking_reference = ?
+            """, (booking_reference,))]
+            cursor.executemany("UPDATE tickets SET status = 'cancelled' WHERE id = ?",
+                               [(ticket_id,) for ticket_id in ticket_ids])
+            conn.commit()
+        record_query('bookings.cancel', time.perf_counter() - start, len(ticket_ids))
+        if ticket_ids:
+            self._changed('tickets', 'update', *ticket_ids)
+        return len(ticket_ids)
+
+
+class PassengerRepository(ListRepository):
+    """Passengers list, search, details and edits."""
+
+    LIST_SQL = """
+        SELECT
+            p.id,
+            p.passport_number,
+            p.name,
+            g.name as gender,
+            c.name as nationality{keys}
+        FROM passengers p
+        JOIN genders g ON p.gender_id = g.id
+        JOIN countries c ON p.nationality_country_id = c.id
+        {where}
+        {order}
+        {paging}
+    """
+
+    COUNT_SQL = """
+        SELECT COUNT(*)
+        FROM passengers p
+        JOIN genders g ON p.gender_id = g.id
+        JOIN countries c ON p.nationality_country_id = c.id
+        {where}
+    """
+
+    # Passport number, name, gender and nationality
+    SEARCH_TABLE = 'passengers_fts'
+
+    DETAIL_SQL = """
+        SELECT
+            p.passport_number,
+            p.name,
+            g.name as gender,
+            c.name as nationality,
+            c.code as country_code
+        FROM passengers p
+        JOIN genders g ON p.gender_id = g.id
+        JOIN countries c ON p.nationality_country_id = c.id
+        WHERE p.id = ?
+    """
+
+    BOOKINGS_SQL = """
+        SELECT
+            b.booking_reference,
+            f.flight_number,
+            o_airport.airport_code || ' → ' || d_airport.airport_code as route,
+            b.booking_date,
+            t.ticket_number,
+            cls.name as class,
+            t.seat_number,
+            t.price,
+            t.status
+        FROM tickets t
+        JOIN bookings b ON t.booking_id = b.id
+        JOIN flights f ON t.flight_id = f.id
+        JOIN airports o_airport ON f.origin_airport_id = o_airport.id
+        JOIN airports d_airport ON f.destination_airport_id = d_airport.id
+        JOIN classes cls ON t.class_id = cls.id
+        WHERE t.passenger_id = ?
+        ORDER BY b.booking_date DESC
+    """
+
+    # Passengers whose name or passport number starts with what was typed: the
+    # first few from each prefix index, merged by name
+    CANDIDATES_SQL = """
+        SELECT id, passport_number, name FROM (
+            SELECT id, passport_number, name FROM passengers
+            WHERE name >= ? COLLATE NOCASE AND name < ? COLLATE NOCASE
+            ORDER BY name COLLATE NOCASE
+            LIMIT ?
+        )
+        UNION
+        SELECT id, passport_number, name FROM (
+            SELECT id, passport_number, name FROM passengers
+            WHERE passport_number >= ? COLLATE NOCASE AND passport_number < ? COLLATE NOCASE
+            ORDER BY passport_number COLLATE NOCASE
+            LIMIT ?
+        )
+        ORDER BY name COLLATE NOCASE, id
+        LIMIT ?
+    """
+
+    SORT_COLUMNS = {
+        'id': ('p.id',),
+        'passport': ('p.passport_number',),
+        'name': ('p.name',),
+        'gender': ('g.name',),
+        'nationality': ('c.name',),
+    }
+    DEFAULT_SORT = 'name'
+    NAME = 'passengers'
+    ROW_TYPE = PassengerRow
+    ID_COLUMN = 'p.id'
+
+    def find_passengers(self, prefix='', limit=PICKER_LIMIT):
+        """First passengers, by name, whose name or passport number starts with prefix."""
+        low, high = _prefix_range(prefix)
+        rows = self._fetch_all('passengers.candidates', self.CANDIDATES_SQL,
+                               (low, high, limit, low, high, limit, limit))
+        return [{'id': row[0], 'passport': row[1], 'name': row[2]} for row in rows]
+
+    def list_passengers(self, search=None, sort=None, direction='ASC', limit=None, offset=0):
+        """Passengers for the main list, optionally filtered by a search term."""
+        return self.list_rows(search, sort, direction, limit, offset)
+
+    def get_passenger(self, passenger_id):
+        """Details for one passenger, or None."""
+        return self._fetch_one('passengers.detail', self.DETAIL_SQL, (passenger_id,), PassengerDetail)
+
+    def list_passenger_bookings(self, passenger_id):
+        """Every ticket held by a passenger, newest booking first."""
+        return self._fetch_all('passengers.bookings', self.BOOKINGS_SQL, (passenger_id,),
+                               PassengerBookingRow)
+
+    def create_passenger(self, passport_number, name, gender_id, country_id):
+        """Insert a passenger and return the new id."""
+        cursor = self._execute('passengers.create', """
+            INSERT INTO passengers
+            (passport_number, name, gender_id, nationality_country_id)
+            VALUES (?, ?, ?, ?)
+        """, (passport_number, name, gender_id, country_id))
+        self._changed('passengers', 'insert', cursor.lastrowid)
+        return cursor.lastrowid
+
+    def update_passenger(self, passenger_id, name, gender_id, country_id):
+        """Update a passenger's editable fields."""
+        self._execute('passengers.update', """
+            UPDATE passengers
+            SET name = ?, gender_id = ?, nationality_country_id = ?
+            WHERE id = ?
+        """, (name, gender_id, country_id, passenger_id))
+        self._changed('passengers', 'update', passenger_id)
+
+
+class LookupRepository(Repository):
+    """Small reference lists used to fill the dialog comboboxes."""
+
+    def airports(self):
+        """Get list of airports from database"""
+        rows = self._fetch_all('lookups.airports',
+                               "SELECT id, airport_code, name FROM airports ORDER BY airport_code")
+        return [{'id': row[0], 'code': row[1], 'name': row[2]} for row in rows]
+
+    def classes(self):
+        """Get list of available classes with sample prices"""
+        rows = self._fetch_all('lookups.classes', "SELECT id, name FROM classes ORDER BY id")
+        return [{'id': row[0], 'name': row[1], 'price': CLASS_PRICES.get(row[1], DEFAULT_CLASS_PRICE)}
+                for row in rows]
+
+    def terminals(self):
+        """Get list of terminals"""
+        rows = self._fetch_all('lookups.terminals',
+                               "SELECT id, number, name FROM terminals ORDER BY number")
+        return [{'id': row[0], 'number': row[1], 'name': row[2] or f"Terminal {row[1]}"}
+                for row in rows]
+
+    def genders(self):
+        """Get list of genders from database"""
+        rows = self._fetch_all('lookups.genders', "SELECT id, name FROM genders ORDER BY name")
+        return [{'id': row[0], 'name': row[1]} for row in rows]
+
+    def countries(self):
+        """Get list of countries from database"""
+        rows = self._fetch_all('lookups.countries', "SELECT id, name FROM countries ORDER BY name")
+        return [{'id': row[0], 'name': row[1]} for row in rows]
+
+
+class DashboardRepository(Repository):
+    """Dashboard figures, read without scanning bookings or tickets.
+
+    The per-day numbers come from the trigger-maintained daily_stats rows
+    (backend/daily_stats.py); recent bookings walk the newest booking ids.
+    """
+
+    STATS_SQL = "SELECT metric, value FROM daily_stats WHERE day = ?"
+
+    RECENT_BOOKINGS_SQL = """
+        SELECT
+            b.booking_reference,
+            f.flight_number,
+            o_airport.airport_code || ' → ' || d_airport.airport_code,
+            b.booking_date,
+            b.seat_count,
+            b.total_price
+        FROM bookings b
+        JOIN flights f ON b.flight_id = f.id
+        JOIN airports o_airport ON f.origin_airport_id = o_airport.id
+        JOIN airports d_airport ON f.destination_airport_id = d_airport.id
+        ORDER BY b.id DESC
+        LIMIT ?
+    """
+
+    def day_stats(self, day=None):
+        """{metric: value} for a day (today by default); a quiet day is all zeros."""
+        stats = dict.fromkeys(METRICS, 0)
+        stats.update(self._fetch_all('dashboard.stats', self.STATS_SQL,
+                                     (day or date.today().isoformat(),)))
+        return stats
+
+    def recent_bookings(self, limit=5):
+        """The newest bookings, latest first."""
+        return self._fetch_all('dashboard.recent_bookings', self.RECENT_BOOKINGS_SQL, (limit,),
+                               RecentBookingRow)
@@ -0,0 +1,181 @@
+# -*- coding: utf-8 -*-
+# backend/search_index.py
+# Full-text search index behind the search boxes of the list frames.
+#
+# Each searchable list has an FTS5 table with one row per entity (rowid = the
+# entity id) holding every field the search looks at, joined by char(31). The
+# trigram tokenizer turns LIKE '%term%' on that column into an index lookup for
+# terms of three or more characters; shorter terms scan the search table only,
+# never the joined tables. Triggers keep the index in step with the base tables.
+#
+# Arabic text is normalized on both sides (stored text and search term): short
+# vowels and tatweel are dropped, alef forms, alef maqsura and ta marbuta are
+# folded, so "أحمد" finds "احمد" and "فاطمة" finds "فاطمه". The tokenizer folds
+# case for any script; SQLite's own LIKE only folds ASCII, so the LIKE fallback
+# compares search_fold(text) for terms with other characters.
+
+SEPARATOR = "char(31)"
+
+# The trigram index only helps terms at least this long
+MIN_INDEXED_LENGTH = 3
+
+# (from, to) pairs applied to stored text and search terms alike
+ARABIC_FOLDS = [
+    ('أ', 'ا'),  # alef with hamza above -> alef
+    ('إ', 'ا'),  # alef with hamza below -> alef
+    ('آ', 'ا'),  # alef with madda -> alef
+    ('ٱ', 'ا'),  # alef wasla -> alef
+    ('ى', 'ي'),  # alef maqsura -> ya
+    ('ة', 'ه'),  # ta marbuta -> ha
+    ('ـ', ''),  # tatweel
+] + [(chr(mark), '') for mark in range(0x064B, 0x0653)]  # tanween, harakat, shadda, sukun
+
+_FOLD_TABLE = str.maketrans({source: target for source, target in ARABIC_FOLDS})
+
+
+def normalize_search(text):
+    """Normalize a search term (or stored search text) for comparison."""
+    return (text or '').translate(_FOLD_TABLE).lower().strip()
+
+
+def register_search_functions(conn):
+    """Define search_fold(text) (normalize_search in SQL) on a new connection."""
+    conn.create_function('search_fold', 1, normalize_search, deterministic=True)
+
+
+def sql_normalize(expression):
+    """SQL for the same Arabic folding as normalize_search (case is left to the tokenizer)."""
+    for source, target in ARABIC_FOLDS:
+        expression = f"replace({expression}, '{source}', '{target}')"
+    return expression
+
+
+def search_condition(table, id_column, term):
+    """(condition, params) selecting the rows of a list whose search text contains term.
+
+    Terms of three or more characters are a trigram phrase MATCH. Shorter ones,
+    and terms with LIKE wildcards the user typed on purpose, use LIKE on the
+    search table, which behaves the same but cannot use the index. Non-ASCII
+    terms compare against search_fold(text); that calls back into Python per
+    row, so ASCII terms keep the plain (ASCII case-insensitive) LIKE.
+    """
+    term = normalize_search(term)
+    if len(term) >= MIN_INDEXED_LENGTH and '%' not in term and '_' not in term:
+        phrase = '"' + term.replace('"', '""') + '"'
+        return f"{id_column} IN (SELECT rowid FROM {table} WHERE {table} MATCH ?)", (phrase,)
+    text = "text" if term.isascii() else "search_fold(text)"
+    return f"{id_column} IN (SELECT rowid FROM {table} WHERE {text} LIKE ?)", (f"%{term}%",)
+
+
+def _joined(*columns):
+    return sql_normalize(f" || {SEPARATOR} || ".join(f"IFNULL({column}, '')" for column in columns))
+
+
+# table -> (SELECT producing (rowid, text) for base rows, id column it filters on)
+SEARCH_TABLES = {
+    'passengers_fts': ("""
+        SELECT p.id, {text}
+        FROM passengers p
+        LEFT JOIN genders g ON p.gender_id = g.id
+        LEFT JOIN countries c ON p.nationality_country_id = c.id
+    """.format(text=_joined('p.passport_number', 'p.name', 'g.name', 'c.name')), 'p.id'),
+    'flights_fts': ("""
+        SELECT f.id, {text}
+        FROM flights f
+        LEFT JOIN airports o ON f.origin_airport_id = o.id
+        LEFT JOIN airports d ON f.destination_airport_id = d.id
+    """.format(text=_joined('f.flight_number', 'o.name', 'd.name', 'f.status')), 'f.id'),
+    # A booking is found by its reference or by any of its tickets
+    'bookings_fts': ("""
+        SELECT b.id, {text}
+        FROM bookings b
+    """.format(text=_joined('b.booking_reference', f"""(
+            SELECT group_concat(
+                IFNULL(sp.name, '') || {SEPARATOR} || IFNULL(sf.flight_number, '') || {SEPARATOR} ||
+                IFNULL(st.status, ''), {SEPARATOR})
+            FROM tickets st
+            JOIN passengers sp ON st.passenger_id = sp.id
+            JOIN flights sf ON st.flight_id = sf.id
+            WHERE st.booking_id = b.id
+        )""")), 'b.id'),
+}
+
+
+def _refresh(table, ids):
+    """Trigger body statements that rewrite the index rows for the ids selected by ids."""
+    select, id_column = SEARCH_TABLES[table]
+    return (f"DELETE FROM {table} WHERE rowid IN ({ids});\n"
+            f"INSERT INTO {table} (rowid, text) {select} WHERE {id_column} IN ({ids});")
+
+
+def _trigger(name, event, body):
+    return f"CREATE TRIGGER IF NOT EXISTS {name} {event} BEGIN\n{body}\nEND"
+
+
+# (name, event, body) for every trigger that keeps the index current
+_TRIGGERS = [
+    # Passengers: own fields, plus the gender and country names shown with them
+    ('passengers_fts_insert', "AFTER INSERT ON passengers", _refresh('passengers_fts', "new.id")),
+    ('passengers_fts_update', "AFTER UPDATE ON passengers", _refresh('passengers_fts', "old.id, new.id")),
+    ('passengers_fts_delete', "AFTER DELETE ON passengers",
+     "DELETE FROM passengers_fts WHERE rowid = old.id;"),
+    ('genders_fts_update', "AFTER UPDATE OF name ON genders",
+     _refresh('passengers_fts', "SELECT id FROM passengers WHERE gender_id = new.id")),
+    ('countries_fts_update', "AFTER UPDATE OF name ON countries",
+     _refresh('passengers_fts', "SELECT id FROM passengers WHERE nationality_country_id = new.id")),
+
+    # Flights: own fields plus airport names
+    ('flights_fts_insert', "AFTER INSERT ON flights", _refresh('flights_fts', "new.id")),
+    ('flights_fts_update', "AFTER UPDATE ON flights", _refresh('flights_fts', "old.id, new.id")),
+    ('flights_fts_delete', "AFTER DELETE ON flights", "DELETE FROM flights_fts WHERE rowid = old.id;"),
+    ('airports_fts_update', "AFTER UPDATE OF name ON airports",
+     _refresh('flights_fts', "SELECT id FROM flights WHERE origin_airport_id = new.id "
+                             "OR destination_airport_id = new.id")),
+
+    # Bookings: reference plus the passenger, flight and status of every ticket
+    ('bookings_fts_insert', "AFTER INSERT ON bookings", _refresh('bookings_fts', "new.id")),
+    ('bookings_fts_update', "AFTER UPDATE ON bookings", _refresh('bookings_fts', "old.id, new.id")),
+    ('bookings_fts_delete', "AFTER DELETE ON bookings", "DELETE FROM bookings_fts WHERE rowid = old.id;"),
+    ('tickets_fts_insert', "AFTER INSERT ON tickets", _refresh('bookings_fts', "new.booking_id")),
+    ('tickets_fts_update', "AFTER UPDATE ON tickets",
+     _refresh('bookings_fts', "old.booking_id, new.booking_id")),
+    ('tickets_fts_delete', "AFTER DELETE ON tickets", _refresh('bookings_fts', "old.booking_id")),
+    ('passengers_bookings_fts_update', "AFTER UPDATE OF name ON passengers",
+     _refresh('bookings_fts', "SELECT booking_id FROM tickets WHERE passenger_id = new.id")),
+    ('flights_bookings_fts_update', "AFTER UPDATE OF flight_number ON flights",
+     _refresh('bookings_fts', "SELECT booking_id FROM tickets WHERE flight_id = new.id")),
+]
+
+CREATE_TRIGGERS = [_trigger(name, event, body) for name, event, body in _TRIGGERS]
+DROP_TRIGGERS = [f"DROP TRIGGER IF EXISTS {name}" for name, _, _ in _TRIGGERS]
+
+CREATE_TABLES = [
+    f"CREATE VIRTUAL TABLE IF NOT EXISTS {table} USING fts5(text, tokenize = 'trigram')"
+    for table in SEARCH_TABLES
+]
+
+REBUILD = [
+    statement
+    for table, (select, _) in SEARCH_TABLES.items()
+    for statement in (f"DELETE FROM {table}", f"INSERT INTO {table} (rowid, text) {select}")
+]
+
+# Migration steps: tables, initial fill, then the triggers
+SEARCH_INDEX = CREATE_TABLES + REBUILD + CREATE_TRIGGERS
+
+
+def rebuild_search_index(conn):
+    """Refill every search table from the base tables (after a bulk load with the triggers off)."""
+    for statement in REBUILD:
+        conn.execute(statement)
+
+
+def suspend_search_triggers(conn):
+    """Drop the sync triggers; bulk loads call rebuild_search_index and resume_search_triggers after."""
+    for statement in DROP_TRIGGERS:
+        conn.execute(statement)
+
+
+def resume_search_triggers(conn):
+    for statement in CREATE_TRIGGERS:
+        conn.execute(statement)
@@ -0,0 +1,86 @@
+# -*- coding: utf-8 -*-
+# backend/storage_profiles.py
+import os
+
+# Pragmas applied to every new connection. Sizes follow SQLite conventions:
+# a negative cache_size is in KiB, mmap_size is in bytes, busy_timeout in ms.
+STORAGE_PROFILES = {
+    # Interactive counters: readers never wait on a booking write
+    'desk_agent': {
+        'journal_mode': 'WAL',
+        'synchronous': 'NORMAL',
+        'cache_size': -16000,
+        'mmap_size': 64 * 1024 * 1024,
+        'temp_store': 'MEMORY',
+        'busy_timeout': 5000,
+        'foreign_keys': 'ON',
+    },
+    # Seeding, generators and imports: throughput over durability
+    'bulk_import': {
+        'journal_mode': 'WAL',
+        'synchronous': 'OFF',
+        'cache_size': -128000,
+        'mmap_size': 256 * 1024 * 1024,
+        'temp_store': 'MEMORY',
+        'busy_timeout': 30000,
+        'foreign_keys': 'OFF',
+    },
+    # Read-only reporting: big cache, large mmap window, writes refused
+    'reporting_replica': {
+        'journal_mode': 'WAL',
+        'synchronous': 'NORMAL',
+        'cache_size': -64000,
+        'mmap_size': 1024 * 1024 * 1024,
+        'temp_store': 'MEMORY',
+        'busy_timeout': 10000,
+        'foreign_keys': 'ON',
+        'query_only': 'ON',
+    },
+}
+
+# journal_mode must be set first: the other pragmas are per-connection anyway
+PRAGMA_ORDER = ('journal_mode', 'busy_timeout', 'synchronous', 'cache_size',
+                'mmap_size', 'temp_store', 'foreign_keys', 'query_only')
+
+DEFAULT_PROFILE = 'desk_agent'
+
+_active_profile = None
+
+
+def normalize_profile_name(name):
+    """Accept 'desk agent', 'desk-agent' or 'desk_agent'."""
+    return name.strip().lower().replace(' ', '_').replace('-', '_')
+
+
+def get_profile(name=None):
+    """Return the pragma settings for a profile (the active one by default)."""
+    name = normalize_profile_name(name) if name else get_active_profile()
+    if name not in STORAGE_PROFILES:
+        raise ValueError(
+            f"Unknown storage profile '{name}'. Available: {', '.join(STORAGE_PROFILES)}"
+        )
+    return STORAGE_PROFILES[name]
+
+
+def get_active_profile():
+    """Profile used when none is requested: set_active_profile() or $AK_STORAGE_PROFILE."""
+    if _active_profile:
+        return _active_profile
+    return normalize_profile_name(os.environ.get('AK_STORAGE_PROFILE', DEFAULT_PROFILE))
+
+
+def set_active_profile(name):
+    """Select the profile used by connections opened from now on."""
+    global _active_profile
+    name = normalize_profile_name(name)
+    get_profile(name)  # validate
+    _active_profile = name
+
+
+def apply_storage_profile(conn, name=None):
+    """Apply a profile's pragmas to a freshly opened connection."""
+    settings = get_profile(name)
+    for pragma in PRAGMA_ORDER:
+        if pragma in settings:
+            conn.execute(f"PRAGMA {pragma} = {settings[pragma]}")
+    return conn
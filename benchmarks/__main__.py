@@ -0,0 +1,7 @@
+# -*- coding: utf-8 -*-
+# benchmarks/__main__.py
+import sys
+
+from benchmarks.harness import main
+
+sys.exit(main())
@@ -0,0 +1,301 @@
+# -*- coding: utf-8 -*-
+# benchmarks/cases.py
+import random
+from datetime import date, timedelta
+
+from frontend.search_controller import NARROW_LIMIT, can_narrow, narrow
+from frontend.virtual_tree import QuerySource
+from backend.booking_engine import BookingEngine
+from backend.booking_import import BookingImporter
+from backend.report_engine import REPORTS, ReportEngine
+from backend.repositories import (BookingRepository, CLASS_PRICES, DEFAULT_CLASS_PRICE,
+                                  FlightRepository, PassengerRepository)
+from backend.search_index import MIN_INDEXED_LENGTH
+
+# The cases call the same repository methods as the frames, so the benchmark
+# measures exactly what the UI runs. List screens load through a VirtualTreeview:
+# a count plus the first page.
+PAGE_SIZE = 100
+
+# Rows a VirtualTreeview keeps with its default cache (8 pages)
+LOADED_ROWS = 8 * PAGE_SIZE
+
+# Typical terms typed into the search boxes
+FLIGHT_SEARCH_TERMS = ['ak1', 'dubai', 'delayed', 'cairo', 'ak2']
+BOOKING_SEARCH_TERMS = ['gbr00001', 'ali', 'ak10', 'cancelled', 'brn']
+PASSENGER_SEARCH_TERMS = ['ali', 'g000012', 'female', 'egypt', 'sara al']
+# Passengers per booking in the group booking cases, and in the imported manifests
+GROUP_SIZE = 6
+GROUP_SIZES = [1, 1, 2, 2, 3, 4]
+
+# Tickets per imported manifest
+MANIFEST_TICKETS = 500
+
+# Days of departures a report covers
+REPORT_DAYS = 365
+
+# Flight numbers typed into the booking dialog's flight picker
+FLIGHT_NUMBER_PREFIXES = ['ak1', 'ak10', 'ak2', 'ak15']
+
+
+class BenchmarkContext:
+    """Ids sampled from the dataset so every case hits real rows."""
+
+    def __init__(self, conn, database, seed=0):
+        self.conn = conn
+        self.rng = random.Random(seed)
+        self.flights = FlightRepository(database)
+        self.bookings = BookingRepository(database)
+        self.booking_engine = BookingEngine(database)
+        self.passengers = PassengerRepository(database)
+        self.importer = BookingImporter(database)
+        self.report_engine = ReportEngine(database)
+        cursor = conn.cursor()
+        self.passenger_ids = [r[0] for r in cursor.execute(
+            "SELECT id FROM passengers ORDER BY RANDOM() LIMIT 500")]
+        # Scheduled flights with seats to spare, and the classes every plane offers
+        self.flight_ids = [r[0] for r in cursor.execute("""
+            SELECT f.id FROM flights f
+            WHERE f.status = 'scheduled'
+              AND (SELECT COUNT(*) FROM tickets t
+                   WHERE t.flight_id = f.id AND t.status <> 'cancelled') < 150
+            ORDER BY RANDOM() LIMIT 500
+        """)]
+        self.classes = [tuple(r) for r in cursor.execute("""
+            SELECT id, name FROM classes
+            WHERE name IN ('Economy', 'Business')
+            ORDER BY id
+        """)]
+        self.terminal_ids = [r[0] for r in cursor.execute("SELECT id FROM terminals ORDER BY number")]
+        # What an agency manifest names them by
+        self.passports = [r[0] for r in cursor.execute(
+            "SELECT passport_number FROM passengers ORDER BY RANDOM() LIMIT 2000")]
+        self.flight_keys = [tuple(r) for r in cursor.execute(
+            f"SELECT flight_number, departure_date FROM flights WHERE id IN "
+            f"({', '.join('?' * len(self.flight_ids))})", self.flight_ids)]
+        self.booking_count = self.bookings.count()
+        # A flights search result small enough for VirtualTreeview to hold in full
+        self.loaded_flights, _ = self.flights.fetch_page('dubai', limit=LOADED_ROWS)
+        # A year of departures from the first one, read once for the report switching case
+        first = date.fromisoformat(cursor.execute("SELECT MIN(departure_date) FROM flights").fetchone()[0])
+        self.report_period = (first, first + timedelta(days=REPORT_DAYS - 1))
+        self.report_data = self.report_engine.load(*self.report_period)
+        self.created_bookings = []
+
+    def cleanup(self):
+        """Remove the rows written by the write-path cases."""
+        if not self.created_bookings:
+            return
+        cursor = self.conn.cursor()
+        cursor.executemany("DELETE FROM tickets WHERE booking_id = ?",
+                           [(b,) for b in self.created_bookings])
+        cursor.executemany("DELETE FROM bookings WHERE id = ?",
+                           [(b,) for b in self.created_bookings])
+        self.conn.commit()
+        self.created_bookings = []
+
+
+def _first_screen(source):
+    """What VirtualTreeview.set_source reads: the row count and the first page."""
+    total = source.count()
+    rows, _ = source.fetch_page(PAGE_SIZE)
+    return len(rows) if total else 0
+
+
+def flights_load_flights(ctx):
+    """FlightsFrame.load_flights with the default sort"""
+    return _first_screen(QuerySource(ctx.flights, sort='flight_number', direction='ASC'))
+
+
+def flights_on_search(ctx):
+    """FlightsFrame.on_search"""
+    term = ctx.rng.choice(FLIGHT_SEARCH_TERMS)
+    return _first_screen(QuerySource(ctx.flights, search=term, sort='departure'))
+
+
+def flights_sort_treeview(ctx):
+    """FlightsFrame.sort_treeview: reload ordered by a header column, then scroll one page on"""
+    column = ctx.rng.choice(list(FlightRepository.SORT_COLUMNS))
+    direction = ctx.rng.choice(['ASC', 'DESC'])
+    source = QuerySource(ctx.flights, sort=column, direction=direction)
+    count = _first_screen(source)
+    rows, keys = source.fetch_page(PAGE_SIZE)
+    if keys:
+        count += len(source.fetch_page(PAGE_SIZE, after=keys[-1])[0])
+    return count
+
+
+def flights_sort_loaded(ctx):
+    """FlightsFrame.sort_treeview when the whole result is loaded: re-sorted in memory"""
+    column = ctx.rng.choice(list(FlightRepository.ROW_SORT_FIELDS))
+    direction = ctx.rng.choice(['ASC', 'DESC'])
+    key = ctx.flights.row_sort_key(column)
+    return len(sorted(ctx.loaded_flights, key=key, reverse=direction == 'DESC'))
+
+
+def bookings_load_bookings(ctx):
+    """BookingsFrame.load_bookings"""
+    return _first_screen(QuerySource(ctx.bookings))
+
+
+def bookings_on_search(ctx):
+    """BookingsFrame.on_search"""
+    return _first_screen(QuerySource(ctx.bookings, search=ctx.rng.choice(BOOKING_SEARCH_TERMS)))
+
+
+def bookings_create_booking(ctx):
+    """BookingsFrame.create_booking: the booking engine's checked, locked sale of one seat"""
+    rng = ctx.rng
+    class_id, class_name = rng.choice(ctx.classes)
+    # Rows past anything the generator sells, one new seat per call
+    seat = len(ctx.created_bookings)
+    result = ctx.booking_engine.book(
+        rng.choice(ctx.flight_ids), rng.choice(ctx.passenger_ids), class_id,
+        rng.choice(ctx.terminal_ids), [f"{100 + seat // 6}{'ABCDEF'[seat % 6]}"],
+        CLASS_PRICES.get(class_name, DEFAULT_CLASS_PRICE)
+    )
+    ctx.created_bookings.append(result.booking_id)
+    return 1
+
+
+def _group_booking_args(ctx):
+    rng = ctx.rng
+    class_id, class_name = rng.choice(ctx.classes)
+    return (rng.choice(ctx.flight_ids), rng.sample(ctx.passenger_ids, GROUP_SIZE), class_id,
+            rng.choice(ctx.terminal_ids), CLASS_PRICES.get(class_name, DEFAULT_CLASS_PRICE))
+
+
+def bookings_create_group_booking(ctx):
+    """BookingsFrame.create_booking in group mode: GROUP_SIZE passengers, one transaction"""
+    flight_id, passenger_ids, class_id, terminal_id, price = _group_booking_args(ctx)
+    result = ctx.booking_engine.book_group(flight_id, passenger_ids, class_id, terminal_id, price)
+    ctx.created_bookings.append(result.booking_id)
+    return len(result.ticket_ids)
+
+
+def bookings_create_group_as_singles(ctx):
+    """The same group sold the old way: one single-seat booking per passenger"""
+    flight_id, passenger_ids, class_id, terminal_id, price = _group_booking_args(ctx)
+    for passenger_id in passenger_ids:
+        result = ctx.booking_engine.book_group(flight_id, [passenger_id], class_id, terminal_id, price)
+        ctx.created_bookings.append(result.booking_id)
+    return len(passenger_ids)
+
+
+def bookings_import_bookings(ctx):
+    """BookingsFrame.import_bookings: a MANIFEST_TICKETS-ticket agency manifest, seats assigned"""
+    rng = ctx.rng
+    records, group = [], 0
+    while len(records) < MANIFEST_TICKETS:
+        group += 1
+        flight_number, departure_date = rng.choice(ctx.flight_keys)
+        seat_class = rng.choice(ctx.classes)[1]
+        for passport in rng.sample(ctx.passports, rng.choice(GROUP_SIZES)):
+            records.append((len(records) + 2, {
+                'group': f"BENCH{group}", 'passport_number': passport,
+                'flight_number': flight_number, 'departure_date': departure_date,
+                'class': seat_class, 'terminal': '1',
+            }))
+    report = ctx.importer.import_records(records)
+    ctx.created_bookings.extend(report['booking_ids'])
+    return report['tickets']
+
+
+def reports_run_report(ctx):
+    """ReportsFrame.run_report: read a year of departures and compute every report"""
+    data = ctx.report_engine.load(*ctx.report_period)
+    for name in REPORTS:
+        data.report(name)
+    return data.ticket_count
+
+
+def reports_show_report(ctx):
+    """ReportsFrame.show_report: switch through every report over a year already read"""
+    for name in REPORTS:
+        ctx.report_data.report(name)
+    return ctx.report_data.ticket_count * len(REPORTS)
+
+
+def passengers_load_passengers(ctx):
+    """PassengersFrame.load_passengers"""
+    return _first_screen(QuerySource(ctx.passengers))
+
+
+def passengers_on_search(ctx):
+    """PassengersFrame.on_search"""
+    return _first_screen(QuerySource(ctx.passengers, search=ctx.rng.choice(PASSENGER_SEARCH_TERMS)))
+
+
+def passengers_load_passenger_bookings_tab(ctx):
+    """PassengersFrame.load_passenger_bookings_tab"""
+    return len(ctx.passengers.list_passenger_bookings(ctx.rng.choice(ctx.passenger_ids)))
+
+
+def search_controller_type_ahead(ctx):
+    """SearchController: type a passenger name one character at a time, as if every key fired"""
+    term = ctx.rng.choice(PASSENGER_SEARCH_TERMS)
+    previous = matches = None
+    count = 0
+    for end in range(1, len(term) + 1):
+        prefix = term[:end].strip()
+        if matches is not None and can_narrow(previous, prefix):
+            matches = narrow(matches, prefix)
+        else:
+            matches = None
+            if len(prefix) >= MIN_INDEXED_LENGTH:
+                matches = ctx.passengers.fetch_matches(prefix, limit=NARROW_LIMIT)
+            if matches is None:
+                count += _first_screen(QuerySource(ctx.passengers, search=prefix))
+                previous = None
+                continue
+        previous = prefix
+        count += len(matches)
+    return count
+
+
+def booking_dialog_pickers(ctx):
+    """BookingsFrame.add_booking pickers: look up a passenger and a flight as they are typed"""
+    passenger = ctx.rng.choice(PASSENGER_SEARCH_TERMS)
+    flight = ctx.rng.choice(FLIGHT_NUMBER_PREFIXES)
+    count = 0
+    for end in range(len(passenger) + 1):
+        count += len(ctx.passengers.find_passengers(passenger[:end]))
+    for end in range(len(flight) + 1):
+        count += len(ctx.flights.find_available_flights(flight[:end]))
+    return count
+
+
+def virtual_tree_scroll(ctx):
+    """VirtualTreeview: jump into the bookings list (OFFSET), then scroll on (keyset)"""
+    source = QuerySource(ctx.bookings)
+    rows, keys = source.fetch_page(PAGE_SIZE, offset=ctx.rng.randrange(ctx.booking_count or 1))
+    count = len(rows)
+    for _ in range(4):
+        if not keys:
+            break
+        rows, keys = source.fetch_page(PAGE_SIZE, after=keys[-1])
+        count += len(rows)
+    return count
+
+
+# name -> callable(ctx) returning the number of rows it produced
+CASES = {
+    'FlightsFrame.load_flights': flights_load_flights,
+    'FlightsFrame.on_search': flights_on_search,
+    'FlightsFrame.sort_treeview': flights_sort_treeview,
+    'FlightsFrame.sort_treeview[memory]': flights_sort_loaded,
+    'BookingsFrame.load_bookings': bookings_load_bookings,
+    'BookingsFrame.on_search': bookings_on_search,
+    'BookingsFrame.create_booking': bookings_create_booking,
+    'BookingsFrame.create_booking[group]': bookings_create_group_booking,
+    'BookingsFrame.create_booking[group as singles]': bookings_create_group_as_singles,
+    'BookingsFrame.import_bookings': bookings_import_bookings,
+    'ReportsFrame.run_report': reports_run_report,
+    'ReportsFrame.show_report': reports_show_report,
+    'PassengersFrame.load_passengers': passengers_load_passengers,
+    'PassengersFrame.on_search': passengers_on_search,
+    'PassengersFrame.load_passenger_bookings_tab': passengers_load_passenger_bookings_tab,
+    'SearchController.type_ahead': search_controller_type_ahead,
+    'BookingsFrame.pickers': booking_dialog_pickers,
+    'VirtualTreeview.scroll': virtual_tree_scroll,
+}
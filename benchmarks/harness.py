@@ -0,0 +1,195 @@
+# -*- coding: utf-8 -*-
+# benchmarks/harness.py
+import argparse
+import json
+import os
+import platform
+import sqlite3
+import statistics
+import subprocess
+import sys
+import time
+import tracemalloc
+from datetime import datetime
+
+from backend.data_generator import SCALES, generate_dataset
+from backend.database import get_connection
+from backend.migrations import migrate
+from benchmarks.cases import CASES, BenchmarkContext
+
+DEFAULT_DATA_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'data')
+
+# A p95 this many times slower than the baseline counts as a regression
+DEFAULT_THRESHOLD = 1.25
+
+
+def dataset_path(data_dir, scale, seed):
+    """Generated datasets are cached per scale and seed."""
+    return os.path.join(data_dir, f"bench_{scale}_seed{seed}.db")
+
+
+def ensure_dataset(data_dir, scale, seed):
+    """Return the path of a dataset, generating it on first use."""
+    path = dataset_path(data_dir, scale, seed)
+    if not os.path.exists(path):
+        os.makedirs(data_dir, exist_ok=True)
+        passengers, flights, tickets = SCALES[scale]
+        print(f"🔄 Generating {scale} dataset at {path}")
+        try:
+            generate_dataset(path, passengers=passengers, flights=flights, tickets=tickets,
+                             seed=seed, verbose=False)
+        except BaseException:
+            # Never leave a half-written dataset behind to be reused later
+            for suffix in ('', '-wal', '-shm'):
+                if os.path.exists(path + suffix):
+                    os.remove(path + suffix)
+            raise
+    return path
+
+
+def percentile_summary(samples):
+    """p50/p95/p99 of a list of durations in seconds, reported in milliseconds."""
+    if len(samples) > 1:
+        cuts = statistics.quantiles(samples, n=100, method='inclusive')
+        p50, p95, p99 = cuts[49], cuts[94], cuts[98]
+    else:
+        p50 = p95 = p99 = samples[0]
+    return {
+        'min_ms': round(min(samples) * 1000, 3),
+        'p50_ms': round(p50 * 1000, 3),
+        'p95_ms': round(p95 * 1000, 3),
+        'p99_ms': round(p99 * 1000, 3),
+        'max_ms': round(max(samples) * 1000, 3),
+        'mean_ms': round(statistics.fmean(samples) * 1000, 3),
+    }
+
+
+def run_case(ctx, func, iterations, warmup):
+    """Time one case and measure its peak Python memory in a separate traced run."""
+    for _ in range(warmup):
+        func(ctx)
+
+    samples = []
+    total_rows = 0
+    for _ in range(iterations):
+        start = time.perf_counter()
+        total_rows += func(ctx)
+        samples.append(time.perf_counter() - start)
+
+    # tracemalloc slows allocation down, so it is kept out of the timed runs
+    tracemalloc.start()
+    try:
+        func(ctx)
+        peak = tracemalloc.get_traced_memory()[1]
+    finally:
+        tracemalloc.stop()
+
+    result = percentile_summary(samples)
+    total_time = sum(samples)
+    result.update({
+        'iterations': iterations,
+        'rows': round(total_rows / iterations, 1),
+        'rows_per_sec': round(total_rows / total_time, 1) if total_time else None,
+        'peak_memory_kb': round(peak / 1024, 1),
+    })
+    return result
+
+
+def run_benchmarks(scales, cases=None, iterations=20, warmup=2, seed=42, data_dir=DEFAULT_DATA_DIR):
+    """Run the selected cases against each dataset size and return a JSON-ready report."""
+    cases = cases or list(CASES)
+    results = []
+    for scale in scales:
+        path = ensure_dataset(data_dir, scale, seed)
+        conn = get_connection(database=path)
+        try:
+            # Datasets cached by an older revision may predate the latest migrations
+            migrate(conn)
+            ctx = BenchmarkContext(conn, path, seed=seed)
+            try:
+                for name in cases:
+                    result = run_case(ctx, CASES[name], iterations, warmup)
+                    result.update({'scale': scale, 'case': name})
+                    results.append(result)
+                    print(f"   {scale:<7} {name:<45} p50 {result['p50_ms']:>9.2f} ms  "
+                          f"p95 {result['p95_ms']:>9.2f} ms  {result['rows']:>10} rows")
+            finally:
+                ctx.cleanup()
+        finally:
+            conn.close()
+
+    return {
+        'meta': environment_info(seed, iterations, warmup),
+        'results': results,
+    }
+
+
+def environment_info(seed, iterations, warmup):
+    """Describe the machine and revision the numbers were taken on."""
+    try:
+        revision = subprocess.run(
+            ['git', 'rev-parse', '--short', 'HEAD'], capture_output=True, text=True,
+            cwd=os.path.dirname(os.path.abspath(__file__)), timeout=5
+        ).stdout.strip() or None
+    except (OSError, subprocess.SubprocessError):
+        revision = None
+    return {
+        'timestamp': datetime.now().isoformat(timespec='seconds'),
+        'revision': revision,
+        'python': platform.python_version(),
+        'sqlite': sqlite3.sqlite_version,
+        'platform': platform.platform(),
+        'seed': seed,
+        'iterations': iterations,
+        'warmup': warmup,
+    }
+
+
+def compare_reports(baseline, current, threshold=DEFAULT_THRESHOLD):
+    """Return (scale, case, baseline p95, current p95) for every case that got slower."""
+    previous = {(r['scale'], r['case']): r for r in baseline['results']}
+    regressions = []
+    for result in current['results']:
+        old = previous.get((result['scale'], result['case']))
+        if old and old['p95_ms'] and result['p95_ms'] > old['p95_ms'] * threshold:
+            regressions.append((result['scale'], result['case'], old['p95_ms'], result['p95_ms']))
+    return regressions
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark the list, search and write paths of the frames")
+    parser.add_argument('--scales', nargs='+', choices=SCALES, default=['small'],
+                        help="dataset sizes to run against")
+    parser.add_argument('--cases', nargs='+', choices=CASES, help="only run these cases")
+    parser.add_argument('--iterations', type=int, default=20, help="timed runs per case")
+    parser.add_argument('--warmup', type=int, default=2, help="untimed runs per case")
+    parser.add_argument('--seed', type=int, default=42, help="dataset and workload seed")
+    parser.add_argument('--data-dir', default=DEFAULT_DATA_DIR, help="where generated datasets are cached")
+    parser.add_argument('--output', help="write the JSON report to this file")
+    parser.add_argument('--compare', help="baseline JSON report to check for regressions")
+    parser.add_argument('--threshold', type=float, default=DEFAULT_THRESHOLD,
+                        help="p95 slowdown factor that counts as a regression")
+    args = parser.parse_args(argv)
+
+    report = run_benchmarks(args.scales, args.cases, args.iterations, args.warmup,
+                            args.seed, args.data_dir)
+
+    if args.output:
+        with open(args.output, 'w', encoding='utf-8') as f:
+            json.dump(report, f, indent=2, ensure_ascii=False)
+        print(f"✅ Report written to {args.output}")
+
+    if args.compare:
+        with open(args.compare, encoding='utf-8') as f:
+            baseline = json.load(f)
+        regressions = compare_reports(baseline, report, args.threshold)
+        for scale, case, old, new in regressions:
+            print(f"❌ {scale} {case}: p95 {old:.2f} ms -> {new:.2f} ms")
+        if regressions:
+            return 1
+        print(f"✅ No case slower than {args.threshold}x the baseline p95")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,186 @@
+# -*- coding: utf-8 -*-
+# frontend/autocomplete.py
+from collections import OrderedDict
+from tkinter import ttk
+
+from backend.repositories import PICKER_LIMIT
+from frontend.change_listener import ChangeListener
+
+# Wait this long after the last keystroke before looking candidates up (ms)
+DEBOUNCE_DELAY = 150
+
+# Candidate lists remembered per picker (most recently used prefixes)
+CACHE_SIZE = 64
+
+# Keys that move around the entry or the list rather than change the text
+_NAVIGATION_KEYS = {'Up', 'Down', 'Left', 'Right', 'Home', 'End', 'Tab', 'Escape',
+                    'Return', 'KP_Enter', 'Shift_L', 'Shift_R', 'Control_L', 'Control_R'}
+
+
+def prefix_key(text):
+    """What a lookup is keyed on: the typed text, trimmed and lower-cased."""
+    return (text or '').strip().lower()
+
+
+class AutocompletePicker:
+    """Type-ahead Combobox over a prefix lookup.
+
+    Instead of holding every row of a table, the combobox offers the first
+    `limit` candidates for what has been typed: find(prefix, limit) reads
+    them from a prefix index on the frame's QueryExecutor, debounced, when
+    the picker gets focus and as the user types. Candidate lists are kept
+    for the last CACHE_SIZE prefixes; a list shorter than the limit is
+    complete, so a longer prefix is narrowed from it in memory through
+    keys(record). Change bus events for `entities` clear the cache.
+
+    label(record) is the text shown for a candidate; selected() returns the
+    record behind the current text, or None.
+    """
+
+    def __init__(self, parent, executor, name, find, label, keys, entities,
+                 textvariable=None, placeholder=None, on_select=None,
+                 limit=PICKER_LIMIT, delay=DEBOUNCE_DELAY, cache_size=CACHE_SIZE, **options):
+        self.executor = executor
+        self.name = name
+        self.find = find
+        self.label = label
+        self.keys = keys
+        self.placeholder = placeholder
+        self.on_select = on_select
+        self.limit = limit
+        self.delay = delay
+        self.cache_size = cache_size
+        self.options = {}  # label -> record for the candidates on offer
+
+        self.combobox = ttk.Combobox(parent, textvariable=textvariable,
+                                     postcommand=self._on_post, **options)
+        if placeholder:
+            self.combobox.set(placeholder)
+        self._cache = OrderedDict()  # prefix -> (records, complete)
+        self._generation = 0  # bumped when the cache is cleared
+        self._prefix = None  # prefix of the candidates on offer
+        self._pending = None  # after() id of the debounced lookup
+        self._chosen = None  # (label, record) last picked from the list
+
+        self.combobox.bind('<KeyRelease>', self._on_key)
+        self.combobox.bind('<FocusIn>', self._on_focus)
+        self.combobox.bind('<Return>', self._on_return)
+        self.combobox.bind('<KP_Enter>', self._on_return)
+        self.combobox.bind('<<ComboboxSelected>>', self._on_selected)
+        self.combobox.bind('<Destroy>', self._on_destroy, add='+')
+        self.changes = ChangeListener(self.combobox, entities, lambda events: self.clear_cache())
+
+    def get(self):
+        return self.combobox.get()
+
+    def selected(self):
+        """The record behind the current text, or None."""
+        text = self.combobox.get()
+        if self._chosen and self._chosen[0] == text:
+            return self._chosen[1]
+        return self.options.get(text)
+
+    def clear_cache(self):
+        """Forget remembered candidates, e.g. after the data changed."""
+        self._generation += 1
+        self._cache.clear()
+        self._prefix = None
+
+    def refresh(self):
+        """Look up candidates for the current text now."""
+        if self._pending is not None:
+            self.combobox.after_cancel(self._pending)
+            self._pending = None
+        if self.selected() is not None:
+            return  # a picked label: keep offering the list it came from
+        self._lookup(self._typed())
+
+    def _typed(self):
+        text = self.combobox.get()
+        return '' if text == self.placeholder else prefix_key(text)
+
+    def _on_focus(self, event):
+        if self.placeholder and self.combobox.get() == self.placeholder:
+            self.combobox.set('')
+        self.refresh()
+
+    def _on_post(self):
+        # Opening the list with the arrow: offer what is already known at once
+        self.refresh()
+
+    def _on_key(self, event):
+        if event.keysym in _NAVIGATION_KEYS:
+            return
+        if self._pending is not None:
+            self.combobox.after_cancel(self._pending)
+        self._pending = self.combobox.after(self.delay, self.refresh)
+
+    def _on_return(self, event):
+        # Enter on a single remaining candidate picks it
+        if self.selected() is None and len(self.options) == 1:
+            self.combobox.set(next(iter(self.options)))
+            self._on_selected()
+
+    def _on_selected(self, event=None):
+        text = self.combobox.get()
+        record = self.options.get(text)
+        self._chosen = (text, record) if record else None
+        if self.on_select:
+            self.on_select(record)
+
+    def _on_destroy(self, event):
+        if event.widget is self.combobox:
+            self.executor.cancel(self._request_key())
+
+    def _request_key(self):
+        return f'picker:{self.name}:{id(self)}'
+
+    def _lookup(self, prefix):
+        if prefix == self._prefix:
+            return
+        records = self._cached(prefix)
+        if records is not None:
+            self._show(prefix, records)
+            return
+
+        generation = self._generation
+
+        def found(records):
+            if generation != self._generation or not self.combobox.winfo_exists():
+                return
+            self._remember(prefix, records, len(records) < self.limit)
+            if self._typed() == prefix:
+                self._show(prefix, records)
+
+        self.executor.submit(self._request_key(), self.find, prefix, self.limit,
+                             on_success=found, on_error=self._failed)
+
+    def _cached(self, prefix):
+        """Candidates for prefix from the cache, narrowing a complete shorter list; or None."""
+        entry = self._cache.get(prefix)
+        if entry is not None:
+            self._cache.move_to_end(prefix)
+            return entry[0]
+        for shorter in range(len(prefix) - 1, -1, -1):
+            entry = self._cache.get(prefix[:shorter])
+            if entry is not None and entry[1]:
+                records = [record for record in entry[0]
+                           if any(prefix_key(key).startswith(prefix) for key in self.keys(record))]
+                self._remember(prefix, records, True)
+                return records
+        return None
+
+    def _remember(self, prefix, records, complete):
+        self._cache[prefix] = (records, complete)
+        self._cache.move_to_end(prefix)
+        while len(self._cache) > self.cache_size:
+            self._cache.popitem(last=False)
+
+    def _show(self, prefix, records):
+        self._prefix = prefix
+        labels = [self.label(record) for record in records]
+        self.options = dict(zip(labels, records))
+        self.combobox['values'] = labels
+
+    def _failed(self, error):
+        print(f"❌ Picker lookup failed for {self.name}: {error}")
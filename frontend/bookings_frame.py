@@ -1,16 +1,42 @@
 # -*- coding: utf-8 -*-
+import os
+import queue
+import threading
 import tkinter as tk
-from tkinter import ttk, messagebox
-from backend.database import get_connection
+from tkinter import ttk, messagebox, filedialog
+from frontend.autocomplete import AutocompletePicker
+from frontend.change_listener import ChangeListener
+from frontend.query_executor import POLL_INTERVAL, QueryExecutor
+from frontend.search_controller import SearchController
+from frontend.virtual_tree import QuerySource, VirtualTreeview
+from backend.booking_engine import (BookingEngine, ClassNotOfferedError, FlightFullError,
+                                    FlightNotBookableError, SeatTakenError, parse_seats)
+from backend.booking_import import BookingImporter, write_error_report
+from backend.reference_data import reference_data
+from backend.repositories import BookingRepository, FlightRepository, PassengerRepository
+
+# The manifest import thread, shared by every BookingsFrame so reopening the
+# screen cannot start a second import while one is still running
+_import_thread = None
+
 
 class BookingsFrame(tk.Frame):
     def __init__(self, parent, language_manager):
         super().__init__(parent)
         self.language_manager = language_manager
+        self.bookings = BookingRepository()
+        self.booking_engine = BookingEngine()
+        self.flights = FlightRepository()
+        self.passengers = PassengerRepository()
         self.sort_column = 'booking_date'
         self.sort_direction = 'DESC'
+        self.executor = QueryExecutor(self, on_busy=self.show_loading)
+        self.bind('<Destroy>', lambda e: self.executor.shutdown() if e.widget is self else None)
         self.setup_ui()
         self.load_bookings()
+        self.changes = ChangeListener(
+            self, ('bookings', 'tickets', 'passengers', 'flights', 'airports'), self.on_data_changed
+        )
         
     def setup_ui(self):
       """Create bookings management interface"""
@@ -54,6 +80,13 @@ class BookingsFrame(tk.Frame):
       )
       add_btn.pack(side=tk.LEFT, padx=5)
       
+      import_btn = ttk.Button(
+          button_frame,
+          text=self.language_manager.get_text('import_bookings'),
+          command=self.import_bookings
+      )
+      import_btn.pack(side=tk.LEFT, padx=5)
+      
       # Search frame
       search_frame = tk.Frame(self, bg='white')
       search_frame.pack(fill=tk.X, padx=20, pady=10)
@@ -76,6 +109,20 @@ class BookingsFrame(tk.Frame):
           search_entry.pack(side=tk.LEFT, padx=5)
       search_entry.bind('<KeyRelease>', self.on_search)
       
+      # Shown while a query runs in the background
+      self.loading_label = tk.Label(search_frame, text="", bg='white', fg='gray')
+      if self.language_manager.is_rtl():
+          self.loading_label.pack(side=tk.RIGHT, padx=5)
+      else:
+          self.loading_label.pack(side=tk.LEFT, padx=5)
+      
+      # How long the last search took
+      self.search_info_label = tk.Label(search_frame, text="", bg='white', fg='gray')
+      if self.language_manager.is_rtl():
+          self.search_info_label.pack(side=tk.RIGHT, padx=5)
+      else:
+          self.search_info_label.pack(side=tk.LEFT, padx=5)
+      
       # Bookings table
       table_frame = tk.Frame(self, bg='white')
       table_frame.pack(fill=tk.BOTH, expand=True, padx=20, pady=10)
@@ -122,115 +169,69 @@ class BookingsFrame(tk.Frame):
           self.tree.pack(side=tk.LEFT, fill=tk.BOTH, expand=True)
           scrollbar.pack(side=tk.RIGHT, fill=tk.Y)
       
+      # Only the visible rows are loaded into the tree
+      self.virtual_tree = VirtualTreeview(
+          self.tree, scrollbar,
+          empty_text=self.language_manager.get_text('no_bookings_found'),
+          on_error=lambda e: messagebox.showerror("Database Error", f"Failed to load bookings: {e}"),
+          executor=self.executor
+      )
+      
+      # Search as you type: debounced, and narrowed in memory while the term grows
+      self.search_controller = SearchController(
+          self, self.executor, self.bookings,
+          on_results=self.virtual_tree.set_source,
+          on_clear=self.load_bookings,
+          on_report=self.show_search_info,
+          on_error=lambda e: messagebox.showerror("Search Error", f"Failed to search bookings: {e}")
+      )
+      
       # Bind double-click event
       self.tree.bind('<Double-1>', self.on_booking_select)
       
       # Apply RTL to all widgets (AFTER all widgets are created)
       self.language_manager.apply_rtl_layout(self)
         
+    def show_loading(self, busy):
+      """Show or hide the loading indicator"""
+      self.loading_label.config(text=self.language_manager.get_text('loading') if busy else "")
+        
     def load_bookings(self):
       """Load bookings from database"""
       try:
-          conn = get_connection()
-          cursor = conn.cursor()
-          
-          # Load bookings with related data (FIXED QUERY)
-          cursor.execute("""
-              SELECT 
-                  b.booking_reference,
-                  p.name as passenger_name,
-                  f.flight_number,
-                  o_airport.airport_code || ' → ' || d_airport.airport_code as route,
-                  b.booking_date,
-                  b.seat_count,
-                  b.total_price,
-                  t.status
-              FROM bookings b
-              JOIN tickets t ON b.id = t.booking_id
-              JOIN passengers p ON t.passenger_id = p.id
-              JOIN flights f ON t.flight_id = f.id
-              JOIN airports o_airport ON f.origin_airport_id = o_airport.id
-              JOIN airports d_airport ON f.destination_airport_id = d_airport.id
-              GROUP BY b.id  -- Group to avoid duplicate bookings
-              ORDER BY b.booking_date DESC
-          """)
-          
-          bookings = cursor.fetchall()
-          conn.close()
-          
-          # Clear existing data
-          for item in self.tree.get_children():
-              self.tree.delete(item)
-          
-          # Populate treeview
-          for booking in bookings:
-              booking_values = tuple(booking)
-              self.tree.insert('', tk.END, values=booking_values)
-              
-          # Show message if no bookings
-          if not bookings:
-              self.tree.insert('', tk.END, values=(
-                  self.language_manager.get_text('no_bookings_found'), "", "", "", "", "", "", ""
-              ))
+          self.search_controller.reset()
+          self.search_info_label.config(text="")
+          # Load bookings with related data
+          self.virtual_tree.set_source(
+              QuerySource(self.bookings, sort=self.sort_column, direction=self.sort_direction)
+          )
               
       except Exception as e:
           messagebox.showerror("Database Error", f"Failed to load bookings: {e}")
     
+    def refresh_bookings(self):
+      """Re-read the bookings after a change, keeping the search, scroll position and selection"""
+      self.search_controller.reset()
+      self.virtual_tree.refresh()
+    
+    def on_data_changed(self, events):
+      """Refresh when a change can show up in the bookings list (change bus)"""
+      # A new passenger, flight or airport has no bookings yet
+      if any(event.entity in ('bookings', 'tickets') or event.action != 'insert' for event in events):
+          self.refresh_bookings()
+    
     def on_search(self, event):
       """Handle search functionality"""
-      try:
-          search_term = self.search_var.get().lower().strip()
-          
-          if not search_term:
-              self.load_bookings()
-              return
-              
-          conn = get_connection()
-          cursor = conn.cursor()
-          
-          cursor.execute("""
-              SELECT 
-                  b.booking_reference,
-                  p.name as passenger_name,
-                  f.flight_number,
-                  o_airport.airport_code || ' → ' || d_airport.airport_code as route,
-                  b.booking_date,
-                  b.seat_count,
-                  b.total_price,
-                  t.status
-              FROM bookings b
-              JOIN tickets t ON b.id = t.booking_id
-              JOIN passengers p ON t.passenger_id = p.id
-              JOIN flights f ON t.flight_id = f.id
-              JOIN airports o_airport ON f.origin_airport_id = o_airport.id
-              JOIN airports d_airport ON f.destination_airport_id = d_airport.id
-              WHERE b.booking_reference LIKE ? OR 
-                    p.name LIKE ? OR 
-                    f.flight_number LIKE ? OR
-                    t.status LIKE ?
-              GROUP BY b.id
-              ORDER BY b.booking_date DESC
-          """, (f'%{search_term}%', f'%{search_term}%', f'%{search_term}%', f'%{search_term}%'))
-          
-          bookings = cursor.fetchall()
-          conn.close()
-          
-          # Clear existing data
-          for item in self.tree.get_children():
-              self.tree.delete(item)
-          
-          # Populate treeview
-          for booking in bookings:
-              booking_values = tuple(booking)
-              self.tree.insert('', tk.END, values=booking_values)
-              
-          if not bookings:
-              self.tree.insert('', tk.END, values=(
-                  self.language_manager.get_text('no_bookings_found'), "", "", "", "", "", "", ""
-              ))
-              
-      except Exception as e:
-          messagebox.showerror("Search Error", f"Failed to search bookings: {e}")
+      # Debounced; an empty search box shows all bookings again
+      self.search_controller.search(self.search_var.get())
+    
+    def show_search_info(self, report):
+      """Show how long the last search took"""
+      if report['rows'] is None:
+          text = self.language_manager.get_text('search_time', report['ms'])
+      else:
+          text = self.language_manager.get_text('search_results_time', report['rows'], report['ms'])
+      self.search_info_label.config(text=text)
     
     def on_booking_select(self, event):
         """Handle booking selection (double-click)"""
@@ -312,28 +313,82 @@ class BookingsFrame(tk.Frame):
     def cancel_booking(self, booking_ref, window):
         """Cancel a booking"""
         try:
-            conn = get_connection()
-            cursor = conn.cursor()
-            
-            # Update the tickets status for this booking reference
-            cursor.execute("""
-                UPDATE tickets 
-                SET status = 'cancelled' 
-                WHERE booking_id IN (
-                    SELECT id FROM bookings WHERE booking_reference = ?
-                )
-            """, (booking_ref,))
-            
-            conn.commit()
-            conn.close()
+            # Update the tickets status for this booking reference; the change
+            # bus refreshes the list
+            self.bookings.cancel_booking(booking_ref)
             
             messagebox.showinfo("Success", self.language_manager.get_text('booking_cancelled_success'))
             window.destroy()
-            self.load_bookings()
             
         except Exception as e:
             messagebox.showerror("Error", f"Failed to cancel booking: {e}")
     
+    def import_bookings(self):
+        """Import an agency manifest (CSV, JSON or JSON Lines) in the background
+
+        The import gets a thread of its own rather than the list's query
+        executor: it would hold up every page load and search, and a
+        superseded or shut down request is interrupted, which would stop a
+        half-done import without a word. Leaving the screen does not stop it.
+        """
+        global _import_thread
+        if _import_thread is not None and _import_thread.is_alive():
+            messagebox.showwarning(self.language_manager.get_text('import_bookings'),
+                                   self.language_manager.get_text('import_running'))
+            return
+        path = filedialog.askopenfilename(
+            title=self.language_manager.get_text('import_bookings'),
+            filetypes=[(self.language_manager.get_text('booking_manifests'), '*.csv *.json *.jsonl *.ndjson'),
+                       ('All files', '*.*')]
+        )
+        if not path:
+            return
+        
+        def run():
+            report = BookingImporter().import_file(path)
+            if report['errors']:
+                # Rejected rows are written next to the manifest
+                report['errors_path'] = os.path.splitext(path)[0] + '.errors.csv'
+                write_error_report(report['errors'], report['errors_path'])
+            return report
+        
+        def done(report):
+            message = self.language_manager.get_text(
+                'import_summary', report['tickets'], report['bookings'], report['seconds'])
+            if report['errors']:
+                message += "\n\n" + self.language_manager.get_text(
+                    'import_rejected', report['rejected'], report['errors_path'])
+                messagebox.showwarning(self.language_manager.get_text('import_bookings'), message)
+            else:
+                messagebox.showinfo(self.language_manager.get_text('import_bookings'), message)
+        
+        def failed(error):
+            messagebox.showerror("Import Error", f"Failed to import bookings: {error}")
+        
+        results = queue.Queue()
+        
+        def work():
+            try:
+                results.put((done, run()))
+            except Exception as e:
+                results.put((failed, e))
+        
+        # Polled from the main window, which outlives this frame
+        root = self.winfo_toplevel()
+        
+        def poll():
+            try:
+                callback, value = results.get_nowait()
+            except queue.Empty:
+                root.after(POLL_INTERVAL, poll)
+                return
+            callback(value)
+        
+        # The list refreshes itself from the change bus as chunks commit
+        _import_thread = threading.Thread(target=work, name="booking-import", daemon=True)
+        _import_thread.start()
+        root.after(POLL_INTERVAL, poll)
+    
     def add_booking(self):
         """Open add booking dialog"""
         booking_window = tk.Toplevel(self)
@@ -379,12 +434,6 @@ class BookingsFrame(tk.Frame):
         canvas.create_window((0, 0), window=scrollable_frame, anchor="nw")
         canvas.configure(yscrollcommand=scrollbar.set)
         
-        # Get data for dropdowns
-        passengers = self.get_passengers()
-        flights = self.get_available_flights()
-        classes = self.get_classes()
-        terminals = self.get_terminals()
-        
         self.booking_widgets = {}
         current_row = 0
         
@@ -400,25 +449,75 @@ class BookingsFrame(tk.Frame):
         else:
             passenger_label.grid(row=current_row, column=0, sticky='w', pady=(10, 5))
         
-        passenger_names = [f"{p['passport']} - {p['name']}" for p in passengers]
+        # Type-ahead: candidates are looked up by name or passport prefix
         passenger_var = tk.StringVar()
-        passenger_cb = ttk.Combobox(
+        passenger_picker = AutocompletePicker(
             scrollable_frame,
-            values=passenger_names,
+            self.executor,
+            'passenger',
+            find=self.passengers.find_passengers,
+            label=lambda p: f"{p['passport']} - {p['name']}",
+            keys=lambda p: (p['name'], p['passport']),
+            entities=('passengers',),
             textvariable=passenger_var,
-            state='readonly',
+            placeholder=self.language_manager.get_text('select_passenger'),
             width=40,
             font=('Arial', 10)
         )
+        passenger_cb = passenger_picker.combobox
         if self.language_manager.is_rtl():
             passenger_cb.grid(row=current_row, column=0, sticky='e', pady=(10, 5), padx=(0, 10))
         else:
             passenger_cb.grid(row=current_row, column=1, sticky='w', pady=(10, 5), padx=(10, 0))
-        passenger_cb.set(self.language_manager.get_text('select_passenger'))
         self.booking_widgets['passenger'] = {
             'widget': passenger_cb,
             'var': passenger_var,
-            'data': passengers
+            'picker': passenger_picker
+        }
+        current_row += 1
+        
+        # Group booking: the passengers added here share one booking, one seat each
+        group_label = tk.Label(
+            scrollable_frame,
+            text=self.language_manager.get_text('group_passengers') + ":",
+            font=('Arial', 11, 'bold'),
+            foreground='#2c3e50'
+        )
+        if self.language_manager.is_rtl():
+            group_label.grid(row=current_row, column=1, sticky='ne', pady=5)
+        else:
+            group_label.grid(row=current_row, column=0, sticky='nw', pady=5)
+        
+        group_frame = tk.Frame(scrollable_frame)
+        group_list = tk.Listbox(group_frame, height=4, width=40, font=('Arial', 10))
+        group_list.pack(fill=tk.X)
+        group_buttons = tk.Frame(group_frame)
+        group_buttons.pack(fill=tk.X, pady=(5, 0))
+        ttk.Button(
+            group_buttons,
+            text=self.language_manager.get_text('add_to_group'),
+            command=self.add_group_passenger
+        ).pack(side=tk.RIGHT if self.language_manager.is_rtl() else tk.LEFT, padx=(0, 5))
+        ttk.Button(
+            group_buttons,
+            text=self.language_manager.get_text('remove_from_group'),
+            command=self.remove_group_passenger
+        ).pack(side=tk.RIGHT if self.language_manager.is_rtl() else tk.LEFT)
+        tk.Label(
+            group_frame,
+            text=self.language_manager.get_text('group_booking_helper'),
+            font=('Arial', 8),
+            foreground='#999',
+            wraplength=300,
+            justify=tk.LEFT if not self.language_manager.is_rtl() else tk.RIGHT
+        ).pack(fill=tk.X, pady=(2, 0))
+        if self.language_manager.is_rtl():
+            group_frame.grid(row=current_row, column=0, sticky='e', pady=5, padx=(0, 10))
+        else:
+            group_frame.grid(row=current_row, column=1, sticky='w', pady=5, padx=(10, 0))
+        self.booking_widgets['group'] = {
+            'widget': group_list,
+            'passengers': []
         }
         current_row += 1
         
@@ -434,25 +533,31 @@ class BookingsFrame(tk.Frame):
         else:
             flight_label.grid(row=current_row, column=0, sticky='w', pady=5)
         
-        flight_options = [f"{f['number']} - {f['route']} ({f['date']} {f['time']})" for f in flights]
+        # Type-ahead: scheduled flights are looked up by flight number prefix
         flight_var = tk.StringVar()
-        flight_cb = ttk.Combobox(
+        flight_picker = AutocompletePicker(
             scrollable_frame,
-            values=flight_options,
+            self.executor,
+            'flight',
+            find=self.flights.find_available_flights,
+            label=lambda f: f"{f['number']} - {f['route']} ({f['date']} {f['time']})",
+            keys=lambda f: (f['number'],),
+            entities=('flights', 'airports'),
             textvariable=flight_var,
-            state='readonly',
+            placeholder=self.language_manager.get_text('select_flight'),
+            on_select=lambda flight: self.update_flight_details(),
             width=40,
             font=('Arial', 10)
         )
+        flight_cb = flight_picker.combobox
         if self.language_manager.is_rtl():
             flight_cb.grid(row=current_row, column=0, sticky='e', pady=5, padx=(0, 10))
         else:
             flight_cb.grid(row=current_row, column=1, sticky='w', pady=5, padx=(10, 0))
-        flight_cb.set(self.language_manager.get_text('select_flight'))
         self.booking_widgets['flight'] = {
             'widget': flight_cb,
             'var': flight_var,
-            'data': flights
+            'picker': flight_picker
         }
         
         # Flight details display
@@ -469,9 +574,6 @@ class BookingsFrame(tk.Frame):
         else:
             flight_details.grid(row=current_row + 1, column=1, sticky='w', pady=(2, 10), padx=(10, 0))
         self.booking_widgets['flight_details'] = flight_details
-        
-        # Update flight details when flight is selected
-        flight_cb.bind('<<ComboboxSelected>>', lambda e: self.update_flight_details())
         current_row += 2
         
         # Class Selection
@@ -486,11 +588,10 @@ class BookingsFrame(tk.Frame):
         else:
             class_label.grid(row=current_row, column=0, sticky='w', pady=10)
         
-        class_names = [f"{c['name']} - ${c['price']}" for c in classes]
         class_var = tk.StringVar()
         class_cb = ttk.Combobox(
             scrollable_frame,
-            values=class_names,
+            values=[],
             textvariable=class_var,
             state='readonly',
             width=25,
@@ -504,7 +605,7 @@ class BookingsFrame(tk.Frame):
         self.booking_widgets['class'] = {
             'widget': class_cb,
             'var': class_var,
-            'data': classes
+            'options': {}
         }
         current_row += 1
         
@@ -520,11 +621,10 @@ class BookingsFrame(tk.Frame):
         else:
             terminal_label.grid(row=current_row, column=0, sticky='w', pady=10)
         
-        terminal_names = [f"{t['number']} - {t['name']}" for t in terminals]
         terminal_var = tk.StringVar()
         terminal_cb = ttk.Combobox(
             scrollable_frame,
-            values=terminal_names,
+            values=[],
             textvariable=terminal_var,
             state='readonly',
             width=25,
@@ -538,7 +638,7 @@ class BookingsFrame(tk.Frame):
         self.booking_widgets['terminal'] = {
             'widget': terminal_cb,
             'var': terminal_var,
-            'data': terminals
+            'options': {}
         }
         current_row += 1
         
@@ -688,6 +788,38 @@ class BookingsFrame(tk.Frame):
         
         # Store the window reference
         self.booking_window = booking_window
+        
+        # Fill the dropdowns once the lookups come back
+        self.load_booking_lookups(booking_window)
+    
+    def load_booking_lookups(self, window):
+        """Load the dropdown data for the booking dialog in the background"""
+        widgets = self.booking_widgets
+        
+        # Passengers and flights are not listed up front: their pickers look
+        # candidates up as the user types
+        def lookups():
+            return self.get_classes(), self.get_terminals()
+        
+        def loaded(result):
+            if not window.winfo_exists():
+                return
+            classes, terminals = result
+            options = {
+                'class': (classes, [f"{c['name']} - ${c['price']}" for c in classes]),
+                'terminal': (terminals, [f"{t['number']} - {t['name']}" for t in terminals]),
+            }
+            for name, (data, values) in options.items():
+                # label -> record, so reading a selection is one dict lookup
+                widgets[name]['options'] = dict(zip(values, data))
+                widgets[name]['widget']['values'] = values
+        
+        # Served from the reference data cache once it has been read
+        cached = reference_data.cached('classes', 'terminals')
+        if cached:
+            loaded(cached)
+            return
+        self.executor.submit('booking_lookups', lookups, on_success=loaded)
     
     def center_window(self, window):
         """Center a window on the screen"""
@@ -698,75 +830,10 @@ class BookingsFrame(tk.Frame):
         y = (window.winfo_screenheight() // 2) - (height // 2)
         window.geometry('{}x{}+{}+{}'.format(width, height, x, y))
         
-    def get_passengers(self):
-        """Get list of passengers from database"""
-        try:
-            conn = get_connection()
-            cursor = conn.cursor()
-            cursor.execute("SELECT id, passport_number, name FROM passengers ORDER BY name")
-            passengers = []
-            for row in cursor.fetchall():
-                passengers.append({
-                    'id': row[0],
-                    'passport': row[1],
-                    'name': row[2]
-                })
-            conn.close()
-            return passengers
-        except Exception as e:
-            print(f"Error getting passengers: {e}")
-            return []
-
-    def get_available_flights(self):
-        """Get list of available flights"""
-        try:
-            conn = get_connection()
-            cursor = conn.cursor()
-            cursor.execute("""
-                SELECT 
-                    f.id, f.flight_number, 
-                    o.airport_code, d.airport_code,
-                    f.departure_date, f.departure_time,
-                    f.status
-                FROM flights f
-                JOIN airports o ON f.origin_airport_id = o.id
-                JOIN airports d ON f.destination_airport_id = d.id
-                WHERE f.status = 'scheduled'
-                ORDER BY f.departure_date, f.departure_time
-            """)
-            flights = []
-            for row in cursor.fetchall():
-                flights.append({
-                    'id': row[0],
-                    'number': row[1],
-                    'route': f"{row[2]} → {row[3]}",
-                    'date': row[4],
-                    'time': row[5],
-                    'status': row[6]
-                })
-            conn.close()
-            return flights
-        except Exception as e:
-            print(f"Error getting flights: {e}")
-            return []
-
     def get_classes(self):
         """Get list of available classes with sample prices"""
         try:
-            conn = get_connection()
-            cursor = conn.cursor()
-            cursor.execute("SELECT id, name FROM classes ORDER BY id")
-            classes = []
-            # Sample prices - in real app, these would come from database
-            prices = {'Economy': 450, 'Business': 850, 'First': 1200}
-            for row in cursor.fetchall():
-                classes.append({
-                    'id': row[0],
-                    'name': row[1],
-                    'price': prices.get(row[1], 500)
-                })
-            conn.close()
-            return classes
+            return reference_data.classes()
         except Exception as e:
             print(f"Error getting classes: {e}")
             return []
@@ -774,62 +841,72 @@ class BookingsFrame(tk.Frame):
     def get_terminals(self):
         """Get list of terminals"""
         try:
-            conn = get_connection()
-            cursor = conn.cursor()
-            cursor.execute("SELECT id, number, name FROM terminals ORDER BY number")
-            terminals = []
-            for row in cursor.fetchall():
-                terminals.append({
-                    'id': row[0],
-                    'number': row[1],
-                    'name': row[2] or f"Terminal {row[1]}"
-                })
-            conn.close()
-            return terminals
+            return reference_data.terminals()
         except Exception as e:
             print(f"Error getting terminals: {e}")
             return []
 
     def update_flight_details(self):
         """Update flight details display when flight is selected"""
-        flight_var = self.booking_widgets['flight']['var']
-        flight_data = self.booking_widgets['flight']['data']
-        details_label = self.booking_widgets['flight_details']
-        
-        selected_text = flight_var.get()
-        if selected_text and selected_text != self.language_manager.get_text('select_flight'):
-            # Find the selected flight data
-            for flight in flight_data:
-                flight_option = f"{flight['number']} - {flight['route']} ({flight['date']} {flight['time']})"
-                if flight_option == selected_text:
-                    details_label.config(
-                        text=f"Flight {flight['number']} | {flight['route']} | {flight['date']} {flight['time']} | {flight['status']}",
-                        foreground='#2c3e50'
-                    )
-                    break
+        flight = self.get_selected_flight()
+        if flight:
+            self.booking_widgets['flight_details'].config(
+                text=f"Flight {flight['number']} | {flight['route']} | {flight['date']} {flight['time']} | {flight['status']}",
+                foreground='#2c3e50'
+            )
+
+    def add_group_passenger(self):
+        """Add the picked passenger to the group booking"""
+        passenger = self.get_selected_passenger()
+        group = self.booking_widgets['group']
+        validation_msg = self.booking_widgets['validation']
+        if not passenger:
+            validation_msg.config(text=self.language_manager.get_text('select_passenger_validation'))
+            return
+        if any(member['id'] == passenger['id'] for member in group['passengers']):
+            validation_msg.config(text=self.language_manager.get_text('passenger_in_group'))
+            return
+        validation_msg.config(text="")
+        group['passengers'].append(passenger)
+        group['widget'].insert(tk.END, f"{passenger['passport']} - {passenger['name']}")
+        self.booking_widgets['passenger']['picker'].combobox.set('')
+        self.update_group_seats()
+
+    def remove_group_passenger(self):
+        """Drop the highlighted passengers from the group booking"""
+        group = self.booking_widgets['group']
+        for index in reversed(group['widget'].curselection()):
+            group['widget'].delete(index)
+            del group['passengers'][index]
+        self.update_group_seats()
+
+    def update_group_seats(self):
+        """A group booking has one seat per passenger"""
+        count = len(self.booking_widgets['group']['passengers'])
+        seats = self.booking_widgets['seats_count']
+        if count:
+            seats['var'].set(str(count))
+            seats['widget'].config(state='disabled')
+        else:
+            seats['widget'].config(state='normal')
+        self.calculate_price()
 
     def calculate_price(self):
         """Calculate and display total price"""
-        class_var = self.booking_widgets['class']['var']
         seats_var = self.booking_widgets['seats_count']['var']
         price_display = self.booking_widgets['price_display']
-        class_data = self.booking_widgets['class']['data']
         
         try:
-            class_text = class_var.get()
+            cls = self.get_selected_class()
             seats = int(seats_var.get())
             
-            if class_text and class_text != self.language_manager.get_text('select_class'):
-                # Extract price from class text "Business - $850"
-                for cls in class_data:
-                    class_option = f"{cls['name']} - ${cls['price']}"
-                    if class_option == class_text:
-                        total_price = cls['price'] * seats
-                        price_display.config(
-                            text=f"${cls['price']} × {seats} {self.language_manager.get_text('seat_s')} = ${total_price}",
-                            foreground='#27ae60'
-                        )
-                        return
+            if cls:
+                total_price = cls['price'] * seats
+                price_display.config(
+                    text=f"${cls['price']} × {seats} {self.language_manager.get_text('seat_s')} = ${total_price}",
+                    foreground='#27ae60'
+                )
+                return
             
             price_display.config(
                 text=self.language_manager.get_text('select_class_seats_for_price'),
@@ -849,16 +926,21 @@ class BookingsFrame(tk.Frame):
             flight_data = self.get_selected_flight()
             class_data = self.get_selected_class()
             terminal_data = self.get_selected_terminal()
-            seat_number = self.booking_widgets['seat']['var'].get().strip().upper()
+            seat_numbers = parse_seats(self.booking_widgets['seat']['var'].get())
             seats_count = int(self.booking_widgets['seats_count']['var'].get())
+            group = self.booking_widgets['group']['passengers']
             
             # Validate all fields
             validation_msg = self.booking_widgets['validation']
             
-            if not passenger_data:
+            if not passenger_data and not group:
                 validation_msg.config(text=self.language_manager.get_text('select_passenger_validation'))
                 return
-                
+
+            if group and passenger_data and not any(member['id'] == passenger_data['id'] for member in group):
+                # Picked but never added: book them with the group rather than leave them out
+                self.add_group_passenger()
+
             if not flight_data:
                 validation_msg.config(text=self.language_manager.get_text('select_flight_validation'))
                 return
@@ -871,7 +953,21 @@ class BookingsFrame(tk.Frame):
                 validation_msg.config(text=self.language_manager.get_text('select_terminal_validation'))
                 return
                 
-            if not seat_number:
+            if group:
+                # Seats are optional: without them the engine seats the group together
+                if seat_numbers and (len(seat_numbers) != len(group)
+                                     or len(set(seat_numbers)) != len(group)):
+                    validation_msg.config(text=self.language_manager.get_text('seat_numbers_per_passenger'))
+                    return
+                result = self.booking_engine.book_group(
+                    flight_data['id'], [member['id'] for member in group], class_data['id'],
+                    terminal_data['id'], class_data['price'], seat_numbers
+                )
+                self.show_booking_created(result)
+                window.destroy()
+                return
+                
+            if not seat_numbers:
                 validation_msg.config(text=self.language_manager.get_text('enter_seat_number'))
                 return
                 
@@ -879,100 +975,62 @@ class BookingsFrame(tk.Frame):
                 validation_msg.config(text=self.language_manager.get_text('invalid_seat_count'))
                 return
             
-            # Calculate total price
-            total_price = class_data['price'] * seats_count
-            
-            # Generate booking reference and ticket number
-            import random
-            booking_ref = f"BRN{random.randint(1000, 9999)}"
-            ticket_number = f"TKT{random.randint(10000, 99999)}"
-            
-            # Save to database
-            conn = get_connection()
-            cursor = conn.cursor()
-            
-            # Create booking
-            cursor.execute("""
-                INSERT INTO bookings 
-                (user_id, flight_id, seat_count, booking_date, total_price, booking_reference)
-                VALUES (?, ?, ?, date('now'), ?, ?)
-            """, (1, flight_data['id'], seats_count, total_price, booking_ref))
-            
-            booking_id = cursor.lastrowid
-            
-            # Create ticket
-            cursor.execute("""
-                INSERT INTO tickets 
-                (ticket_number, passenger_id, flight_id, booking_id, class_id, terminal_id, seat_number, price, status)
-                VALUES (?, ?, ?, ?, ?, ?, ?, ?, 'confirmed')
-            """, (ticket_number, passenger_data['id'], flight_data['id'], booking_id, 
-                class_data['id'], terminal_data['id'], seat_number, class_data['price']))
-            
-            conn.commit()
-            conn.close()
+            # One seat number per seat: "15A, 15B"
+            if len(seat_numbers) != seats_count or len(set(seat_numbers)) != seats_count:
+                validation_msg.config(text=self.language_manager.get_text('seat_numbers_per_seat'))
+                return
             
-            messagebox.showinfo(
-                "Success", 
-                f"{self.language_manager.get_text('booking_created_success')}\n\n"
-                f"{self.language_manager.get_text('booking_reference')}: {booking_ref}\n"
-                f"{self.language_manager.get_text('ticket_number')}: {ticket_number}\n"
-                f"{self.language_manager.get_text('total')}: ${total_price}"
+            # Booking and tickets are written in one locked transaction that
+            # checks capacity and seats; the change bus refreshes the list
+            result = self.booking_engine.book(
+                flight_data['id'], passenger_data['id'], class_data['id'], terminal_data['id'],
+                seat_numbers, class_data['price']
             )
             
+            self.show_booking_created(result)
             window.destroy()
-            self.load_bookings()  # Refresh the bookings list
             
+        except SeatTakenError as e:
+            validation_msg.config(text=self.language_manager.get_text('seat_taken', ', '.join(e.seats)))
+        except FlightFullError as e:
+            validation_msg.config(text=self.language_manager.get_text('flight_full', e.available))
+        except ClassNotOfferedError:
+            validation_msg.config(text=self.language_manager.get_text('class_not_offered'))
+        except FlightNotBookableError:
+            validation_msg.config(text=self.language_manager.get_text('flight_not_bookable'))
         except Exception as e:
             messagebox.showerror("Error", f"Failed to create booking: {e}")
 
+    def show_booking_created(self, result):
+        """Confirm a new booking with its reference, tickets and seats"""
+        messagebox.showinfo(
+            "Success", 
+            f"{self.language_manager.get_text('booking_created_success')}\n\n"
+            f"{self.language_manager.get_text('booking_reference')}: {result.booking_reference}\n"
+            f"{self.language_manager.get_text('ticket_number')}: {', '.join(result.ticket_numbers)}\n"
+            f"{self.language_manager.get_text('seat_number')}: {', '.join(result.seat_numbers)}\n"
+            f"{self.language_manager.get_text('total')}: ${result.total_price}"
+        )
+
+    def get_selected_option(self, name):
+        """The record behind the label chosen in a booking dialog combobox, or None"""
+        widget = self.booking_widgets[name]
+        if 'picker' in widget:
+            return widget['picker'].selected()
+        return widget['options'].get(widget['var'].get())
+
     def get_selected_passenger(self):
         """Get the selected passenger data"""
-        passenger_var = self.booking_widgets['passenger']['var']
-        passenger_data = self.booking_widgets['passenger']['data']
-        
-        selected_text = passenger_var.get()
-        if selected_text and selected_text != self.language_manager.get_text('select_passenger'):
-            for passenger in passenger_data:
-                passenger_option = f"{passenger['passport']} - {passenger['name']}"
-                if passenger_option == selected_text:
-                    return passenger
-        return None
+        return self.get_selected_option('passenger')
 
     def get_selected_flight(self):
         """Get the selected flight data"""
-        flight_var = self.booking_widgets['flight']['var']
-        flight_data = self.booking_widgets['flight']['data']
-        
-        selected_text = flight_var.get()
-        if selected_text and selected_text != self.language_manager.get_text('select_flight'):
-            for flight in flight_data:
-                flight_option = f"{flight['number']} - {flight['route']} ({flight['date']} {flight['time']})"
-                if flight_option == selected_text:
-                    return flight
-        return None
+        return self.get_selected_option('flight')
 
     def get_selected_class(self):
         """Get the selected class data"""
-        class_var = self.booking_widgets['class']['var']
-        class_data = self.booking_widgets['class']['data']
-        
-        selected_text = class_var.get()
-        if selected_text and selected_text != self.language_manager.get_text('select_class'):
-            for cls in class_data:
-                class_option = f"{cls['name']} - ${cls['price']}"
-                if class_option == selected_text:
-                    return cls
-        return None
+        return self.get_selected_option('class')
 
     def get_selected_terminal(self):
         """Get the selected terminal data"""
-        terminal_var = self.booking_widgets['terminal']['var']
-        terminal_data = self.booking_widgets['terminal']['data']
-        
-        selected_text = terminal_var.get()
-        if selected_text and selected_text != self.language_manager.get_text('select_terminal'):
-            for terminal in terminal_data:
-                terminal_option = f"{terminal['number']} - {terminal['name']}"
-                if terminal_option == selected_text:
-                    return terminal
-        return None
\ No newline at end of file
+        return self.get_selected_option('terminal')
\ No newline at end of file
@@ -0,0 +1,69 @@
+# -*- coding: utf-8 -*-
+# frontend/change_listener.py
+import threading
+
+from backend.change_bus import change_bus
+
+# How often changes published by other threads are picked up (ms)
+POLL_INTERVAL = 200
+
+
+class ChangeListener:
+    """Delivers change bus events to a widget on the Tk thread, batched.
+
+    Events published on the Tk thread are handed over once the current
+    callback has finished (after_idle), so a write that touches several
+    tables causes a single on_change(events) call. Events from other threads
+    are queued and picked up by an after() poll. The subscription ends when
+    the widget is destroyed.
+    """
+
+    def __init__(self, widget, entities, on_change, bus=change_bus):
+        self.widget = widget
+        self.on_change = on_change
+        self.bus = bus
+        self._tk_thread = threading.get_ident()
+        self._lock = threading.Lock()
+        self._pending = []
+        self._flush_scheduled = False
+        self._closed = False
+        self._token = bus.subscribe(self._received, entities)
+        self._poll_id = widget.after(POLL_INTERVAL, self._poll)
+        widget.bind('<Destroy>', self._on_destroy, add='+')
+
+    def close(self):
+        """Stop listening."""
+        if self._closed:
+            return
+        self._closed = True
+        self.bus.unsubscribe(self._token)
+        try:
+            self.widget.after_cancel(self._poll_id)
+        except Exception:
+            pass  # the interpreter may already be gone
+
+    def _received(self, event):
+        with self._lock:
+            self._pending.append(event)
+            schedule = threading.get_ident() == self._tk_thread and not self._flush_scheduled
+            if schedule:
+                self._flush_scheduled = True
+        if schedule and not self._closed:
+            self.widget.after_idle(self._flush)
+
+    def _poll(self):
+        if self._closed:
+            return
+        self._flush()
+        self._poll_id = self.widget.after(POLL_INTERVAL, self._poll)
+
+    def _flush(self):
+        with self._lock:
+            events, self._pending = self._pending, []
+            self._flush_scheduled = False
+        if events and not self._closed:
+            self.on_change(events)
+
+    def _on_destroy(self, event):
+        if event.widget is self.widget:
+            self.close()
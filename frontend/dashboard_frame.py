@@ -301,98 +301,10 @@ class DashboardFrame(tk.Frame):
     def show_dashboard_content(self):
         """Display dashboard content"""
         self.clear_content()
-        
-        # Dashboard title
-        title = tk.Label(
-            self.content_frame,
-            text=self.language_manager.get_text('dashboard') + " Overview",
-            font=('Arial', 18, 'bold'),
-            bg='white',
-            fg='#2c3e50',
-            anchor='w' if not self.language_manager.is_rtl() else 'e'
-        )
-        title.pack(pady=20)
-        
-        # Stats cards
-        stats_frame = tk.Frame(self.content_frame, bg='white')
-        stats_frame.pack(pady=10, padx=20, fill=tk.X)
-        
-        stats_data = [
-            (self.language_manager.get_text('flights'), "24", "#3498db"),
-            (self.language_manager.get_text('bookings'), "156", "#2ecc71"),
-            (self.language_manager.get_text('today_passengers'), "42", "#e74c3c"),
-            (self.language_manager.get_text('revenue'), "$12,450", "#f39c12")
-        ]
-        
-        for i, (label, value, color) in enumerate(stats_data):
-            card = tk.Frame(
-                stats_frame,
-                bg=color,
-                relief='raised',
-                bd=1,
-                width=150,
-                height=100
-            )
-            if self.language_manager.is_rtl():
-                card.pack(side=tk.RIGHT, padx=10, pady=10)
-            else:
-                card.pack(side=tk.LEFT, padx=10, pady=10)
-            card.pack_propagate(False)
-            
-            # Value
-            value_label = tk.Label(
-                card,
-                text=value,
-                font=('Arial', 20, 'bold'),
-                bg=color,
-                fg='white'
-            )
-            value_label.pack(expand=True)
-            
-            # Label
-            label_label = tk.Label(
-                card,
-                text=label,
-                font=('Arial', 10),
-                bg=color,
-                fg='white'
-            )
-            label_label.pack(pady=(0, 10))
-        
-        # Recent activity section
-        activity_frame = tk.Frame(self.content_frame, bg='white')
-        activity_frame.pack(pady=20, padx=20, fill=tk.BOTH, expand=True)
-        
-        activity_label = tk.Label(
-            activity_frame,
-            text=self.language_manager.get_text('recent_activity'),
-            font=('Arial', 14, 'bold'),
-            bg='white',
-            fg='#2c3e50',
-            anchor='w' if not self.language_manager.is_rtl() else 'e'
-        )
-        activity_label.pack(fill=tk.X, pady=(0, 10))
-        
-        # Sample activity list
-        activities = [
-            "New booking AK202 - Dubai to Riyadh",
-            "Flight AK101 departed on time",
-            "New passenger registered",
-            "Payment received for booking #AK789",
-            "Flight schedule updated"
-        ]
-        
-        for activity in activities:
-            activity_item = tk.Label(
-                activity_frame,
-                text=f"• {activity}",
-                font=('Arial', 10),
-                bg='white',
-                fg='#7f8c8d',
-                anchor='w' if not self.language_manager.is_rtl() else 'e',
-                justify='left' if not self.language_manager.is_rtl() else 'right'
-            )
-            activity_item.pack(fill=tk.X, pady=2)
+
+        from frontend.dashboard_overview import DashboardOverview
+        overview = DashboardOverview(self.content_frame, self.language_manager)
+        overview.pack(fill=tk.BOTH, expand=True)
     
     def show_dashboard(self):
         """Show dashboard view"""
@@ -428,32 +340,10 @@ class DashboardFrame(tk.Frame):
     def show_reports(self):
         """Show reports view"""
         self.clear_content()
-        
-        title = tk.Label(
-            self.content_frame,
-            text=self.language_manager.get_text('reports') + " & Analytics",
-            font=('Arial', 18, 'bold'),
-            bg='white',
-            fg='#2c3e50',
-            anchor='w' if not self.language_manager.is_rtl() else 'e'
-        )
-        title.pack(pady=20)
-        
-        # Placeholder for reports content
-        placeholder = tk.Label(
-            self.content_frame,
-            text="Reports and analytics will be implemented here\n\n"
-                 "Features:\n"
-                 "• Revenue reports\n"
-                 "• Flight performance\n"
-                 "• Passenger statistics\n"
-                 "• Booking trends",
-            font=('Arial', 12),
-            bg='white',
-            fg='#7f8c8d',
-            justify='left' if not self.language_manager.is_rtl() else 'right'
-        )
-        placeholder.pack(expand=True)
+
+        from frontend.reports import ReportsFrame
+        reports_frame = ReportsFrame(self.content_frame, self.language_manager)
+        reports_frame.pack(fill=tk.BOTH, expand=True)
     
     def clear_content(self):
         """Clear the content area"""
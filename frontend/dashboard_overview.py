@@ -0,0 +1,165 @@
+# -*- coding: utf-8 -*-
+# frontend/dashboard_overview.py
+import time
+import tkinter as tk
+
+from backend.repositories import DashboardRepository
+from frontend.change_listener import ChangeListener
+from frontend.query_executor import QueryExecutor
+
+# Re-read the figures at least this often (ms), e.g. to roll over at midnight
+REFRESH_INTERVAL = 30_000
+
+# Bookings listed under Recent Activity
+RECENT_BOOKINGS = 5
+
+# (metric, translation key, card colour)
+CARDS = [
+    ('flights', 'flights_today', '#3498db'),
+    ('bookings', 'bookings_today', '#2ecc71'),
+    ('passengers', 'today_passengers', '#e74c3c'),
+    ('revenue', 'revenue_today', '#f39c12'),
+]
+
+
+class DashboardOverview(tk.Frame):
+    """Today's flights, bookings, passengers and revenue, plus the latest bookings.
+
+    The figures are read from the trigger-maintained daily counters, so a
+    refresh costs a few primary key reads however large the tables grow. It
+    runs on a timer and whenever the change bus reports flights, bookings or
+    tickets written here or on another workstation.
+    """
+
+    def __init__(self, parent, language_manager):
+        super().__init__(parent, bg='white')
+        self.language_manager = language_manager
+        self.dashboard = DashboardRepository()
+        self.stats = None
+        self.recent = None
+        self.executor = QueryExecutor(self)
+        self._timer = None
+        self.setup_ui()
+        self.bind('<Destroy>', self._on_destroy, add='+')
+        self.changes = ChangeListener(self, ('flights', 'bookings', 'tickets'),
+                                      lambda events: self.refresh())
+        self.refresh()
+
+    def setup_ui(self):
+        """Create the title, stat cards and activity list"""
+        rtl = self.language_manager.is_rtl()
+        self.title = tk.Label(
+            self,
+            font=('Arial', 18, 'bold'),
+            bg='white',
+            fg='#2c3e50',
+            anchor='w' if not rtl else 'e'
+        )
+        self.title.pack(pady=20)
+
+        # Stats cards
+        stats_frame = tk.Frame(self, bg='white')
+        stats_frame.pack(pady=10, padx=20, fill=tk.X)
+
+        self.cards = {}  # metric -> (value label, caption label)
+        for metric, key, color in CARDS:
+            card = tk.Frame(
+                stats_frame,
+                bg=color,
+                relief='raised',
+                bd=1,
+                width=150,
+                height=100
+            )
+            card.pack(side=tk.RIGHT if rtl else tk.LEFT, padx=10, pady=10)
+            card.pack_propagate(False)
+
+            value_label = tk.Label(card, text="…", font=('Arial', 20, 'bold'), bg=color, fg='white')
+            value_label.pack(expand=True)
+            caption = tk.Label(card, font=('Arial', 10), bg=color, fg='white')
+            caption.pack(pady=(0, 10))
+            self.cards[metric] = (value_label, caption)
+
+        # Recent activity section
+        self.activity_frame = tk.Frame(self, bg='white')
+        self.activity_frame.pack(pady=20, padx=20, fill=tk.BOTH, expand=True)
+
+        self.activity_label = tk.Label(
+            self.activity_frame,
+            font=('Arial', 14, 'bold'),
+            bg='white',
+            fg='#2c3e50',
+            anchor='w' if not rtl else 'e'
+        )
+        self.activity_label.pack(fill=tk.X, pady=(0, 10))
+        self.activity_items = []
+
+        self.updated_label = tk.Label(self, font=('Arial', 8), bg='white', fg='#999',
+                                      anchor='w' if not rtl else 'e')
+        self.updated_label.pack(fill=tk.X, padx=20, pady=(0, 10))
+
+        self.update_language()
+
+    def update_language(self):
+        """Re-apply texts after a language change"""
+        self.title.config(text=self.language_manager.get_text('dashboard') + " Overview")
+        self.activity_label.config(text=self.language_manager.get_text('recent_activity'))
+        for metric, key, _ in CARDS:
+            self.cards[metric][1].config(text=self.language_manager.get_text(key))
+        self.show_stats()
+
+    def refresh(self):
+        """Read the figures in the background; the latest request wins"""
+        if self._timer is not None:
+            self.after_cancel(self._timer)
+        self._timer = self.after(REFRESH_INTERVAL, self.refresh)
+
+        def read():
+            return self.dashboard.day_stats(), self.dashboard.recent_bookings(RECENT_BOOKINGS)
+
+        def loaded(result):
+            self.stats, self.recent = result
+            self.updated_at = time.strftime('%H:%M:%S')
+            self.show_stats()
+
+        self.executor.submit('dashboard', read, on_success=loaded,
+                             on_error=lambda e: print(f"❌ Failed to load dashboard figures: {e}"))
+
+    def show_stats(self):
+        """Fill the cards and the activity list from the last read"""
+        if self.stats is None:
+            return
+        for metric, _, _ in CARDS:
+            value = self.stats[metric]
+            text = f"${value:,.0f}" if metric == 'revenue' else f"{int(value):,}"
+            self.cards[metric][0].config(text=text)
+
+        rtl = self.language_manager.is_rtl()
+        for item in self.activity_items:
+            item.destroy()
+        lines = [self.language_manager.get_text('recent_booking_item', row.booking_reference,
+                                                row.flight_number, row.route, row.seat_count,
+                                                row.total_price or 0)
+                 for row in self.recent]
+        self.activity_items = [
+            tk.Label(
+                self.activity_frame,
+                text=f"• {line}",
+                font=('Arial', 10),
+                bg='white',
+                fg='#7f8c8d',
+                anchor='w' if not rtl else 'e',
+                justify='left' if not rtl else 'right'
+            )
+            for line in lines or [self.language_manager.get_text('no_recent_activity')]
+        ]
+        for item in self.activity_items:
+            item.pack(fill=tk.X, pady=2)
+        self.updated_label.config(text=self.language_manager.get_text('updated_at', self.updated_at))
+
+    def _on_destroy(self, event):
+        if event.widget is self:
+            if self._timer is not None:
+                self.after_cancel(self._timer)
+                self._timer = None
+            self.executor.shutdown()
@@ -2,9 +2,14 @@
 import tkinter as tk
 from tkinter import messagebox, ttk
 
+from frontend.change_listener import ChangeListener
+from frontend.query_executor import QueryExecutor
+from frontend.search_controller import SearchController
+from frontend.virtual_tree import QuerySource, VirtualTreeview
 from frontend.window_utils import set_window_icon
 
-from backend.database import get_connection
+from backend.reference_data import reference_data
+from backend.repositories import FlightRepository
 
 # Try to import tkcalendar, with fallback
 try:
@@ -18,10 +23,15 @@ class FlightsFrame(tk.Frame):
     def __init__(self, parent, language_manager):
         super().__init__(parent)
         self.language_manager = language_manager
+        self.flights = FlightRepository()
         self.sort_column = 'flight_number'  # Default sort column
         self.sort_direction = 'ASC'  # Default sort direction
+        self.executor = QueryExecutor(self, on_busy=self.show_loading)
+        self.bind('<Destroy>', lambda e: self.executor.shutdown() if e.widget is self else None)
         self.setup_ui()
         self.load_flights()
+        # Airport names are shown in the list
+        self.changes = ChangeListener(self, ('flights', 'airports'), self.on_data_changed)
         
     def setup_ui(self):
         """Create flights management interface"""
@@ -87,6 +97,20 @@ class FlightsFrame(tk.Frame):
             search_entry.pack(side=tk.LEFT, padx=5)
         search_entry.bind('<KeyRelease>', self.on_search)
         
+        # Shown while a query runs in the background
+        self.loading_label = tk.Label(search_frame, text="", bg='white', fg='gray')
+        if self.language_manager.is_rtl():
+            self.loading_label.pack(side=tk.RIGHT, padx=5)
+        else:
+            self.loading_label.pack(side=tk.LEFT, padx=5)
+        
+        # How long the last search took
+        self.search_info_label = tk.Label(search_frame, text="", bg='white', fg='gray')
+        if self.language_manager.is_rtl():
+            self.search_info_label.pack(side=tk.RIGHT, padx=5)
+        else:
+            self.search_info_label.pack(side=tk.LEFT, padx=5)
+        
         # Flights table
         table_frame = tk.Frame(self, bg='white')
         table_frame.pack(fill=tk.BOTH, expand=True, padx=20, pady=10)
@@ -103,13 +127,13 @@ class FlightsFrame(tk.Frame):
         )
         
         # Define headings with sort indicators
-        self.tree.heading('flight_id', text='ID', command=lambda: self.sort_treeview('f.id'))
-        self.tree.heading('flight_number', text=self.language_manager.get_text('flight_number'), command=lambda: self.sort_treeview('f.flight_number'))
-        self.tree.heading('origin', text=self.language_manager.get_text('origin'), command=lambda: self.sort_treeview('o_airport.name'))
-        self.tree.heading('destination', text=self.language_manager.get_text('destination'), command=lambda: self.sort_treeview('d_airport.name'))
-        self.tree.heading('departure', text=self.language_manager.get_text('departure'), command=lambda: self.sort_treeview('f.departure_date'))
-        self.tree.heading('arrival', text=self.language_manager.get_text('arrival'), command=lambda: self.sort_treeview('f.arrival_date'))
-        self.tree.heading('status', text=self.language_manager.get_text('status'), command=lambda: self.sort_treeview('f.status'))
+        self.tree.heading('flight_id', text='ID', command=lambda: self.sort_treeview('flight_id'))
+        self.tree.heading('flight_number', text=self.language_manager.get_text('flight_number'), command=lambda: self.sort_treeview('flight_number'))
+        self.tree.heading('origin', text=self.language_manager.get_text('origin'), command=lambda: self.sort_treeview('origin'))
+        self.tree.heading('destination', text=self.language_manager.get_text('destination'), command=lambda: self.sort_treeview('destination'))
+        self.tree.heading('departure', text=self.language_manager.get_text('departure'), command=lambda: self.sort_treeview('departure'))
+        self.tree.heading('arrival', text=self.language_manager.get_text('arrival'), command=lambda: self.sort_treeview('arrival'))
+        self.tree.heading('status', text=self.language_manager.get_text('status'), command=lambda: self.sort_treeview('status'))
         
         # Configure columns
         self.tree.column('flight_id', width=50)
@@ -131,6 +155,23 @@ class FlightsFrame(tk.Frame):
             self.tree.pack(side=tk.LEFT, fill=tk.BOTH, expand=True)
             scrollbar.pack(side=tk.RIGHT, fill=tk.Y)
         
+        # Only the visible rows are loaded into the tree
+        self.virtual_tree = VirtualTreeview(
+            self.tree, scrollbar,
+            empty_text=self.language_manager.get_text('no_flights_found'),
+            on_error=lambda e: messagebox.showerror("Database Error", f"Failed to load flights: {e}"),
+            executor=self.executor
+        )
+        
+        # Search as you type: debounced, and narrowed in memory while the term grows
+        self.search_controller = SearchController(
+            self, self.executor, self.flights,
+            on_results=self.virtual_tree.set_source,
+            on_clear=self.load_flights, sort=self.sort_column, direction=self.sort_direction,
+            on_report=self.show_search_info,
+            on_error=lambda e: messagebox.showerror("Search Error", f"Failed to search flights: {e}")
+        )
+        
         # Bind double-click event
         self.tree.bind('<Double-1>', self.on_flight_select)
         
@@ -140,6 +181,10 @@ class FlightsFrame(tk.Frame):
         # Update sort indicator on initial load
         self.update_sort_indicator()
         
+    def show_loading(self, busy):
+        """Show or hide the loading indicator"""
+        self.loading_label.config(text=self.language_manager.get_text('loading') if busy else "")
+        
     def apply_rtl_layout(self):
         """Apply RTL specific layout changes - Now called after UI setup"""
         # This method is kept for backward compatibility but the actual RTL
@@ -156,9 +201,16 @@ class FlightsFrame(tk.Frame):
             self.sort_column = column
             self.sort_direction = 'ASC'
         
-        # Update the sort indicator and reload data
+        # Update the sort indicator, then re-sort the loaded rows in memory when
+        # they are the whole result, or re-run the current query in the new order
         self.update_sort_indicator()
-        self.load_flights()
+        key = self.flights.row_sort_key(self.sort_column)
+        self.search_controller.set_sort(self.sort_column, self.sort_direction, key)
+        try:
+            if not self.virtual_tree.resort(self.sort_column, self.sort_direction, key):
+                self.load_flights()
+        except Exception as e:
+            messagebox.showerror("Database Error", f"Failed to load flights: {e}")
         
     def update_sort_indicator(self):
         """Update column headers to show sort direction"""
@@ -169,131 +221,44 @@ class FlightsFrame(tk.Frame):
             clean_text = current_text.replace(' ▲', '').replace(' ▼', '')
             self.tree.heading(col, text=clean_text)
         
-        # Add arrow to current sort column
-        if self.sort_column == 'f.id':
-            current_text = self.tree.heading('flight_id')['text']
-            arrow = ' ▲' if self.sort_direction == 'ASC' else ' ▼'
-            self.tree.heading('flight_id', text=current_text + arrow)
-        elif self.sort_column == 'f.flight_number':
-            current_text = self.tree.heading('flight_number')['text']
+        # Add arrow to current sort column (sort keys are the column names)
+        if self.sort_column in self.tree['columns']:
+            current_text = self.tree.heading(self.sort_column)['text']
             arrow = ' ▲' if self.sort_direction == 'ASC' else ' ▼'
-            self.tree.heading('flight_number', text=current_text + arrow)
-        elif self.sort_column == 'o_airport.name':
-            current_text = self.tree.heading('origin')['text']
-            arrow = ' ▲' if self.sort_direction == 'ASC' else ' ▼'
-            self.tree.heading('origin', text=current_text + arrow)
-        elif self.sort_column == 'd_airport.name':
-            current_text = self.tree.heading('destination')['text']
-            arrow = ' ▲' if self.sort_direction == 'ASC' else ' ▼'
-            self.tree.heading('destination', text=current_text + arrow)
-        elif self.sort_column == 'f.departure_date':
-            current_text = self.tree.heading('departure')['text']
-            arrow = ' ▲' if self.sort_direction == 'ASC' else ' ▼'
-            self.tree.heading('departure', text=current_text + arrow)
-        elif self.sort_column == 'f.arrival_date':
-            current_text = self.tree.heading('arrival')['text']
-            arrow = ' ▲' if self.sort_direction == 'ASC' else ' ▼'
-            self.tree.heading('arrival', text=current_text + arrow)
-        elif self.sort_column == 'f.status':
-            current_text = self.tree.heading('status')['text']
-            arrow = ' ▲' if self.sort_direction == 'ASC' else ' ▼'
-            self.tree.heading('status', text=current_text + arrow)
+            self.tree.heading(self.sort_column, text=current_text + arrow)
         
     def load_flights(self):
         """Load flights from database with current sort"""
         try:
-            conn = get_connection()
-            cursor = conn.cursor()
-            
-            # Build the query with sorting
-            query = """
-                SELECT 
-                    f.id, 
-                    f.flight_number, 
-                    o_airport.name as origin, 
-                    d_airport.name as destination,
-                    f.departure_date || ' ' || f.departure_time as departure,
-                    f.arrival_date || ' ' || f.arrival_time as arrival,
-                    f.status
-                FROM flights f
-                LEFT JOIN airports o_airport ON f.origin_airport_id = o_airport.id
-                LEFT JOIN airports d_airport ON f.destination_airport_id = d_airport.id
-                ORDER BY {} {}
-            """.format(self.sort_column, self.sort_direction)
-            
-            cursor.execute(query)
-            flights = cursor.fetchall()
-            conn.close()
-            
-            # Clear existing data
-            for item in self.tree.get_children():
-                self.tree.delete(item)
-            
-            # Populate treeview - convert sqlite3.Row to tuple
-            for flight in flights:
-                flight_values = tuple(flight)
-                self.tree.insert('', tk.END, values=flight_values)
-                
-            # Show message if no flights
-            if not flights:
-                no_flights_text = self.language_manager.get_text('no_flights_found')
-                self.tree.insert('', tk.END, values=(no_flights_text, "", "", "", "", "", ""))
-                
+            self.search_controller.reset()
+            self.search_info_label.config(text="")
+            self.virtual_tree.set_source(
+                QuerySource(self.flights, sort=self.sort_column, direction=self.sort_direction)
+            )
         except Exception as e:
             messagebox.showerror("Database Error", f"Failed to load flights: {e}")
     
+    def refresh_flights(self):
+        """Re-read the flights after a change, keeping the search, scroll position and selection"""
+        self.search_controller.reset()
+        self.virtual_tree.refresh()
+    
+    def on_data_changed(self, events):
+        """Flights or airports changed (change bus): redraw the rows that differ"""
+        self.refresh_flights()
+    
     def on_search(self, event):
       """Handle search functionality"""
-      try:
-          search_term = self.search_var.get().lower().strip()
-          
-          if not search_term:
-              # If search is empty, show all flights
-              self.load_flights()
-              return
-              
-          # Filter flights based on search term
-          conn = get_connection()
-          cursor = conn.cursor()
-          
-          cursor.execute("""
-              SELECT 
-                  f.id, 
-                  f.flight_number, 
-                  o_airport.name as origin, 
-                  d_airport.name as destination,
-                  f.departure_date || ' ' || f.departure_time as departure,
-                  f.arrival_date || ' ' || f.arrival_time as arrival,
-                  f.status
-              FROM flights f
-              LEFT JOIN airports o_airport ON f.origin_airport_id = o_airport.id
-              LEFT JOIN airports d_airport ON f.destination_airport_id = d_airport.id
-              WHERE f.flight_number LIKE ? OR 
-                    o_airport.name LIKE ? OR 
-                    d_airport.name LIKE ? OR
-                    f.status LIKE ?
-              ORDER BY f.departure_date, f.departure_time
-          """, (f'%{search_term}%', f'%{search_term}%', f'%{search_term}%', f'%{search_term}%'))
-          
-          flights = cursor.fetchall()
-          conn.close()
-          
-          # Clear existing data
-          for item in self.tree.get_children():
-              self.tree.delete(item)
-          
-          # Populate treeview - convert sqlite3.Row to tuple
-          for flight in flights:
-              flight_values = tuple(flight)
-              self.tree.insert('', tk.END, values=flight_values)
-              
-          # Show message if no results
-          if not flights:
-              no_flights_text = self.language_manager.get_text('no_flights_found')
-              self.tree.insert('', tk.END, values=(no_flights_text, "", "", "", "", "", ""))
-              
-      except Exception as e:
-          messagebox.showerror("Search Error", f"Failed to search flights: {e}")
+      # Debounced; an empty search box shows all flights again
+      self.search_controller.search(self.search_var.get())
+    
+    def show_search_info(self, report):
+      """Show how long the last search took"""
+      if report['rows'] is None:
+          text = self.language_manager.get_text('search_time', report['ms'])
+      else:
+          text = self.language_manager.get_text('search_results_time', report['rows'], report['ms'])
+      self.search_info_label.config(text=text)
     
     def on_flight_select(self, event):
       """Handle flight selection (double-click)"""
@@ -396,10 +361,6 @@ class FlightsFrame(tk.Frame):
       )
       form_title.grid(row=0, column=0, columnspan=2, pady=(0, 20))
       
-      # Get airports for dropdowns
-      airports = self.get_airports()
-      airport_names = [f"{airport['code']} - {airport['name']}" for airport in airports]
-      
       from datetime import datetime, timedelta
       current_date = datetime.now()
       default_departure = current_date + timedelta(days=1)
@@ -436,7 +397,7 @@ class FlightsFrame(tk.Frame):
       # Store the flight number entry
       self.entry_widgets = {}
       self.entry_widgets[self.language_manager.get_text('flight_number') + ":"] = self.flight_number_entry
-      self.airport_data = airports
+      self.airport_options = {}  # combobox label -> airport
       
       # Rest of the fields
       fields = [
@@ -459,7 +420,7 @@ class FlightsFrame(tk.Frame):
           if widget_type == "combobox":
               combobox = ttk.Combobox(
                   form_frame, 
-                  values=airport_names, 
+                  values=[], 
                   width=40, 
                   font=('Arial', 10),
                   state='readonly'
@@ -588,32 +549,31 @@ class FlightsFrame(tk.Frame):
                 command=add_window.destroy)
       cancel_btn.pack(side=tk.LEFT, padx=5)
       
-    def get_airports(self):
-      """Get list of airports from database"""
-      try:
-          conn = get_connection()
-          cursor = conn.cursor()
-          
-          cursor.execute("""
-              SELECT id, airport_code, name 
-              FROM airports 
-              ORDER BY airport_code
-          """)
-          
-          airports = []
-          for row in cursor.fetchall():
-              airports.append({
-                  'id': row[0],
-                  'code': row[1],
-                  'name': row[2]
-              })
-          
-          conn.close()
-          return airports
-          
-      except Exception as e:
-          messagebox.showerror("Database Error", f"Failed to load airports: {e}")
-          return []
+      # Fill the airport dropdowns once the lookup comes back
+      self.load_airports(add_window)
+      
+    def load_airports(self, window):
+      """Load airports for the dropdowns in the background"""
+      combos = [self.entry_widgets[self.language_manager.get_text('origin_airport') + ":"],
+                self.entry_widgets[self.language_manager.get_text('destination_airport') + ":"]]
+      
+      def loaded(airports):
+          if not window.winfo_exists():
+              return
+          airport_names = [f"{airport['code']} - {airport['name']}" for airport in airports]
+          self.airport_options = dict(zip(airport_names, airports))
+          for combobox in combos:
+              combobox['values'] = airport_names
+      
+      # Served from the reference data cache once it has been read
+      cached = reference_data.cached('airports')
+      if cached:
+          loaded(cached[0])
+          return
+      self.executor.submit(
+          'airports', reference_data.airports, on_success=loaded,
+          on_error=lambda e: messagebox.showerror("Database Error", f"Failed to load airports: {e}")
+      )
         
     def validate_and_save_flight(self, window):
       """Validate form data and save flight"""
@@ -718,7 +678,7 @@ class FlightsFrame(tk.Frame):
             # For now, just show a message and close
             messagebox.showinfo("Success", "Flight saved successfully!")
             window.destroy()
-            self.load_flights()  # Refresh the list
+            self.refresh_flights()  # Only the rows that changed are redrawn
             
         except Exception as e:
             messagebox.showerror("Error", f"Failed to save flight: {e}")
@@ -735,26 +695,7 @@ class FlightsFrame(tk.Frame):
     def debug_flight_data(self):
       """Debug method to check what data we're getting"""
       try:
-          conn = get_connection()
-          cursor = conn.cursor()
-          
-          cursor.execute("""
-              SELECT 
-                  f.id, 
-                  f.flight_number, 
-                  o_airport.name as origin, 
-                  d_airport.name as destination,
-                  f.departure_date || ' ' || f.departure_time as departure,
-                  f.arrival_date || ' ' || f.arrival_time as arrival,
-                  f.status
-              FROM flights f
-              LEFT JOIN airports o_airport ON f.origin_airport_id = o_airport.id
-              LEFT JOIN airports d_airport ON f.destination_airport_id = d_airport.id
-              LIMIT 1
-          """)
-          
-          sample_flight = cursor.fetchone()
-          conn.close()
+          sample_flight = self.flights.first_flight()
           
           if sample_flight:
               print("Sample flight data structure:")
@@ -779,12 +720,7 @@ class FlightsFrame(tk.Frame):
           return None
       
       # Selection format: "DXB - Dubai International Airport"
-      for airport in self.airport_data:
-          expected_format = f"{airport['code']} - {airport['name']}"
-          if selection_text == expected_format:
-              return airport
-      
-      return None
+      return self.airport_options.get(selection_text)
 
     def is_valid_date(self, date_str):
         """Basic date format validation"""
@@ -802,29 +738,14 @@ class FlightsFrame(tk.Frame):
                               dep_date, dep_time, arr_date, arr_time, window):
         """Save the new flight to database"""
         try:
-            conn = get_connection()
-            cursor = conn.cursor()
-            
-            # Get a plane and branch (for demo - in real app you'd let user choose)
-            cursor.execute("SELECT id FROM planes LIMIT 1")
-            plane_id = cursor.fetchone()[0]
-            cursor.execute("SELECT id FROM branches LIMIT 1")
-            branch_id = cursor.fetchone()[0]
-            
-            cursor.execute("""
-                INSERT INTO flights 
-                (flight_number, plane_id, branch_id, origin_airport_id, destination_airport_id,
-                departure_date, departure_time, arrival_date, arrival_time, status)
-                VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
-            """, (flight_number, plane_id, branch_id, origin_id, destination_id,
-                  dep_date, dep_time, arr_date, arr_time, 'scheduled'))
-            
-            conn.commit()
-            conn.close()
+            # The change bus refreshes the list
+            self.flights.create_flight(
+                flight_number, origin_id, destination_id,
+                dep_date, dep_time, arr_date, arr_time
+            )
             
             messagebox.showinfo("Success", f"Flight {flight_number} created successfully!")
             window.destroy()
-            self.load_flights()  # Refresh the list
             
         except Exception as e:
             messagebox.showerror("Error", f"Failed to save flight: {e}")
@@ -862,18 +783,7 @@ class FlightsFrame(tk.Frame):
     def flight_number_exists(self, flight_number, date):
         """Check if a flight number already exists on the given date"""
         try:
-            conn = get_connection()
-            cursor = conn.cursor()
-            
-            cursor.execute("""
-                SELECT COUNT(*) FROM flights 
-                WHERE flight_number = ? AND departure_date = ?
-            """, (flight_number, date))
-            
-            count = cursor.fetchone()[0]
-            conn.close()
-            
-            return count > 0
+            return self.flights.flight_number_exists(flight_number, date)
             
         except Exception as e:
             print(f"Error checking flight existence: {e}")
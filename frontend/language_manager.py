@@ -31,7 +31,15 @@ class LanguageManager:
                 'refresh': 'Refresh',
                 'add_flight': 'Add Flight',
                 'new_booking': 'New Booking',
+                'import_bookings': 'Import Bookings',
+                'booking_manifests': 'Booking manifests',
+                'import_summary': 'Imported {0} tickets in {1} bookings ({2}s)',
+                'import_rejected': '{0} rows were rejected; the reasons are in {1}',
+                'import_running': 'A manifest is still being imported. Wait for it to finish first.',
                 'search': 'Search',
+                'loading': 'Loading...',
+                'search_results_time': '{} results in {} ms',
+                'search_time': 'Searched in {} ms',
                 
                 # Flight management specific translations
                 'flight_number': 'Flight Number',
@@ -113,6 +121,17 @@ class LanguageManager:
                 'select_class_validation': 'Please select a class',
                 'select_terminal_validation': 'Please select a terminal',
                 'enter_seat_number': 'Please enter a seat number',
+                'seat_numbers_per_seat': 'Enter one seat number for each seat, e.g. 15A, 15B',
+                'seat_numbers_per_passenger': 'Enter one seat number for each passenger in the group, or none',
+                'group_passengers': 'Group Passengers',
+                'add_to_group': 'Add to Group',
+                'remove_from_group': 'Remove',
+                'group_booking_helper': 'Passengers added here share one booking. Leave the seat number empty to seat them together.',
+                'passenger_in_group': 'This passenger is already in the group',
+                'seat_taken': 'Seat already taken: {0}',
+                'flight_full': 'Not enough seats left on this flight ({0} available)',
+                'class_not_offered': 'This class is not offered on the aircraft for this flight',
+                'flight_not_bookable': 'This flight is no longer open for booking',
                 'booking_created_success': 'Booking created successfully!',
                 'booking_reference': 'Booking Reference',
                 'ticket_number': 'Ticket Number',
@@ -124,6 +143,34 @@ class LanguageManager:
                 'today_passengers': "Today's Passengers",
                 'revenue': "Revenue",
                 'recent_activity': "Recent Activity",
+                'flights_today': "Flights Today",
+                'bookings_today': "Bookings Today",
+                'revenue_today': "Today's Revenue",
+                'recent_booking_item': "Booking {0} - {1} {2}, {3} seat(s), ${4:,.2f}",
+                'no_recent_activity': "No bookings yet",
+                'updated_at': "Updated {0}",
+                'report': "Report",
+                'period_from': "From",
+                'period_to': "To",
+                'run_report': "Run",
+                'revenue_by_branch': "Revenue by Branch",
+                'revenue_by_route': "Revenue by Route",
+                'revenue_by_class': "Revenue by Class",
+                'revenue_by_day': "Revenue by Day",
+                'flight_load': "Flight Load Factors",
+                'booking_curve': "Booking Curve",
+                'branch': "Branch",
+                'tickets': "Tickets",
+                'average_fare': "Average Fare",
+                'load_factor': "Load Factor",
+                'revenue_share': "Share of Revenue",
+                'seats': "Seats",
+                'days_before_departure': "Days Before Departure",
+                'tickets_to_date': "Tickets to Date",
+                'share_of_bookings': "Share of Bookings",
+                'report_summary': "{0:,} tickets on {1:,} flights departing {2} to {3} - read in {4:.2f}s, computed in {5:.0f} ms",
+                'no_report_rows': "No flights in this period",
+                'reports_need_numpy': "Reports need NumPy. Install it with: pip install numpy",
             },
             'arabic': {
                 'app_title': 'طيران الكوثر',
@@ -144,7 +191,15 @@ class LanguageManager:
                 'refresh': 'تحديث',
                 'add_flight': 'إضافة رحلة',
                 'new_booking': 'حجز جديد',
+                'import_bookings': 'استيراد الحجوزات',
+                'booking_manifests': 'ملفات بيانات الحجوزات',
+                'import_summary': 'تم استيراد {0} تذكرة في {1} حجز ({2} ثانية)',
+                'import_rejected': 'تم رفض {0} صف، والأسباب في {1}',
+                'import_running': 'لا يزال استيراد ملف جارياً. انتظر حتى ينتهي أولاً.',
                 'search': 'بحث',
+                'loading': 'جارٍ التحميل...',
+                'search_results_time': '{} نتيجة في {} مللي ثانية',
+                'search_time': 'تم البحث في {} مللي ثانية',
                 
                 # Flight management specific translations
                 'flight_number': 'رقم الرحلة',
@@ -226,6 +281,17 @@ class LanguageManager:
                 'select_class_validation': 'الرجاء اختيار فئة',
                 'select_terminal_validation': 'الرجاء اختيار محطة',
                 'enter_seat_number': 'الرجاء إدخال رقم المقعد',
+                'seat_numbers_per_seat': 'أدخل رقم مقعد لكل مقعد، مثل 15A, 15B',
+                'seat_numbers_per_passenger': 'أدخل رقم مقعد لكل مسافر في المجموعة، أو اتركه فارغاً',
+                'group_passengers': 'مسافرو المجموعة',
+                'add_to_group': 'أضف إلى المجموعة',
+                'remove_from_group': 'إزالة',
+                'group_booking_helper': 'يشترك المسافرون المضافون هنا في حجز واحد. اترك رقم المقعد فارغاً لإجلاسهم معاً.',
+                'passenger_in_group': 'هذا المسافر موجود في المجموعة بالفعل',
+                'seat_taken': 'المقعد محجوز بالفعل: {0}',
+                'flight_full': 'لا توجد مقاعد كافية على هذه الرحلة (المتاح {0})',
+                'class_not_offered': 'هذه الفئة غير متوفرة على طائرة هذه الرحلة',
+                'flight_not_bookable': 'هذه الرحلة لم تعد متاحة للحجز',
                 'booking_created_success': 'تم إنشاء الحجز بنجاح!',
                 'booking_reference': 'رقم مرجع الحجز',
                 'ticket_number': 'رقم التذكرة',
@@ -236,7 +302,35 @@ class LanguageManager:
                 'total_price': 'السعر الإجمالي',
                 'today_passengers': "مسافرو اليوم",
                 'revenue': "الإيرادات",
-                'recent_activity': "النشاط الأخير"
+                'recent_activity': "النشاط الأخير",
+                'flights_today': "رحلات اليوم",
+                'bookings_today': "حجوزات اليوم",
+                'revenue_today': "إيرادات اليوم",
+                'recent_booking_item': "الحجز {0} - {1} {2}، {3} مقعد، ${4:,.2f}",
+                'no_recent_activity': "لا توجد حجوزات بعد",
+                'updated_at': "آخر تحديث {0}",
+                'report': "التقرير",
+                'period_from': "من",
+                'period_to': "إلى",
+                'run_report': "تشغيل",
+                'revenue_by_branch': "الإيرادات حسب الفرع",
+                'revenue_by_route': "الإيرادات حسب المسار",
+                'revenue_by_class': "الإيرادات حسب الدرجة",
+                'revenue_by_day': "الإيرادات حسب اليوم",
+                'flight_load': "معدلات إشغال الرحلات",
+                'booking_curve': "منحنى الحجوزات",
+                'branch': "الفرع",
+                'tickets': "التذاكر",
+                'average_fare': "متوسط السعر",
+                'load_factor': "معدل الإشغال",
+                'revenue_share': "حصة الإيرادات",
+                'seats': "المقاعد",
+                'days_before_departure': "الأيام قبل المغادرة",
+                'tickets_to_date': "التذاكر حتى تاريخه",
+                'share_of_bookings': "حصة الحجوزات",
+                'report_summary': "{0:,} تذكرة على {1:,} رحلة تغادر من {2} إلى {3} - القراءة {4:.2f} ث، الحساب {5:.0f} مللي ث",
+                'no_report_rows': "لا توجد رحلات في هذه الفترة",
+                'reports_need_numpy': "التقارير تحتاج إلى NumPy. ثبّتها بالأمر: pip install numpy",
             },
         }
     
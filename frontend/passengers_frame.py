@@ -1,14 +1,24 @@
 # -*- coding: utf-8 -*-
 import tkinter as tk
 from tkinter import ttk, messagebox
-from backend.database import get_connection
+from frontend.change_listener import ChangeListener
+from frontend.query_executor import QueryExecutor
+from frontend.search_controller import SearchController
+from frontend.virtual_tree import QuerySource, VirtualTreeview
+from backend.reference_data import reference_data
+from backend.repositories import PassengerRepository
 
 class PassengersFrame(tk.Frame):
     def __init__(self, parent, language_manager):
         super().__init__(parent)
         self.language_manager = language_manager
+        self.passengers = PassengerRepository()
+        self.executor = QueryExecutor(self, on_busy=self.show_loading)
+        self.bind('<Destroy>', lambda e: self.executor.shutdown() if e.widget is self else None)
         self.setup_ui()
         self.load_passengers()
+        # Gender and country names are shown in the list
+        self.changes = ChangeListener(self, ('passengers', 'genders', 'countries'), self.on_data_changed)
         
     def setup_ui(self):
         """Create passengers management interface"""
@@ -74,6 +84,20 @@ class PassengersFrame(tk.Frame):
             search_entry.pack(side=tk.LEFT, padx=5)
         search_entry.bind('<KeyRelease>', self.on_search)
         
+        # Shown while a query runs in the background
+        self.loading_label = tk.Label(search_frame, text="", bg='white', fg='gray')
+        if self.language_manager.is_rtl():
+            self.loading_label.pack(side=tk.RIGHT, padx=5)
+        else:
+            self.loading_label.pack(side=tk.LEFT, padx=5)
+        
+        # How long the last search took
+        self.search_info_label = tk.Label(search_frame, text="", bg='white', fg='gray')
+        if self.language_manager.is_rtl():
+            self.search_info_label.pack(side=tk.RIGHT, padx=5)
+        else:
+            self.search_info_label.pack(side=tk.LEFT, padx=5)
+        
         # Passengers table
         table_frame = tk.Frame(self, bg='white')
         table_frame.pack(fill=tk.BOTH, expand=True, padx=20, pady=10)
@@ -113,6 +137,23 @@ class PassengersFrame(tk.Frame):
             self.tree.pack(side=tk.LEFT, fill=tk.BOTH, expand=True)
             scrollbar.pack(side=tk.RIGHT, fill=tk.Y)
         
+        # Only the visible rows are loaded into the tree
+        self.virtual_tree = VirtualTreeview(
+            self.tree, scrollbar,
+            empty_text=self.language_manager.get_text('no_passengers_found'),
+            on_error=lambda e: messagebox.showerror("Database Error", f"Failed to load passengers: {e}"),
+            executor=self.executor
+        )
+        
+        # Search as you type: debounced, and narrowed in memory while the term grows
+        self.search_controller = SearchController(
+            self, self.executor, self.passengers,
+            on_results=self.virtual_tree.set_source,
+            on_clear=self.load_passengers,
+            on_report=self.show_search_info,
+            on_error=lambda e: messagebox.showerror("Search Error", f"Failed to search passengers: {e}")
+        )
+        
         # Bind events
         self.tree.bind('<Double-1>', self.on_passenger_view)
         
@@ -131,94 +172,41 @@ class PassengersFrame(tk.Frame):
         # Apply RTL to all widgets (AFTER all widgets are created)
         self.language_manager.apply_rtl_layout(self)
         
+    def show_loading(self, busy):
+        """Show or hide the loading indicator"""
+        self.loading_label.config(text=self.language_manager.get_text('loading') if busy else "")
+        
     def load_passengers(self):
         """Load passengers from database"""
         try:
-            conn = get_connection()
-            cursor = conn.cursor()
-            
-            cursor.execute("""
-                SELECT 
-                    p.id,
-                    p.passport_number,
-                    p.name,
-                    g.name as gender,
-                    c.name as nationality
-                FROM passengers p
-                JOIN genders g ON p.gender_id = g.id
-                JOIN countries c ON p.nationality_country_id = c.id
-                ORDER BY p.name
-            """)
-            
-            passengers = cursor.fetchall()
-            conn.close()
-            
-            # Clear existing data
-            for item in self.tree.get_children():
-                self.tree.delete(item)
-            
-            # Populate treeview
-            for passenger in passengers:
-                passenger_values = tuple(passenger)
-                self.tree.insert('', tk.END, values=passenger_values)
-                
-            # Show message if no passengers
-            if not passengers:
-                self.tree.insert('', tk.END, values=(
-                    self.language_manager.get_text('no_passengers_found'), "", "", "", ""
-                ))
+            self.search_controller.reset()
+            self.search_info_label.config(text="")
+            self.virtual_tree.set_source(QuerySource(self.passengers))
                 
         except Exception as e:
             messagebox.showerror("Database Error", f"Failed to load passengers: {e}")
     
+    def refresh_passengers(self):
+        """Re-read the passengers after a change, keeping the search, scroll position and selection"""
+        self.search_controller.reset()
+        self.virtual_tree.refresh()
+    
+    def on_data_changed(self, events):
+        """Passengers changed (change bus): redraw the rows that differ"""
+        self.refresh_passengers()
+    
     def on_search(self, event):
         """Handle search functionality"""
-        try:
-            search_term = self.search_var.get().lower().strip()
-            
-            if not search_term:
-                self.load_passengers()
-                return
-                
-            conn = get_connection()
-            cursor = conn.cursor()
-            
-            cursor.execute("""
-                SELECT 
-                    p.id,
-                    p.passport_number,
-                    p.name,
-                    g.name as gender,
-                    c.name as nationality
-                FROM passengers p
-                JOIN genders g ON p.gender_id = g.id
-                JOIN countries c ON p.nationality_country_id = c.id
-                WHERE p.passport_number LIKE ? OR 
-                      p.name LIKE ? OR
-                      g.name LIKE ? OR
-                      c.name LIKE ?
-                ORDER BY p.name
-            """, (f'%{search_term}%', f'%{search_term}%', f'%{search_term}%', f'%{search_term}%'))
-            
-            passengers = cursor.fetchall()
-            conn.close()
-            
-            # Clear existing data
-            for item in self.tree.get_children():
-                self.tree.delete(item)
-            
-            # Populate treeview
-            for passenger in passengers:
-                passenger_values = tuple(passenger)
-                self.tree.insert('', tk.END, values=passenger_values)
-                
-            if not passengers:
-                self.tree.insert('', tk.END, values=(
-                    self.language_manager.get_text('no_passengers_found'), "", "", "", ""
-                ))
-                
-        except Exception as e:
-            messagebox.showerror("Search Error", f"Failed to search passengers: {e}")
+        # Debounced; an empty search box shows all passengers again
+        self.search_controller.search(self.search_var.get())
+    
+    def show_search_info(self, report):
+        """Show how long the last search took"""
+        if report['rows'] is None:
+            text = self.language_manager.get_text('search_time', report['ms'])
+        else:
+            text = self.language_manager.get_text('search_results_time', report['rows'], report['ms'])
+        self.search_info_label.config(text=text)
     
     def show_context_menu(self, event):
         """Show context menu on right-click"""
@@ -293,26 +281,17 @@ class PassengersFrame(tk.Frame):
     
     def load_passenger_details_tab(self, parent, passenger_id):
         """Load passenger details in the details tab"""
+        self.executor.submit(
+            ('passenger_details', str(parent)), self.passengers.get_passenger, passenger_id,
+            on_success=lambda passenger: self.show_passenger_details(parent, passenger),
+            on_error=lambda e: messagebox.showerror("Error", f"Failed to load passenger details: {e}")
+        )
+    
+    def show_passenger_details(self, parent, passenger):
+        """Fill the details tab once the passenger has been read"""
+        if not parent.winfo_exists():
+            return
         try:
-            conn = get_connection()
-            cursor = conn.cursor()
-            
-            cursor.execute("""
-                SELECT 
-                    p.passport_number,
-                    p.name,
-                    g.name as gender,
-                    c.name as nationality,
-                    c.code as country_code
-                FROM passengers p
-                JOIN genders g ON p.gender_id = g.id
-                JOIN countries c ON p.nationality_country_id = c.id
-                WHERE p.id = ?
-            """, (passenger_id,))
-            
-            passenger = cursor.fetchone()
-            conn.close()
-            
             if not passenger:
                 tk.Label(parent, text=self.language_manager.get_text('passenger_not_found')).pack(pady=20)
                 return
@@ -345,34 +324,17 @@ class PassengersFrame(tk.Frame):
     
     def load_passenger_bookings_tab(self, parent, passenger_id):
         """Load passenger bookings in the bookings tab"""
+        self.executor.submit(
+            ('passenger_bookings', str(parent)), self.passengers.list_passenger_bookings, passenger_id,
+            on_success=lambda bookings: self.show_passenger_bookings(parent, bookings),
+            on_error=lambda e: messagebox.showerror("Error", f"Failed to load passenger bookings: {e}")
+        )
+    
+    def show_passenger_bookings(self, parent, bookings):
+        """Fill the bookings tab once the bookings have been read"""
+        if not parent.winfo_exists():
+            return
         try:
-            conn = get_connection()
-            cursor = conn.cursor()
-            
-            cursor.execute("""
-                SELECT 
-                    b.booking_reference,
-                    f.flight_number,
-                    o_airport.airport_code || ' → ' || d_airport.airport_code as route,
-                    b.booking_date,
-                    t.ticket_number,
-                    cls.name as class,
-                    t.seat_number,
-                    t.price,
-                    t.status
-                FROM tickets t
-                JOIN bookings b ON t.booking_id = b.id
-                JOIN flights f ON t.flight_id = f.id
-                JOIN airports o_airport ON f.origin_airport_id = o_airport.id
-                JOIN airports d_airport ON f.destination_airport_id = d_airport.id
-                JOIN classes cls ON t.class_id = cls.id
-                WHERE t.passenger_id = ?
-                ORDER BY b.booking_date DESC
-            """, (passenger_id,))
-            
-            bookings = cursor.fetchall()
-            conn.close()
-            
             if not bookings:
                 tk.Label(parent, text=self.language_manager.get_text('no_bookings_found')).pack(pady=20)
                 return
@@ -426,8 +388,7 @@ class PassengersFrame(tk.Frame):
             
             # Populate bookings
             for booking in bookings:
-                booking_values = tuple(booking)
-                tree.insert('', tk.END, values=booking_values)
+                tree.insert('', tk.END, values=booking)
                 
         except Exception as e:
             messagebox.showerror("Error", f"Failed to load passenger bookings: {e}")
@@ -457,10 +418,6 @@ class PassengersFrame(tk.Frame):
         )
         title.grid(row=0, column=0, columnspan=2, pady=(0, 20))
         
-        # Get data for dropdowns
-        genders = self.get_genders()
-        countries = self.get_countries()
-        
         self.passenger_widgets = {}
         current_row = 1
         
@@ -506,7 +463,7 @@ class PassengersFrame(tk.Frame):
         gender_var = tk.StringVar()
         gender_cb = ttk.Combobox(
             form_frame,
-            values=[g['name'] for g in genders],
+            values=[],
             textvariable=gender_var,
             state='readonly',
             width=23,
@@ -516,12 +473,10 @@ class PassengersFrame(tk.Frame):
             gender_cb.grid(row=current_row, column=0, sticky='e', pady=10, padx=(0, 10))
         else:
             gender_cb.grid(row=current_row, column=1, sticky='w', pady=10, padx=(10, 0))
-        if genders:
-            gender_cb.set(genders[0]['name'])
         self.passenger_widgets['gender'] = {
             'widget': gender_cb,
             'var': gender_var,
-            'data': genders
+            'options': {}
         }
         current_row += 1
         
@@ -535,7 +490,7 @@ class PassengersFrame(tk.Frame):
         nationality_var = tk.StringVar()
         nationality_cb = ttk.Combobox(
             form_frame,
-            values=[c['name'] for c in countries],
+            values=[],
             textvariable=nationality_var,
             state='readonly',
             width=23,
@@ -545,12 +500,10 @@ class PassengersFrame(tk.Frame):
             nationality_cb.grid(row=current_row, column=0, sticky='e', pady=10, padx=(0, 10))
         else:
             nationality_cb.grid(row=current_row, column=1, sticky='w', pady=10, padx=(10, 0))
-        if countries:
-            nationality_cb.set(countries[0]['name'])
         self.passenger_widgets['nationality'] = {
             'widget': nationality_cb,
             'var': nationality_var,
-            'data': countries
+            'options': {}
         }
         current_row += 1
         
@@ -585,6 +538,9 @@ class PassengersFrame(tk.Frame):
             width=15
         )
         cancel_btn.pack(side=tk.LEFT, padx=5)
+        
+        # Fill the dropdowns once the lookups come back
+        self.load_passenger_lookups(add_window, select_first=True)
     
     def edit_passenger(self, passenger_data):
         """Open edit passenger dialog"""
@@ -611,10 +567,6 @@ class PassengersFrame(tk.Frame):
         )
         title.grid(row=0, column=0, columnspan=2, pady=(0, 20))
         
-        # Get data for dropdowns
-        genders = self.get_genders()
-        countries = self.get_countries()
-        
         self.passenger_widgets = {}
         current_row = 1
         
@@ -661,7 +613,7 @@ class PassengersFrame(tk.Frame):
         gender_var = tk.StringVar(value=passenger_data[3])
         gender_cb = ttk.Combobox(
             form_frame,
-            values=[g['name'] for g in genders],
+            values=[],
             textvariable=gender_var,
             state='readonly',
             width=23,
@@ -674,7 +626,7 @@ class PassengersFrame(tk.Frame):
         self.passenger_widgets['gender'] = {
             'widget': gender_cb,
             'var': gender_var,
-            'data': genders
+            'options': {}
         }
         current_row += 1
         
@@ -688,7 +640,7 @@ class PassengersFrame(tk.Frame):
         nationality_var = tk.StringVar(value=passenger_data[4])
         nationality_cb = ttk.Combobox(
             form_frame,
-            values=[c['name'] for c in countries],
+            values=[],
             textvariable=nationality_var,
             state='readonly',
             width=23,
@@ -701,7 +653,7 @@ class PassengersFrame(tk.Frame):
         self.passenger_widgets['nationality'] = {
             'widget': nationality_cb,
             'var': nationality_var,
-            'data': countries
+            'options': {}
         }
         current_row += 1
         
@@ -736,6 +688,9 @@ class PassengersFrame(tk.Frame):
             width=15
         )
         cancel_btn.pack(side=tk.LEFT, padx=5)
+        
+        # Fill the dropdowns once the lookups come back
+        self.load_passenger_lookups(edit_window)
     
     def save_passenger(self, window):
         """Save new passenger to database"""
@@ -754,38 +709,18 @@ class PassengersFrame(tk.Frame):
                 return
             
             # Get gender and country IDs
-            gender_id = None
-            for gender in self.passenger_widgets['gender']['data']:
-                if gender['name'] == gender_name:
-                    gender_id = gender['id']
-                    break
-            
-            country_id = None
-            for country in self.passenger_widgets['nationality']['data']:
-                if country['name'] == nationality_name:
-                    country_id = country['id']
-                    break
+            gender_id = self.get_option_id('gender', gender_name)
+            country_id = self.get_option_id('nationality', nationality_name)
             
             if not gender_id or not country_id:
                 validation_msg.config(text=self.language_manager.get_text('invalid_gender_or_country'))
                 return
             
-            # Save to database
-            conn = get_connection()
-            cursor = conn.cursor()
-            
-            cursor.execute("""
-                INSERT INTO passengers 
-                (passport_number, name, gender_id, nationality_country_id)
-                VALUES (?, ?, ?, ?)
-            """, (passport, name, gender_id, country_id))
-            
-            conn.commit()
-            conn.close()
+            # Save to database; the change bus refreshes the list
+            self.passengers.create_passenger(passport, name, gender_id, country_id)
             
             messagebox.showinfo("Success", self.language_manager.get_text('passenger_saved_success'))
             window.destroy()
-            self.load_passengers()  # Refresh the list
             
         except Exception as e:
             if "UNIQUE constraint failed" in str(e):
@@ -810,56 +745,54 @@ class PassengersFrame(tk.Frame):
                 return
             
             # Get gender and country IDs
-            gender_id = None
-            for gender in self.passenger_widgets['gender']['data']:
-                if gender['name'] == gender_name:
-                    gender_id = gender['id']
-                    break
-            
-            country_id = None
-            for country in self.passenger_widgets['nationality']['data']:
-                if country['name'] == nationality_name:
-                    country_id = country['id']
-                    break
+            gender_id = self.get_option_id('gender', gender_name)
+            country_id = self.get_option_id('nationality', nationality_name)
             
             if not gender_id or not country_id:
                 validation_msg.config(text=self.language_manager.get_text('invalid_gender_or_country'))
                 return
             
-            # Update database
-            conn = get_connection()
-            cursor = conn.cursor()
-            
-            cursor.execute("""
-                UPDATE passengers 
-                SET name = ?, gender_id = ?, nationality_country_id = ?
-                WHERE id = ?
-            """, (name, gender_id, country_id, passenger_id))
-            
-            conn.commit()
-            conn.close()
+            # Update database; the change bus refreshes the list
+            self.passengers.update_passenger(passenger_id, name, gender_id, country_id)
             
             messagebox.showinfo("Success", self.language_manager.get_text('passenger_updated_success'))
             window.destroy()
-            self.load_passengers()  # Refresh the list
             
         except Exception as e:
             messagebox.showerror("Error", f"Failed to update passenger: {e}")
     
+    def load_passenger_lookups(self, window, select_first=False):
+        """Load genders and countries for the passenger dialog in the background"""
+        widgets = self.passenger_widgets
+        
+        def loaded(result):
+            if not window.winfo_exists():
+                return
+            for name, data in zip(('gender', 'nationality'), result):
+                # name -> record, so saving resolves the choices with dict lookups
+                widgets[name]['options'] = {item['name']: item for item in data}
+                widgets[name]['widget']['values'] = [item['name'] for item in data]
+                if select_first and data:
+                    widgets[name]['widget'].set(data[0]['name'])
+        
+        # Served from the reference data cache once it has been read
+        cached = reference_data.cached('genders', 'countries')
+        if cached:
+            loaded(cached)
+            return
+        self.executor.submit('passenger_lookups',
+                             lambda: (self.get_genders(), self.get_countries()),
+                             on_success=loaded)
+    
+    def get_option_id(self, name, label):
+        """Id of the record shown as label in a passenger dialog combobox, or None"""
+        option = self.passenger_widgets[name]['options'].get(label)
+        return option['id'] if option else None
+    
     def get_genders(self):
         """Get list of genders from database"""
         try:
-            conn = get_connection()
-            cursor = conn.cursor()
-            cursor.execute("SELECT id, name FROM genders ORDER BY name")
-            genders = []
-            for row in cursor.fetchall():
-                genders.append({
-                    'id': row[0],
-                    'name': row[1]
-                })
-            conn.close()
-            return genders
+            return reference_data.genders()
         except Exception as e:
             print(f"Error getting genders: {e}")
             return []
@@ -867,17 +800,7 @@ class PassengersFrame(tk.Frame):
     def get_countries(self):
         """Get list of countries from database"""
         try:
-            conn = get_connection()
-            cursor = conn.cursor()
-            cursor.execute("SELECT id, name FROM countries ORDER BY name")
-            countries = []
-            for row in cursor.fetchall():
-                countries.append({
-                    'id': row[0],
-                    'name': row[1]
-                })
-            conn.close()
-            return countries
+            return reference_data.countries()
         except Exception as e:
             print(f"Error getting countries: {e}")
             return []
@@ -0,0 +1,178 @@
+# -*- coding: utf-8 -*-
+# frontend/query_executor.py
+import queue
+import sqlite3
+import threading
+
+from backend.database import get_connection
+
+# How often the Tk thread looks for finished queries while any are pending (ms)
+POLL_INTERVAL = 25
+
+# SQLite calls the progress handler every this many VM instructions, which is
+# how a superseded query is interrupted mid-flight
+PROGRESS_STEPS = 1000
+
+
+class QueryCancelled(Exception):
+    """Raised inside a worker when its request was superseded."""
+
+
+class _Request:
+    def __init__(self, key, func, args, kwargs, on_success, on_error):
+        self.key = key
+        self.func = func
+        self.args = args
+        self.kwargs = kwargs
+        self.on_success = on_success
+        self.on_error = on_error
+        self.cancelled = False
+
+
+class QueryExecutor:
+    """Runs database calls on a worker thread and delivers results on the Tk thread.
+
+    Requests are keyed: submitting a new request with the key of one that is
+    still queued or running cancels the old one. A queued request is skipped, a
+    running query is interrupted through SQLite's progress handler, and a
+    result that arrives late is dropped. Callbacks always run on the Tk thread,
+    from an after() poll of the result queue.
+    """
+
+    def __init__(self, widget, on_busy=None, workers=1):
+        self.widget = widget
+        self.on_busy = on_busy
+        self._requests = queue.Queue()
+        self._results = queue.Queue()
+        self._active = {}  # key -> latest _Request
+        self._lock = threading.Lock()
+        self._polling = False
+        self._closed = False
+        self._threads = []
+        for i in range(workers):
+            thread = threading.Thread(target=self._work, name=f"query-worker-{i}", daemon=True)
+            thread.start()
+            self._threads.append(thread)
+
+    def submit(self, key, func, *args, on_success=None, on_error=None, **kwargs):
+        """Run func(*args, **kwargs) in the background, superseding any request with the same key."""
+        if self._closed:
+            return None
+        request = _Request(key, func, args, kwargs, on_success, on_error)
+        with self._lock:
+            previous = self._active.get(key)
+            if previous:
+                previous.cancelled = True
+            self._active[key] = request
+            busy_changed = len(self._active) == 1 and not previous
+        self._requests.put(request)
+        if busy_changed:
+            self._notify_busy(True)
+        self._start_polling()
+        return request
+
+    def cancel(self, key):
+        """Cancel the request with this key, if any."""
+        with self._lock:
+            request = self._active.pop(key, None)
+            idle = not self._active
+        if request:
+            request.cancelled = True
+            if idle:
+                self._notify_busy(False)
+
+    def is_busy(self):
+        with self._lock:
+            return bool(self._active)
+
+    def shutdown(self):
+        """Cancel everything and stop the worker threads."""
+        self._closed = True
+        with self._lock:
+            for request in self._active.values():
+                request.cancelled = True
+            self._active.clear()
+        for _ in self._threads:
+            self._requests.put(None)
+
+    # Worker side
+
+    def _work(self):
+        while True:
+            request = self._requests.get()
+            if request is None:
+                return
+            if request.cancelled:
+                continue
+            try:
+                result = self._run(request)
+            except QueryCancelled:
+                continue
+            except sqlite3.OperationalError as e:
+                if request.cancelled and 'interrupted' in str(e):
+                    continue
+                self._results.put((request, False, e))
+            except Exception as e:
+                self._results.put((request, False, e))
+            else:
+                self._results.put((request, True, result))
+
+    def _run(self, request):
+        # The pool hands the same connection to every checkout on this thread, so
+        # the repositories called by func run on the connection watched here
+        conn = get_connection()
+        try:
+            conn.set_progress_handler(lambda: 1 if request.cancelled else 0, PROGRESS_STEPS)
+            try:
+                if request.cancelled:
+                    raise QueryCancelled()
+                return request.func(*request.args, **request.kwargs)
+            finally:
+                conn.set_progress_handler(None, 0)
+        finally:
+            conn.close()
+
+    # Tk side
+
+    def _start_polling(self):
+        if not self._polling:
+            self._polling = True
+            self.widget.after(POLL_INTERVAL, self._poll)
+
+    def _poll(self):
+        while True:
+            try:
+                request, ok, value = self._results.get_nowait()
+            except queue.Empty:
+                break
+            with self._lock:
+                current = self._active.get(request.key) is request
+                if current:
+                    del self._active[request.key]
+                idle = not self._active
+            if not current or request.cancelled:
+                continue
+            if idle:
+                self._notify_busy(False)
+            callback = request.on_success if ok else request.on_error
+            if callback:
+                callback(value)
+            elif not ok:
+                print(f"❌ Background query '{request.key}' failed: {value}")
+
+        if self.is_busy() and not self._closed:
+            try:
+                self.widget.after(POLL_INTERVAL, self._poll)
+            except Exception:
+                # The widget was destroyed while queries were still running
+                self.shutdown()
+                self._polling = False
+        else:
+            self._polling = False
+
+    def _notify_busy(self, busy):
+        if self.on_busy:
+            try:
+                self.on_busy(busy)
+            except Exception:
+                pass
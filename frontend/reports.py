@@ -0,0 +1,231 @@
+# -*- coding: utf-8 -*-
+# frontend/reports.py
+import time
+import tkinter as tk
+from datetime import date
+from tkinter import ttk, messagebox
+
+from frontend.change_listener import ChangeListener
+from frontend.query_executor import QueryExecutor
+from frontend.virtual_tree import MemorySource, VirtualTreeview
+
+try:
+    from backend.report_engine import REPORTS, ReportEngine
+    NUMPY_AVAILABLE = True
+except ImportError:
+    REPORTS = ()
+    NUMPY_AVAILABLE = False
+    print("Warning: numpy not available. Reports are disabled.")
+
+
+def format_value(kind, value):
+    """Show a report value of the given column kind (see backend/report_engine.py)"""
+    if kind == 'count':
+        return f"{int(value):,}"
+    if kind == 'money':
+        return f"${value:,.2f}"
+    if kind == 'percent':
+        return f"{value * 100:.1f}%"
+    return str(value)
+
+
+class ReportSource(MemorySource):
+    """The rows of a computed report, formatted a page at a time as they are shown.
+
+    Each row starts with its position, the (hidden) item id in the table.
+    """
+
+    def __init__(self, table):
+        super().__init__(table.rows)
+        self.kinds = [kind for _, kind in table.columns]
+
+    def fetch_page(self, limit, after=None, offset=0):
+        rows, keys = super().fetch_page(limit, after, offset)
+        return [(key,) + tuple(format_value(kind, value) for kind, value in zip(self.kinds, row))
+                for key, row in zip(keys, rows)], keys
+
+
+class ReportsFrame(tk.Frame):
+    """Revenue, load factor and booking curve reports over a period of departures.
+
+    Run reads the period's flights and tickets into arrays in the background
+    (backend/report_engine.py); picking another report only regroups those
+    arrays. The data is read again when the period changes or when flights,
+    bookings or tickets changed since the last read.
+    """
+
+    def __init__(self, parent, language_manager):
+        super().__init__(parent, bg='white')
+        self.language_manager = language_manager
+        self.data = None
+        self.stale = True
+        self.tree = None
+        self.executor = QueryExecutor(self, on_busy=self.show_loading)
+        self.bind('<Destroy>', lambda e: self.executor.shutdown() if e.widget is self else None)
+        self.setup_ui()
+        if NUMPY_AVAILABLE:
+            self.engine = ReportEngine()
+            self.changes = ChangeListener(self, ('flights', 'bookings', 'tickets'), self.on_data_changed)
+            self.run_report()
+
+    def setup_ui(self):
+        """Create the report picker, period fields and results table"""
+        rtl = self.language_manager.is_rtl()
+        side = tk.RIGHT if rtl else tk.LEFT
+
+        self.title = tk.Label(
+            self,
+            font=('Arial', 18, 'bold'),
+            bg='white',
+            fg='#2c3e50',
+            anchor='w' if not rtl else 'e'
+        )
+        self.title.pack(fill=tk.X, padx=20, pady=10)
+
+        if not NUMPY_AVAILABLE:
+            self.title.config(text=self.language_manager.get_text('reports') + " & Analytics")
+            tk.Label(self, text=self.language_manager.get_text('reports_need_numpy'),
+                     font=('Arial', 12), bg='white', fg='#7f8c8d').pack(expand=True)
+            return
+
+        # Report and period
+        controls = tk.Frame(self, bg='white')
+        controls.pack(fill=tk.X, padx=20, pady=5)
+
+        self.report_label = tk.Label(controls, bg='white', font=('Arial', 10))
+        self.report_label.pack(side=side, padx=(0, 5))
+        self.report_combo = ttk.Combobox(controls, state='readonly', width=25, font=('Arial', 10))
+        self.report_combo.pack(side=side, padx=(0, 15))
+        self.report_combo.bind('<<ComboboxSelected>>', lambda e: self.show_report())
+
+        year = date.today().year
+        self.from_label = tk.Label(controls, bg='white', font=('Arial', 10))
+        self.from_label.pack(side=side, padx=(0, 5))
+        self.from_entry = ttk.Entry(controls, width=12, font=('Arial', 10))
+        self.from_entry.insert(0, f"{year}-01-01")
+        self.from_entry.pack(side=side, padx=(0, 10))
+
+        self.to_label = tk.Label(controls, bg='white', font=('Arial', 10))
+        self.to_label.pack(side=side, padx=(0, 5))
+        self.to_entry = ttk.Entry(controls, width=12, font=('Arial', 10))
+        self.to_entry.insert(0, f"{year}-12-31")
+        self.to_entry.pack(side=side, padx=(0, 10))
+
+        self.run_btn = ttk.Button(controls, command=self.run_report)
+        self.run_btn.pack(side=side, padx=5)
+
+        self.loading_label = tk.Label(controls, bg='white', fg='#7f8c8d', font=('Arial', 10))
+        self.loading_label.pack(side=side, padx=10)
+
+        self.summary_label = tk.Label(self, bg='white', fg='#7f8c8d', font=('Arial', 9),
+                                      anchor='w' if not rtl else 'e')
+        self.summary_label.pack(fill=tk.X, padx=20)
+
+        self.table_frame = tk.Frame(self, bg='white')
+        self.table_frame.pack(fill=tk.BOTH, expand=True, padx=20, pady=10)
+
+        self.update_language()
+
+    def update_language(self):
+        """Re-apply texts after a language change"""
+        self.title.config(text=self.language_manager.get_text('reports') + " & Analytics")
+        if not NUMPY_AVAILABLE:
+            return
+        self.report_label.config(text=self.language_manager.get_text('report') + ":")
+        self.from_label.config(text=self.language_manager.get_text('period_from') + ":")
+        self.to_label.config(text=self.language_manager.get_text('period_to') + ":")
+        self.run_btn.config(text=self.language_manager.get_text('run_report'))
+        current = max(0, self.report_combo.current())
+        self.report_combo.config(values=[self.language_manager.get_text(name) for name in REPORTS])
+        self.report_combo.current(current)
+        self.show_report()
+
+    def show_loading(self, busy):
+        """Show or hide the loading indicator"""
+        self.loading_label.config(text=self.language_manager.get_text('loading') if busy else "")
+
+    def on_data_changed(self, events):
+        """Flights, bookings or tickets changed (change bus): the next run reads again"""
+        self.stale = True
+
+    def run_report(self):
+        """Read the period if needed, then show the selected report"""
+        try:
+            start = date.fromisoformat(self.from_entry.get().strip())
+            end = date.fromisoformat(self.to_entry.get().strip())
+        except ValueError:
+            messagebox.showerror("Error", self.language_manager.get_text('use_yyyy_mm_dd_format'))
+            return
+        if start > end:
+            start, end = end, start
+
+        if self.data is not None and not self.stale and (self.data.start, self.data.end) == (
+                start.isoformat(), end.isoformat()):
+            self.show_report()
+            return
+
+        def loaded(data):
+            self.data = data
+            self.show_report()
+
+        # Changes made while reading are not in the result, so they still count
+        self.stale = False
+        self.executor.submit('report', self.engine.load, start, end, on_success=loaded,
+                             on_error=self.on_load_error)
+
+    def on_load_error(self, error):
+        self.stale = True
+        messagebox.showerror("Database Error", f"Failed to load report data: {error}")
+
+    def show_report(self):
+        """Compute the selected report from the loaded data and show it"""
+        if self.data is None:
+            return
+        started = time.perf_counter()
+        table = self.data.report(REPORTS[max(0, self.report_combo.current())])
+        computed = time.perf_counter() - started
+
+        if self.data.flight_count:
+            self.summary_label.config(text=self.language_manager.get_text(
+                'report_summary', self.data.ticket_count, self.data.flight_count, self.data.start,
+                self.data.end, self.data.read_seconds, computed * 1000))
+        else:
+            self.summary_label.config(text=self.language_manager.get_text('no_report_rows'))
+
+        self.build_table(table.columns)
+        self.virtual_tree.set_source(ReportSource(table))
+
+    def build_table(self, columns):
+        """(Re)create the results table for a report's columns"""
+        for widget in self.table_frame.winfo_children():
+            widget.destroy()
+
+        keys = [key for key, _ in columns]
+        # The first column is the row position, used as item id and not shown
+        self.tree = ttk.Treeview(
+            self.table_frame,
+            columns=['row'] + keys,
+            displaycolumns=keys,
+            show='headings',
+            height=15
+        )
+        for key, kind in columns:
+            self.tree.heading(key, text=self.language_manager.get_text(key))
+            self.tree.column(key, width=150 if kind == 'text' else 110,
+                             anchor='w' if kind == 'text' else 'e')
+
+        scrollbar = ttk.Scrollbar(self.table_frame, orient=tk.VERTICAL, command=self.tree.yview)
+        self.tree.configure(yscrollcommand=scrollbar.set)
+
+        if self.language_manager.is_rtl():
+            scrollbar.pack(side=tk.LEFT, fill=tk.Y)
+            self.tree.pack(side=tk.RIGHT, fill=tk.BOTH, expand=True)
+        else:
+            self.tree.pack(side=tk.LEFT, fill=tk.BOTH, expand=True)
+            scrollbar.pack(side=tk.RIGHT, fill=tk.Y)
+
+        # Only the visible rows are formatted and inserted
+        self.virtual_tree = VirtualTreeview(
+            self.tree, scrollbar,
+            on_error=lambda e: messagebox.showerror("Error", f"Failed to show report: {e}")
+        )
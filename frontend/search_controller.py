@@ -0,0 +1,155 @@
+# -*- coding: utf-8 -*-
+# frontend/search_controller.py
+import time
+from collections import deque
+
+from backend.search_index import MIN_INDEXED_LENGTH, normalize_search
+from frontend.virtual_tree import MemorySource, QuerySource
+
+# Wait this long after the last keystroke before searching (ms)
+DEBOUNCE_DELAY = 250
+
+# Search results up to this size are kept in memory and narrowed locally
+# while the term keeps growing
+NARROW_LIMIT = 2000
+
+
+def narrow(matches, term):
+    """Keep the (row, search text) pairs whose text contains term."""
+    return [(row, text) for row, text in matches if term in text]
+
+
+def can_narrow(previous, term):
+    """True when the result for previous already contains every match for term.
+
+    LIKE wildcards typed by the user mean something different to a plain
+    substring test, so such terms always go to the database.
+    """
+    return (previous is not None and term.startswith(previous)
+            and '%' not in term and '_' not in term)
+
+
+class SearchController:
+    """Search-as-you-type for a list frame.
+
+    Keystrokes are debounced with after(), the search runs on the frame's
+    QueryExecutor (a newer search cancels one still running), and a complete
+    result of up to NARROW_LIMIT rows is remembered so that typing more
+    characters filters it in memory instead of querying again. Every search
+    is timed; the last ones are kept in history and passed to on_report.
+    """
+
+    def __init__(self, widget, executor, repository, on_results, on_clear,
+                 sort=None, direction=None, on_report=None, on_error=None,
+                 delay=DEBOUNCE_DELAY, narrow_limit=NARROW_LIMIT):
+        self.widget = widget
+        self.executor = executor
+        self.repository = repository
+        self.on_results = on_results
+        self.on_clear = on_clear
+        self.sort = sort
+        self.direction = direction
+        self.on_report = on_report
+        self.on_error = on_error
+        self.delay = delay
+        self.narrow_limit = narrow_limit
+        self.history = deque(maxlen=50)  # {'term', 'mode', 'rows', 'ms'}
+
+        self._pending = None  # after() id of the debounced search
+        self._term = None  # term of the results on screen
+        self._matches_term = None  # term the remembered matches belong to
+        self._matches = None
+
+    def search(self, text):
+        """Called on every keystroke: (re)start the debounce timer."""
+        if self._pending is not None:
+            self.widget.after_cancel(self._pending)
+        self._pending = self.widget.after(self.delay, self._fire, normalize_search(text))
+
+    def reset(self):
+        """Forget remembered results, e.g. after the data changed."""
+        if self._pending is not None:
+            self.widget.after_cancel(self._pending)
+            self._pending = None
+        self.executor.cancel('search')
+        self._term = None
+        self._matches_term = None
+        self._matches = None
+
+    def set_sort(self, sort, direction, key=None):
+        """Order later results differently.
+
+        Remembered matches are re-sorted with key so narrowing keeps the new
+        order; without a key they are dropped and the next term is queried.
+        """
+        self.sort, self.direction = sort, direction
+        if self._matches is None:
+            return
+        if key is None:
+            self._matches_term = self._matches = None
+        else:
+            self._matches.sort(key=lambda pair: key(pair[0]), reverse=direction == 'DESC')
+
+    def _fire(self, term):
+        self._pending = None
+        if term == self._term:
+            return  # e.g. an arrow key in the search box
+        self._term = term
+
+        if not term:
+            self.executor.cancel('search')
+            self.on_clear()
+            return
+
+        start = time.perf_counter()
+        if can_narrow(self._matches_term, term) and self._matches is not None:
+            self._show(term, narrow(self._matches, term), 'memory', start)
+            return
+
+        if len(term) < MIN_INDEXED_LENGTH:
+            # A very short term matches most rows and cannot use the index:
+            # page through it rather than trying to hold the result
+            self._matches_term = self._matches = None
+            self.on_results(QuerySource(self.repository, search=term,
+                                        sort=self.sort, direction=self.direction))
+            self._report(term, 'database', None, start)
+            return
+
+        def found(matches):
+            if matches is None:
+                # Too many rows to keep: let the tree page through the query
+                self._matches_term = self._matches = None
+                self.on_results(QuerySource(self.repository, search=term,
+                                            sort=self.sort, direction=self.direction))
+                self._report(term, 'database', None, start)
+            else:
+                self._show(term, matches, 'database', start)
+
+        self.executor.submit('search', self.repository.fetch_matches, term, self.sort,
+                             self.direction, self.narrow_limit, on_success=found,
+                             on_error=self._failed)
+
+    def _show(self, term, matches, mode, start):
+        self._matches_term, self._matches = term, matches
+        query = QuerySource(self.repository, search=term, sort=self.sort, direction=self.direction)
+        self.on_results(MemorySource([row for row, _ in matches], query))
+        self._report(term, mode, len(matches), start)
+
+    def _failed(self, error):
+        # Let the next keystroke retry the same term
+        self._term = None
+        if self.on_error:
+            self.on_error(error)
+        else:
+            print(f"❌ Search failed: {error}")
+
+    def _report(self, term, mode, rows, start):
+        entry = {
+            'term': term,
+            'mode': mode,
+            'rows': rows,
+            'ms': round((time.perf_counter() - start) * 1000, 1),
+        }
+        self.history.append(entry)
+        if self.on_report:
+            self.on_report(entry)
@@ -0,0 +1,359 @@
+# -*- coding: utf-8 -*-
+# frontend/virtual_tree.py
+from collections import OrderedDict
+
+# Treeview item of the "nothing found" placeholder row
+EMPTY_ITEM = '__empty__'
+
+
+class QuerySource:
+    """What a VirtualTreeview shows: one list repository query."""
+
+    def __init__(self, repository, search=None, sort=None, direction=None):
+        self.repository = repository
+        self.search = search
+        self.sort = sort
+        self.direction = direction
+
+    def count(self):
+        return self.repository.count(self.search)
+
+    def fetch_page(self, limit, after=None, offset=0):
+        return self.repository.fetch_page(self.search, self.sort, self.direction,
+                                          limit=limit, after=after, offset=offset)
+
+    def fetch_all(self):
+        return self.repository.list_rows(self.search, self.sort, self.direction)
+
+    def sorted(self, sort, direction):
+        """The same query in another order."""
+        return QuerySource(self.repository, self.search, sort, direction)
+
+
+class MemorySource:
+    """Rows that are already in memory, such as a search result narrowed down locally.
+
+    query, when given, is a QuerySource returning the same rows, used to read
+    them again after the data changed.
+    """
+
+    in_memory = True
+
+    def __init__(self, rows, query=None):
+        self.rows = rows
+        self.query = query
+
+    def count(self):
+        return len(self.rows)
+
+    def fetch_page(self, limit, after=None, offset=0):
+        # The key of a row is simply its position
+        start = after + 1 if after is not None else offset
+        rows = self.rows[start:start + limit]
+        return rows, list(range(start, start + len(rows)))
+
+
+class VirtualTreeview:
+    """Shows a large result set through an existing Treeview, one screenful at a time.
+
+    Only the visible rows are inserted into the Treeview. Rows come from a
+    QuerySource in fixed-size pages: the page after a cached one is read with
+    keyset pagination (continue after the last sort key), a jump far into the
+    list falls back to OFFSET. At most cache_pages pages are kept, so memory
+    does not grow with the table; a result that fits in them can be re-sorted
+    without another query (resort). With a QueryExecutor the reads run off
+    the Tk thread.
+
+    Treeview items are keyed by row_id (the first column by default), and
+    each render only inserts, moves, updates or deletes the items that
+    differ, so a row that stays on screen keeps its selection and focus.
+    """
+
+    def __init__(self, tree, scrollbar, page_size=100, cache_pages=8, empty_text=None,
+                 on_error=None, executor=None, row_id=None):
+        self.tree = tree
+        self.scrollbar = scrollbar
+        self.page_size = page_size
+        self.cache_pages = max(2, cache_pages)  # a window can span two pages
+        self.empty_text = empty_text
+        self.on_error = on_error
+        self.executor = executor
+        self.row_id = row_id or (lambda row: row[0])
+
+        self.source = None
+        self.total = 0
+        self.top = 0
+        self.visible = max(1, int(tree.cget('height')))
+        self._pages = OrderedDict()  # page number -> (rows, last key), least recently used first
+        self._version = 0  # bumped whenever cached pages become stale
+        self._shown = {}  # item id -> values currently in the Treeview
+
+        scrollbar.configure(command=self._on_scrollbar)
+        tree.configure(yscrollcommand=lambda *args: None)  # we drive the scrollbar ourselves
+        tree.bind('<MouseWheel>', self._on_mousewheel)
+        tree.bind('<Button-4>', lambda e: self._scroll_by(-3))
+        tree.bind('<Button-5>', lambda e: self._scroll_by(3))
+        tree.bind('<Down>', lambda e: self._on_arrow(1))
+        tree.bind('<Up>', lambda e: self._on_arrow(-1))
+        tree.bind('<Next>', lambda e: self._scroll_by(self.visible))
+        tree.bind('<Prior>', lambda e: self._scroll_by(-self.visible))
+        tree.bind('<Home>', lambda e: self._scroll_by(-self.total))
+        tree.bind('<End>', lambda e: self._scroll_by(self.total))
+        tree.bind('<Configure>', self._on_configure, add='+')
+
+    # Public API
+
+    def set_source(self, source):
+        """Show a new query from the top."""
+        self.source = source
+        self.top = 0
+        self.refresh()
+
+    def refresh(self):
+        """Re-read the current query, keeping the scroll position where possible.
+
+        In-memory rows are read again through their query, if they have one.
+        Only the rows that changed on screen are touched.
+        """
+        self._pages.clear()
+        self._version += 1
+        if self.source is None:
+            return
+
+        source, version, top, visible = self.source, self._version, self.top, self.visible
+
+        def load():
+            current = source
+            if getattr(source, 'query', None) is not None:
+                current = MemorySource(source.query.fetch_all(), source.query)
+            total = current.count()
+            first = max(0, min(top, total - visible))
+            pages = self._read_pages(current, self._page_numbers(first, visible), {}) if total else {}
+            return current, total, first, pages
+
+        def loaded(result):
+            if version != self._version:
+                return
+            self.source, self.total, self.top, pages = result
+            self._store_pages(pages)
+            self._render()
+
+        # Re-reading in-memory rows through their query is a database read too
+        self._run('load', load, loaded, in_memory=getattr(source, 'query', None) is None)
+
+    def loaded_rows(self):
+        """Every row of the current source when all of them are in memory, else None."""
+        if self.source is None:
+            return None
+        if getattr(self.source, 'in_memory', False):
+            return list(self.source.rows)
+        numbers = range((self.total + self.page_size - 1) // self.page_size)
+        if any(number not in self._pages for number in numbers):
+            return None
+        rows = [row for number in numbers for row in self._pages[number][0]]
+        return rows if len(rows) == self.total else None
+
+    def resort(self, sort, direction, key=None):
+        """Show the current rows in another order; returns False when that is not possible.
+
+        When every row is already loaded and key orders rows like the query
+        would, they are sorted in memory without touching the database.
+        Otherwise the query runs again with the new order.
+        """
+        rows = self.loaded_rows()
+        if key is not None and rows is not None:
+            query = getattr(self.source, 'query', self.source)
+            if hasattr(query, 'sorted'):
+                query = query.sorted(sort, direction)
+            self.set_source(MemorySource(sorted(rows, key=key, reverse=direction == 'DESC'), query))
+            return True
+        if hasattr(self.source, 'sorted'):
+            self.set_source(self.source.sorted(sort, direction))
+            return True
+        return False
+
+    def scroll_to(self, index):
+        """Make row number index the first visible row."""
+        self.top = max(0, min(int(index), self.total - self.visible))
+        self._render()
+
+    def row_count(self):
+        return self.total
+
+    # Paging
+
+    def _page_numbers(self, top, visible):
+        """Pages covering rows top .. top + visible (at most two)."""
+        return list(range(top // self.page_size, (top + visible - 1) // self.page_size + 1))
+
+    def _read_pages(self, source, numbers, last_keys):
+        """Read pages from the database; runs on the worker thread when there is an executor.
+
+        A page whose predecessor's last key is known continues from it (keyset),
+        anything else is a jump and uses OFFSET.
+        """
+        pages = {}
+        for number in numbers:
+            after = last_keys.get(number - 1)
+            if number == 0:
+                rows, keys = source.fetch_page(self.page_size)
+            elif after is not None:
+                rows, keys = source.fetch_page(self.page_size, after=after)
+            else:
+                rows, keys = source.fetch_page(self.page_size, offset=number * self.page_size)
+            last_key = keys[-1] if keys else None
+            pages[number] = (rows, last_key)
+            last_keys[number] = last_key
+        return pages
+
+    def _store_pages(self, pages):
+        for number, page in pages.items():
+            self._pages[number] = page
+            self._pages.move_to_end(number)
+        while len(self._pages) > self.cache_pages:
+            self._pages.popitem(last=False)
+
+    def _request_pages(self, numbers):
+        """Fetch missing pages, then render again."""
+        source, version = self.source, self._version
+        last_keys = {number: page[1] for number, page in self._pages.items()}
+
+        def loaded(pages):
+            if version != self._version:
+                return
+            self._store_pages(pages)
+            self._render()
+
+        self._run('pages', lambda: self._read_pages(source, numbers, last_keys), loaded)
+
+    def _run(self, name, func, on_success, in_memory=True):
+        """Run a read in the background when an executor is available, inline otherwise.
+
+        Reads of in-memory rows always run inline.
+        """
+        if self.executor is not None and not (in_memory and getattr(self.source, 'in_memory', False)):
+            self.executor.submit((id(self), name), func, on_success=on_success, on_error=self._report)
+            return
+        if self.executor is not None:
+            # A read of the previous source may still be running
+            self.executor.cancel((id(self), name))
+        try:
+            result = func()
+        except Exception as e:
+            self._report(e)
+            return
+        on_success(result)
+
+    # Rendering
+
+    def _render(self):
+        if self.source is None:
+            return
+
+        rows = []
+        if self.total:
+            numbers = self._page_numbers(self.top, self.visible)
+            missing = [number for number in numbers if number not in self._pages]
+            if missing:
+                # Keep showing the old rows until the new ones arrive
+                self._update_scrollbar()
+                self._request_pages(missing)
+                return
+            for number in numbers:
+                self._pages.move_to_end(number)
+                rows.extend(self._pages[number][0])
+            start = self.top - numbers[0] * self.page_size
+            rows = rows[start:start + self.visible]
+
+        entries = [(str(self.row_id(row)), tuple(row)) for row in rows]
+        if not rows and self.empty_text:
+            columns = len(self.tree['columns'])
+            entries = [(EMPTY_ITEM, (self.empty_text,) + ("",) * (columns - 1))]
+        self._apply(entries)
+        self._update_scrollbar()
+
+    def _apply(self, entries):
+        """Make the Treeview show entries, a list of (item id, values), with the fewest item changes."""
+        wanted = {item for item, _ in entries}
+        stale = [item for item in self.tree.get_children() if item not in wanted]
+        if stale:
+            self.tree.delete(*stale)
+            for item in stale:
+                self._shown.pop(item, None)
+
+        items = list(self.tree.get_children())
+        for index, (item, values) in enumerate(entries):
+            if item not in self._shown:
+                self.tree.insert('', index, iid=item, values=values)
+                items.insert(index, item)
+            else:
+                if self._shown[item] != values:
+                    self.tree.item(item, values=values)
+                if items[index] != item:
+                    self.tree.move(item, '', index)
+                    items.remove(item)
+                    items.insert(index, item)
+            self._shown[item] = values
+
+    def _update_scrollbar(self):
+        if self.total > self.visible:
+            self.scrollbar.set(self.top / self.total, (self.top + self.visible) / self.total)
+        else:
+            self.scrollbar.set(0.0, 1.0)
+
+    def _report(self, error):
+        if self.on_error:
+            self.on_error(error)
+        else:
+            print(f"❌ Failed to load rows: {error}")
+
+    # Event handlers
+
+    def _scroll_by(self, rows):
+        self.scroll_to(self.top + rows)
+        return 'break'
+
+    def _on_scrollbar(self, action, amount, unit=None):
+        if action == 'moveto':
+            self.scroll_to(float(amount) * self.total)
+        elif action == 'scroll':
+            step = self.visible if unit == 'pages' else 1
+            self._scroll_by(int(amount) * step)
+
+    def _on_mousewheel(self, event):
+        # Windows reports multiples of 120, macOS small deltas
+        steps = event.delta // 120 if abs(event.delta) >= 120 else event.delta
+        return self._scroll_by(-3 * steps)
+
+    def _on_arrow(self, step):
+        """Move the selection, scrolling the window when it reaches an edge."""
+        items = self.tree.get_children()
+        if not items:
+            return 'break'
+        focus = self.tree.focus()
+        if focus not in items:
+            selected = items[0]
+        elif 0 <= items.index(focus) + step < len(items):
+            selected = items[items.index(focus) + step]
+        else:
+            before = self.top
+            self._scroll_by(step)
+            if self.top == before:
+                return 'break'
+            items = self.tree.get_children()
+            selected = items[-1] if step > 0 else items[0]
+        self.tree.selection_set(selected)
+        self.tree.focus(selected)
+        return 'break'
+
+    def _on_configure(self, event):
+        """Show as many rows as fit after the widget is resized."""
+        items = self.tree.get_children()
+        bbox = self.tree.bbox(items[0]) if items else None
+        if not bbox or not bbox[3]:
+            return
+        # The heading row takes roughly one row's height
+        visible = max(1, event.height // bbox[3] - 1)
+        if visible != self.visible:
+            self.visible = visible
+            self.scroll_to(self.top)
@@ -1,26 +1,50 @@
 # -*- coding: utf-8 -*-
+import argparse
 import tkinter as tk
 import os
 from frontend.main_window import MainWindow
 
+def parse_args():
+    """Parse command line options"""
+    parser = argparse.ArgumentParser(description="Al Kawthar Flights management system")
+    parser.add_argument(
+        '--seed',
+        action='store_true',
+        help="load the sample data fixtures before starting (also enabled by AK_SEED_SAMPLE_DATA=1)"
+    )
+    return parser.parse_args()
+
+def should_seed(args):
+    """Sample data is only loaded when explicitly requested"""
+    return args.seed or os.environ.get('AK_SEED_SAMPLE_DATA') == '1'
+
 def main():
     """Main application entry point"""
+    args = parse_args()
     try:
         # Initialize database
         from backend.database import initialize_database
-        from backend.seeder import insert_sample_data
 
         initialize_database()
-        insert_sample_data()
-        
-        # Create and run the application
-        root = tk.Tk()
-        
-        # Set app icon
-        set_app_icon(root)
+        if should_seed(args):
+            from backend.seeder import insert_sample_data
+            insert_sample_data()
         
-        app = MainWindow(root)
-        root.mainloop()
+        # Pick up changes other workstations make to the shared database
+        from backend.change_log import ChangeFeed
+        change_feed = ChangeFeed()
+        change_feed.start()
+        try:
+            # Create and run the application
+            root = tk.Tk()
+            
+            # Set app icon
+            set_app_icon(root)
+            
+            app = MainWindow(root)
+            root.mainloop()
+        finally:
+            change_feed.stop()
         
     except Exception as e:
         print(f"Failed to start application: {e}")